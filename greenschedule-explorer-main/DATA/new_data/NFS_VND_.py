@@ -4,25 +4,50 @@ import numpy as np
 import cProfile
 import pstats
 import io
-import random
-import copy
-from deap import tools
 import os
+import math
+import time
+import queue
+import sys
+import json
+import socket
+import hashlib
+import csv
+import re
+import sqlite3
+import threading
+import traceback
+import importlib.util
+import multiprocessing
+import tempfile
+import tracemalloc
+from collections import deque, namedtuple
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain, combinations, groupby, islice
+
+# Optional JIT backend (see "Evaluation kernels"). numba (most of the import time of this script) is only
+# imported when the "numba" backend is selected
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+# Tariff profiles and energy rate configurations shipped with every instance
+TARIFFS = ("6CW", "6CWD", "6CWI")
+RATE_CONFIGS = ("PS", "PB")
 
 # Load Problem Instances
-def load_instances(base_dir, num_jobs, num_machines_list, num_instances):
-    # Initialize storage
+def load_instances(base_dir, num_jobs, num_machines_list, num_instances, first_instance=1):
+    # Instances first_instance..num_instances of each machine count (first_instance=num_instances loads one)
     instances_data = []
 
     for num_machines in num_machines_list:
-        for instance in range(1, num_instances + 1):
+        for instance in range(first_instance, num_instances + 1):
             instance_data = {}
             # Define the problem structure
             instance_data["jobs"] = None
             instance_data["machines"] = num_machines
+            instance_data["index"] = instance
             instance_data["processing_times"] = []
-            instance_data["energy_prices"] = {"6CW": {}, "CM": {}}
-            instance_data["energy_consumption_rates"] = {"PS": [], "PB": []}
+            instance_data["energy_prices"] = {tag: {} for tag in TARIFFS}
+            instance_data["energy_consumption_rates"] = {tag: [] for tag in RATE_CONFIGS}
 
             # Parse Processing Times
             gap_file = f"VFR{num_jobs}_{num_machines}_{instance}_Gap.txt"
@@ -45,8 +70,8 @@ def load_instances(base_dir, num_jobs, num_machines_list, num_instances):
                 print(f"Missing processing times file: {gap_file}")
                 continue
 
-            # Parse Energy Prices (6CW, CM)
-            for tag in ["6CW"]:
+            # Parse Energy Prices (6CW, 6CWD, 6CWI)
+            for tag in TARIFFS:
                 file_name = f"VFR{num_jobs}_{num_machines}_{instance}_Gap__{tag}.txt"
                 file_path = os.path.join(base_dir, file_name)
                 if os.path.exists(file_path):
@@ -66,7 +91,7 @@ def load_instances(base_dir, num_jobs, num_machines_list, num_instances):
                     print(f"Missing energy price file: {file_name}")
 
             # Parse Energy Rates (PS, PB)
-            for tag in ["PS", "PB"]:
+            for tag in RATE_CONFIGS:
                 file_name = f"VFR{num_jobs}_{num_machines}_{instance}_Gap_{tag}.txt"
                 file_path = os.path.join(base_dir, file_name)
                 if os.path.exists(file_path):
@@ -117,73 +142,384 @@ def create_individual(machines,jobs,processing_times):
 
 
 ##################################################################################
-######################## Helper functions ########################################
+######################## Instance context ########################################
 ##################################################################################
 
-def dominates(fitness_a, fitness_b):
-    makespan_a, tec_a = fitness_a
-    makespan_b, tec_b = fitness_b
-    return (makespan_a <= makespan_b and tec_a <= tec_b) and (makespan_a < makespan_b or tec_a < tec_b)
+# Everything derived from one (instance, tariff, energy rates) combination is built once in an
+# InstanceContext and handed to the operators in place of the loose processing_times / energy_prices /
+# time_periods / rates / horizon arguments.
 
+class InstanceContext:
+    """
+    Immutable data of an instance under one tariff and one energy rate configuration :
+      processing_times   : processing_times[job][machine], tuples
+      pt                 : the same as a read-only int64 (jobs, machines) array
+      pt_columns         : pt_columns[machine][job], one tuple per machine
+      energy_prices, time_periods_start, time_periods_end : the tariff, tuples
+      tail_price         : price after the last period (energy_prices[-1])
+      time_horizon       : end of the last period
+      energy_rates       : consumption rate per machine (tuple), `rates` as a float64 array
+      price_rank         : period indices from the cheapest to the most expensive
+      price_floor        : price_floor[i] cheapest price from period i on (tail included), price_floor[-1] = tail
+      cheap_price        : periods priced below it count as cheap (the highest price of the tariff)
+      pt_tails           : pt_tails[machine][job] processing of the job on the machines after `machine`
+      tariff_tables      : tariff_prefix_tables, for the batched evaluation
+      tariff_arrays      : tariff_arrays, for the compiled kernels
+    """
 
-# Calculate TEC
-def calculate_tec(schedule, processing_times, energy_prices, time_periods_start, time_periods_end, energy_rates):
-    TEC = 0  # Total Energy Consumption
+    __slots__ = ("machines", "jobs", "processing_times", "pt", "pt_columns",
+                 "energy_prices", "time_periods_start", "time_periods_end", "tail_price", "time_horizon",
+                 "energy_rates", "rates", "price_rank", "price_floor", "cheap_price", "pt_tails", "tariff_tables", "tariff_arrays")
+
+    def __init__(self, processing_times, energy_prices, time_periods_start, time_periods_end, energy_rates):
+        processing_times = tuple(tuple(row) for row in processing_times)
+        energy_prices = tuple(energy_prices)
+        time_periods_start = tuple(time_periods_start)
+        time_periods_end = tuple(time_periods_end)
+        energy_rates = tuple(energy_rates)
+
+        pt = np.array(processing_times, dtype=np.int64)
+        rates = np.array(energy_rates, dtype=np.float64)
+        tables = tariff_prefix_tables(energy_prices, time_periods_start, time_periods_end)
+        arrays = tariff_arrays(energy_prices, time_periods_start, time_periods_end)
+        for array in (pt, rates) + tables[:-1] + arrays:
+            array.setflags(write=False)
+
+        fields = {
+            "machines": pt.shape[1],
+            "jobs": pt.shape[0],
+            "processing_times": processing_times,
+            "pt": pt,
+            "pt_columns": tuple(tuple(column) for column in zip(*processing_times)),
+            "energy_prices": energy_prices,
+            "time_periods_start": time_periods_start,
+            "time_periods_end": time_periods_end,
+            "tail_price": energy_prices[-1],
+            "time_horizon": time_periods_end[-1],
+            "energy_rates": energy_rates,
+            "rates": rates,
+            "price_rank": tuple(sorted(range(len(time_periods_start)), key=lambda i: energy_prices[i])),
+            "price_floor": tuple(accumulate(reversed(energy_prices + energy_prices[-1:]), min))[::-1],
+            "cheap_price": max(energy_prices),
+            "pt_tails": tuple(tuple(sum(row[machine + 1:]) for row in processing_times) for machine in range(pt.shape[1])),
+            "tariff_tables": tables,
+            "tariff_arrays": arrays,
+        }
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("InstanceContext is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("InstanceContext is immutable")
+
+    def __reduce__(self):
+        # Rebuilt from the raw data in other processes
+        return (InstanceContext, (self.processing_times, self.energy_prices, self.time_periods_start,
+                                  self.time_periods_end, self.energy_rates))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def build_context(instance, energy_config, consumption_config):
+    """InstanceContext of an instance of load_instances for a tariff ("6CW", ...) and rates ("PS" or "PB")."""
+    tariff = instance["energy_prices"][energy_config]
+    return InstanceContext(instance["processing_times"], tariff["prices"], tariff["start"], tariff["end"],
+                           instance["energy_consumption_rates"][consumption_config])
+
+
+class ScenarioSet:
+    """
+    Every tariff x energy rate combination of an instance, for batch_scenario_objectives :
+      names         : "6CW_PS", "6CW_PB", "6CWD_PS", ... (tariff-major, as the TEC columns)
+      tariff_tables : tariff_prefix_tables of every tariff
+      rates         : (machines, rate configurations) float64 array
+    """
 
-    for m, machine_schedule in enumerate(schedule):
-        energy_rate = energy_rates[m]
-        idx = 0  # Current time period index
-        current_time = 0  # Tracks time progress on the machine
+    __slots__ = ("names", "tariffs", "rate_configs", "tariff_tables", "rates")
 
+    def __init__(self, tariffs, rate_configs, tariff_tables, rates):
+        self.tariffs = tuple(tariffs)
+        self.rate_configs = tuple(rate_configs)
+        self.names = tuple(f"{tariff}_{rate}" for tariff in self.tariffs for rate in self.rate_configs)
+        self.tariff_tables = tuple(tariff_tables)
+        self.rates = rates
 
-        for job, start_time in machine_schedule:
-            processing_time = processing_times[job][m]
+    def __len__(self):
+        return len(self.names)
 
 
-            # Ensure `current_time` aligns with both `start_time` and period start
-            if current_time < start_time:
-                current_time = start_time
+def build_scenarios(instance, tariffs=TARIFFS, rate_configs=RATE_CONFIGS):
+    """ScenarioSet of the tariffs and rate configurations loaded for the instance (missing files are skipped)."""
+    tariffs = [tag for tag in tariffs if instance["energy_prices"].get(tag)]
+    rate_configs = [tag for tag in rate_configs if instance["energy_consumption_rates"].get(tag)]
+    if not tariffs or not rate_configs:
+        raise ValueError("No tariff or energy rate configuration loaded for this instance")
+    tables = []
+    for tag in tariffs:
+        tariff = instance["energy_prices"][tag]
+        tables.append(tariff_prefix_tables(tariff["prices"], tariff["start"], tariff["end"]))
+    rates = np.array([instance["energy_consumption_rates"][tag] for tag in rate_configs], dtype=np.float64).T
+    return ScenarioSet(tariffs, rate_configs, tables, rates)
 
-            while processing_time > 0:
-                # If all periods are exhausted, take the price of the last period
-                if idx >= len(time_periods_end):
-                    remaining_energy_price = energy_prices[-1]
-                    energy_used = remaining_energy_price * energy_rate * processing_time
-                    TEC += energy_used
-                    current_time += processing_time
-                    processing_time = 0
-                    break
 
-                # Skip to the next period if `current_time` exceeds the current period's end
-                if current_time >= time_periods_end[idx]:
-                    idx += 1
-                    continue
+##################################################################################
+######################## Evaluation kernels ######################################
+##################################################################################
+
+# Array schedules : `order[m, i]` is the job at position i on machine m and `starts[m, i]` its start time.
+# The kernels below are compiled with numba when it is installed and the "numba" backend is selected,
+# otherwise the list-based functions of the helper section are used. They stay plain functions until
+# set_backend("numba") compiles them (numba's on-disk cache makes that cheap after the first run).
+
+_BACKEND = "python"
+
+# Names of the kernels set_backend("numba") compiles
+JIT_KERNELS = []
+
+
+def jit_kernel(func):
+    """Register `func` as a kernel to compile with numba.njit(cache=True)."""
+    JIT_KERNELS.append(func.__name__)
+    return func
+
+
+def compile_kernels():
+    """Replace the registered kernels of this module by their numba versions (once per process)."""
+    from numba import njit
+    namespace = globals()
+    for name in JIT_KERNELS:
+        if not hasattr(namespace[name], "py_func"):
+            namespace[name] = njit(cache=True)(namespace[name])
+
+
+def set_backend(name):
+    """
+    Select the evaluation backend : "python" (list schedules) or "numba" (compiled array kernels).
+    Falls back to "python" when numba is not installed.
+    """
+    global _BACKEND
+    if name not in ("python", "numba"):
+        raise ValueError(f"Unknown backend: {name}")
+    if name == "numba" and not NUMBA_AVAILABLE:
+        print("numba is not installed, using the python backend")
+        name = "python"
+    if name == "numba":
+        compile_kernels()
+    _BACKEND = name
+    return _BACKEND
+
+
+def get_backend():
+    return _BACKEND
+
+
+_processing_times_cache = (None, None)
+
+def as_processing_array(processing_times):
+    """
+    Processing times as an int64 (jobs, machines) array. The last conversion is cached, the list is
+    kept referenced with the array so the identity check stays valid.
+    """
+    global _processing_times_cache
+    if isinstance(processing_times, np.ndarray):
+        return processing_times.astype(np.int64, copy=False)
+    cached_list, cached_array = _processing_times_cache
+    if cached_list is not processing_times:
+        cached_array = np.asarray(processing_times, dtype=np.int64)
+        _processing_times_cache = (processing_times, cached_array)
+    return cached_array
+
+
+def schedule_to_arrays(schedule):
+    """Split a list schedule [[(job, start), ...], ...] into (order, starts) int64 arrays."""
+    num_machines, num_jobs = len(schedule), len(schedule[0])
+    flat = chain.from_iterable(chain.from_iterable(schedule))
+    arr = np.fromiter(flat, dtype=np.int64, count=2 * num_machines * num_jobs).reshape(num_machines, num_jobs, 2)
+    return np.ascontiguousarray(arr[:, :, 0]), np.ascontiguousarray(arr[:, :, 1])
+
+
+def arrays_to_schedule(order, starts, schedule=None):
+    """
+    Rebuild a list schedule from (order, starts) arrays, or overwrite `schedule` in place. The machine
+    lists themselves are updated (not replaced) because some operators hold references to them.
+    """
+    rows = [list(zip(o, s)) for o, s in zip(order.tolist(), starts.tolist())]
+    if schedule is None:
+        return rows
+    for machine_schedule, row in zip(schedule, rows):
+        machine_schedule[:] = row
+    return schedule
+
+
+def tariff_arrays(energy_prices, time_periods_start, time_periods_end):
+    """Tariff as arrays : period starts, period ends, and prices (prices[-1] is the price after the horizon)."""
+    num_periods = len(time_periods_end)
+    prices = np.empty(num_periods + 1, dtype=np.float64)
+    prices[:num_periods] = energy_prices[:num_periods]
+    prices[num_periods] = energy_prices[-1]
+    return (np.asarray(time_periods_start, dtype=np.int64),
+            np.asarray(time_periods_end, dtype=np.int64),
+            prices)
+
+
+@jit_kernel
+def update_start_times_kernel(order, starts, pt):
+    """Same rule as update_start_times : current start times act as release dates."""
+    num_machines, num_jobs = order.shape
+    job_ready = np.zeros(pt.shape[0], dtype=np.int64)
+    for m in range(num_machines):
+        machine_ready = 0
+        for i in range(num_jobs):
+            job = order[m, i]
+            start = starts[m, i]
+            if i > 0 and machine_ready > start:
+                start = machine_ready
+            if m > 0 and job_ready[job] > start:
+                start = job_ready[job]
+            starts[m, i] = start
+            machine_ready = start + pt[job, m]
+            job_ready[job] = machine_ready
+    return starts
+
+
+@jit_kernel
+def adjust_start_times_kernel(order, starts, pt):
+    """Same rule as adjust_start_times : semi-active start times from the job order only."""
+    num_machines, num_jobs = order.shape
+    job_ready = np.zeros(pt.shape[0], dtype=np.int64)
+    for m in range(num_machines):
+        machine_ready = 0
+        for i in range(num_jobs):
+            job = order[m, i]
+            start = machine_ready if machine_ready > job_ready[job] else job_ready[job]
+            starts[m, i] = start
+            machine_ready = start + pt[job, m]
+            job_ready[job] = machine_ready
+    return starts
+
+
+@jit_kernel
+def cmax_kernel(order, starts, pt):
+    last_machine = order.shape[0] - 1
+    last_job = order[last_machine, order.shape[1] - 1]
+    return starts[last_machine, order.shape[1] - 1] + pt[last_job, last_machine]
+
+
+@jit_kernel
+def machine_tec_kernel(order, starts, pt, m, energy_rate, period_starts, period_ends, prices):
+    """TEC walk of calculate_tec for a single machine (unrounded)."""
+    num_periods = period_ends.shape[0]
+    tec = 0.0
+    idx = 0
+    current_time = 0
+    for i in range(order.shape[1]):
+        job = order[m, i]
+        processing_time = pt[job, m]
+        if current_time < starts[m, i]:
+            current_time = starts[m, i]
+        while processing_time > 0:
+            if idx >= num_periods:
+                tec += prices[num_periods] * energy_rate * processing_time
+                current_time += processing_time
+                processing_time = 0
+                break
+            if current_time >= period_ends[idx]:
+                idx += 1
+                continue
+            if current_time < period_starts[idx]:
+                current_time = period_starts[idx]
+            available_time_in_period = period_ends[idx] - current_time
+            if processing_time <= available_time_in_period:
+                tec += prices[idx] * energy_rate * processing_time
+                current_time += processing_time
+                processing_time = 0
+            else:
+                tec += prices[idx] * energy_rate * available_time_in_period
+                processing_time -= available_time_in_period
+                current_time = period_ends[idx]
+                idx += 1
+    return tec
+
 
-                # Align `current_time` to the start of the current period if needed
-                if current_time < time_periods_start[idx]:
-                    current_time = time_periods_start[idx]
+@jit_kernel
+def tec_kernel(order, starts, pt, energy_rates, period_starts, period_ends, prices):
+    tec = 0.0
+    for m in range(order.shape[0]):
+        tec += machine_tec_kernel(order, starts, pt, m, energy_rates[m], period_starts, period_ends, prices)
+    return tec
 
-                # Calculate available time in the current period
-                available_time_in_period = time_periods_end[idx] - current_time
 
-                if processing_time <= available_time_in_period:
-                    # Job fits entirely within the current period
-                    energy_used = energy_prices[idx] * energy_rate * processing_time
-                    TEC += energy_used
+@jit_kernel
+def feasibility_kernel(order, starts, pt):
+    """Same checks as is_schedule_feasible."""
+    num_machines, num_jobs = order.shape
+    job_completion = np.full(pt.shape[0], -1, dtype=np.int64)
+    seen = np.zeros(pt.shape[0], dtype=np.int64)
+    for m in range(num_machines):
+        previous_end_time = 0
+        for i in range(num_jobs):
+            job = order[m, i]
+            if seen[job] == m + 1:
+                return False
+            seen[job] = m + 1
+            start = starts[m, i]
+            if start < previous_end_time:
+                return False
+            if job_completion[job] >= 0 and start < job_completion[job]:
+                return False
+            previous_end_time = start + pt[job, m]
+            job_completion[job] = previous_end_time
+    return True
 
-                    current_time += processing_time
-                    processing_time = 0
+
+@jit_kernel
+def nfs_makespan_kernel(sequence, pt, machines, global_job_completion):
+    """calculate_makespan of nfs_heuristic on a (jobs, machines) completion table."""
+    max_completion = 0
+    for machine in range(machines):
+        completion_time = 0
+        for idx in range(sequence.shape[0]):
+            job = sequence[idx]
+            if machine == 0:
+                completion_time += pt[job, machine]
+            else:
+                prev_machine_time = global_job_completion[job, machine - 1]
+                if completion_time > prev_machine_time:
+                    completion_time = completion_time + pt[job, machine]
                 else:
-                    # Job spans into the next period
-                    energy_used = energy_prices[idx] * energy_rate * available_time_in_period
-                    TEC += energy_used
+                    completion_time = prev_machine_time + pt[job, machine]
+            global_job_completion[job, machine] = completion_time
+        if max_completion < completion_time:
+            max_completion = completion_time
+    return max_completion
+
+
+##################################################################################
+######################## Helper functions ########################################
+##################################################################################
 
-                    processing_time -= available_time_in_period
-                    current_time = time_periods_end[idx]
-                    idx += 1  # Move to the next period
+def dominates(fitness_a, fitness_b):
+    makespan_a, tec_a = fitness_a
+    makespan_b, tec_b = fitness_b
+    return (makespan_a <= makespan_b and tec_a <= tec_b) and (makespan_a < makespan_b or tec_a < tec_b)
 
 
+# Calculate TEC
+def calculate_tec(schedule, ctx):
+    if _BACKEND == "numba":
+        order, starts = schedule_to_arrays(schedule)
+        TEC = tec_kernel(order, starts, ctx.pt, ctx.rates, *ctx.tariff_arrays)
+        return round(TEC, 2)
 
+    # Machines are walked one by one (calculate_tec_mach_vnd) and summed in order, so that the total
+    # is the same as the one rebuilt from per-machine objectives
+    TEC = sum(calculate_tec_mach_vnd(schedule, ctx, m) for m in range(len(schedule)))
 
     return round(TEC, 2)
 def get_energy_price(start_time, time_periods, energy_prices):
@@ -214,17 +550,135 @@ def calculate_cmax(schedule,processing_times):
     
 
 
+# ## Per-machine objectives
+# An individual carries the TEC and completion time of each of its machines (attribute
+# `machine_objectives`) with a dirty flag per machine. Operators that change an individual in place
+# mark the machines they touched with invalidate_machines, evaluate then only walks the dirty machines
+# and rebuilds Cmax and TEC from the cached parts. Plain lists can't hold the attribute, they are
+# evaluated from scratch.
+
+class MachineObjectives:
+    """
+    Per-machine TEC (energy rate included) and completion time of a schedule.
+    """
+
+    __slots__ = ("tec", "completion", "dirty")
+
+    def __init__(self, num_machines):
+        self.tec = [0.0] * num_machines
+        self.completion = [0] * num_machines
+        self.dirty = [True] * num_machines
+
+    def invalidate(self, machines=None):
+        if machines is None:
+            self.dirty = [True] * len(self.dirty)
+        else:
+            for m in machines:
+                self.dirty[m] = True
+
+    def fitness(self):
+        """(Cmax, TEC) as evaluate returns them."""
+        return self.completion[-1], round(sum(self.tec), 2)
+
+    def copy(self):
+        other = MachineObjectives(0)
+        other.tec, other.completion, other.dirty = self.tec[:], self.completion[:], self.dirty[:]
+        return other
+
+
+def machine_objectives(individual, ctx):
+    """Up to date MachineObjectives of an individual, attached to it when it can hold one."""
+    objectives = getattr(individual, "machine_objectives", None)
+    if objectives is None:
+        objectives = MachineObjectives(len(individual))
+        try:
+            individual.machine_objectives = objectives
+        except AttributeError:
+            pass  # plain list
+
+    for m, dirty in enumerate(objectives.dirty):
+        if dirty:
+            row = individual[m]
+            last_job, last_start = row[-1]
+            objectives.tec[m] = calculate_tec_mach_vnd(individual, ctx, m)
+            objectives.completion[m] = last_start + ctx.processing_times[last_job][m]
+            objectives.dirty[m] = False
+    return objectives
+
+
+def invalidate_machines(individual, machines=None):
+    """Mark machines of an individual as changed (all of them by default)."""
+    objectives = getattr(individual, "machine_objectives", None)
+    if objectives is not None:
+        objectives.invalidate(machines)
+
+
+def assign_schedule(individual, schedule):
+    """
+    individual[:] = schedule, invalidating only the machines whose sequence or start times differ
+    (and the fitness of an individual when one of them does).
+    """
+    changed = [m for m, (old, new) in enumerate(zip(individual, schedule)) if old != new]
+    individual[:] = schedule[:]
+    invalidate_machines(individual, changed)
+    if changed and hasattr(individual, "fitness"):
+        del individual.fitness.values
+
+
+class EvaluationCounter:
+    """
+    Schedules evaluated in this process (full, incremental or batched candidates), for the run catalog.
+    """
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, n=1):
+        self.count += n
+
+
+evaluation_counter = EvaluationCounter()
+
+
+def evaluate_changed(schedule, objectives, machines, ctx, known_tec=None):
+    """
+    Fitness of `schedule` when it only differs from the schedule described by `objectives` on `machines`.
+    `objectives` is left unchanged, known_tec {machine: tec} gives machines already walked.
+    """
+    evaluation_counter.add()
+    tec = objectives.tec[:]
+    known_tec = known_tec or {}
+    for m in machines:
+        tec[m] = known_tec[m] if m in known_tec else calculate_tec_mach_vnd(schedule, ctx, m)
+    return calculate_cmax(schedule, ctx.processing_times), round(sum(tec), 2)
+
+
 # ## Fitness evaluation
 # Evaluate the individual's fitness (Cmax and TEC)
-def evaluate(individual,processing_times,energy_consumption_rates,time_periods_end, time_periods_start, energy_prices):
-    cmax = calculate_cmax(individual,processing_times)
-    tec = calculate_tec(individual, processing_times, energy_prices, time_periods_start, time_periods_end, energy_consumption_rates)
-    return cmax, tec
+def evaluate(individual, ctx):
+    evaluation_counter.add()
+    if _BACKEND == "numba":
+        # Single conversion for both objectives
+        order, starts = schedule_to_arrays(individual)
+        tec = tec_kernel(order, starts, ctx.pt, ctx.rates, *ctx.tariff_arrays)
+        return int(cmax_kernel(order, starts, ctx.pt)), round(tec, 2)
+
+    # Only the dirty machines are walked when the individual carries its per-machine objectives
+    objectives = machine_objectives(individual, ctx)
+    return objectives.fitness()
 
 
 # Define the problem as a multi-objective optimization problem
-creator.create("FitnessMulti", base.Fitness, weights=(-1.0, -1.0))  # Minimize Cmax and TEC
-creator.create("Individual", list, fitness=creator.FitnessMulti)
+def create_types():
+    """
+    creator.FitnessMulti and creator.Individual, created on first use. Idempotent : a spawned worker
+    imports this script again (as __mp_main__) and must not create them twice.
+    """
+    if not hasattr(creator, "Individual"):
+        creator.create("FitnessMulti", base.Fitness, weights=(-1.0, -1.0))  # Minimize Cmax and TEC
+        creator.create("Individual", list, fitness=creator.FitnessMulti)
 
 
 def update_start_times_local(schedule, processing_times, machine_idx):
@@ -270,6 +724,11 @@ def update_start_times_local(schedule, processing_times, machine_idx):
 # ## Update start times
 
 def update_start_times(schedule, processing_times):
+    if _BACKEND == "numba":
+        order, starts = schedule_to_arrays(schedule)
+        update_start_times_kernel(order, starts, as_processing_array(processing_times))
+        return arrays_to_schedule(order, starts, schedule)
+
     num_machines = len(schedule)
     
     # Precompute finish times for each job on each machine
@@ -350,6 +809,9 @@ def is_schedule_feasible(schedule, processing_times):
        2. Cross-machine constraints are respected
        3. No duplicates within the same machine
     """
+    if _BACKEND == "numba":
+        order, starts = schedule_to_arrays(schedule)
+        return bool(feasibility_kernel(order, starts, as_processing_array(processing_times)))
     
     job_completion_times = {}  # {job: finish_time_on_previous_machine}
     
@@ -384,6 +846,87 @@ def is_schedule_feasible(schedule, processing_times):
 
     return True
 
+
+# Validity flags : operators that keep every machine a permutation of the jobs and rebuild the start times
+# produce feasible schedules by construction, the individual carries a `feasible` flag set by the operator
+# that built it (mark_feasible) and is_schedule_feasible only scans the others, once (is_feasible). Filters over
+# a population (feasible_individuals) check the unflagged individuals together with batch_feasible.
+# CHECK_FEASIBILITY (debug) scans every flagged schedule too and fails on a wrong flag.
+CHECK_FEASIBILITY = False
+
+
+def mark_feasible(schedule, ctx, by_construction=False):
+    """
+    Set and return the validity flag of an operator's output (kept on the schedule when it can hold one).
+    by_construction : the operator guarantees feasibility, no scan outside CHECK_FEASIBILITY.
+    """
+    if by_construction and not CHECK_FEASIBILITY:
+        feasible = True
+    else:
+        feasible = is_schedule_feasible(schedule, ctx.processing_times)
+        if by_construction and not feasible:
+            raise AssertionError("Schedule flagged feasible by construction is not feasible")
+    try:
+        schedule.feasible = feasible
+    except AttributeError:
+        pass  # plain list or WorkingSchedule
+    return feasible
+
+
+def is_feasible(individual, ctx):
+    """Validity flag of an individual, the schedule is scanned when no operator set it."""
+    feasible = getattr(individual, "feasible", None)
+    if feasible is None or CHECK_FEASIBILITY:
+        return mark_feasible(individual, ctx, by_construction=bool(feasible))
+    return feasible
+
+
+def batch_feasible(population, ctx):
+    """
+    is_schedule_feasible of every schedule of a population in one vectorised pass, as a boolean array :
+    rows are permutations of the jobs, start times are not negative, an operation starts after the
+    previous one on its machine and after the job's operation on the previous machine.
+    """
+    orders, starts = population_to_arrays(population)
+    pop_size, machines, jobs = orders.shape
+    individuals = np.arange(pop_size)[:, None, None]
+    machine_rows = np.arange(machines)[None, :, None]
+    ends = starts + ctx.pt[orders, machine_rows]
+
+    permutation = (np.sort(orders, axis=2) == np.arange(jobs)).all(axis=(1, 2))
+    sequenced = (starts[:, :, 0] >= 0).all(axis=1) & (starts[:, :, 1:] >= ends[:, :, :-1]).all(axis=(1, 2))
+    # Start and end times by job, to compare a job's operations on consecutive machines
+    job_starts = np.zeros_like(starts)
+    job_ends = np.zeros_like(ends)
+    job_starts[individuals, machine_rows, orders] = starts
+    job_ends[individuals, machine_rows, orders] = ends
+    routed = (job_starts[:, 1:] >= job_ends[:, :-1]).all(axis=(1, 2))
+    return permutation & sequenced & routed
+
+
+def feasible_individuals(individuals, ctx):
+    """
+    The feasible individuals (is_feasible), in order. The unflagged ones are checked together with
+    batch_feasible and keep their flag, under CHECK_FEASIBILITY every flag is checked first.
+    """
+    individuals = list(individuals)
+    if CHECK_FEASIBILITY and individuals:
+        check_feasibility_flags(individuals, ctx)
+    unflagged = [ind for ind in individuals if getattr(ind, "feasible", None) is None]
+    if unflagged:
+        for ind, feasible in zip(unflagged, batch_feasible(unflagged, ctx)):
+            ind.feasible = bool(feasible)
+    return [ind for ind in individuals if ind.feasible]
+
+
+def check_feasibility_flags(population, ctx):
+    """Debug (CHECK_FEASIBILITY) : the validity flags of a population against a full batch check."""
+    for ind, feasible in zip(population, batch_feasible(population, ctx)):
+        flag = getattr(ind, "feasible", None)
+        if flag is not None and flag != bool(feasible):
+            raise AssertionError(f"Validity flag {flag} of a schedule whose feasibility is {bool(feasible)}")
+
+
 def print_full_schedule(individual):
     full_schedule = []
     # Iterate over all machines and their respective schedules
@@ -398,6 +941,153 @@ def print_full_schedule(individual):
 
 
 
+# ## Batched population evaluation
+# A population is stacked into (pop, machines, jobs) order / start tensors and evaluated with NumPy.
+# The TEC walk of calculate_tec is expressed with two prefix tables of the tariff :
+#   F(t) : time spent inside the periods before t (time between periods is skipped by the walk)
+#   H(u) : cost of the first u units of in-period time
+# A job then costs rate * (H(u_end) - H(u_start)) where u_end = max(F(start), u_end of the previous job) + pt,
+# a running max that NumPy computes with maximum.accumulate.
+
+def tariff_prefix_tables(energy_prices, time_periods_start, time_periods_end):
+    """Breakpoints of F (time -> in-period time) and H (in-period time -> cost) for the tariff."""
+    num_periods = len(time_periods_end)
+    starts = np.asarray(time_periods_start, dtype=np.float64)
+    ends = np.asarray(time_periods_end, dtype=np.float64)
+    prices = np.asarray(energy_prices[:num_periods], dtype=np.float64)
+    lengths = ends - starts
+    cum_lengths = np.concatenate(([0.0], np.cumsum(lengths)))
+
+    time_points = np.empty(2 * num_periods)
+    time_points[0::2], time_points[1::2] = starts, ends
+    in_period_time = np.empty(2 * num_periods)
+    in_period_time[0::2], in_period_time[1::2] = cum_lengths[:-1], cum_lengths[1:]
+
+    cum_cost = np.concatenate(([0.0], np.cumsum(lengths * prices)))
+    return time_points, in_period_time, cum_lengths, cum_cost, float(energy_prices[-1])
+
+
+def batch_update_start_times(orders, starts, pt):
+    """
+    update_start_times for a (pop, machines, jobs) tensor, in place. For each machine,
+    finish_i = max(release_i, finish_{i-1}) + p_i is solved for all individuals and positions at once.
+    """
+    pop_size, num_machines, _ = orders.shape
+    rows = np.arange(pop_size)[:, None]
+    job_ready = np.zeros((pop_size, pt.shape[0]), dtype=np.int64)
+    for m in range(num_machines):
+        order = orders[:, m, :]
+        p = pt[order, m]
+        release = starts[:, m, :]
+        if m > 0:
+            release = np.maximum(release, job_ready[rows, order])
+        cum_p = np.cumsum(p, axis=1)
+        finish = cum_p + np.maximum.accumulate(release - (cum_p - p), axis=1)
+        starts[:, m, :] = finish - p
+        job_ready[rows, order] = finish
+    return starts
+
+
+def batch_machine_energy(starts, p, cum_p, tariff_tables):
+    """(pop, machines) energy cost at rate 1 of (pop, machines, jobs) start / processing time tensors."""
+    time_points, in_period_time, cum_lengths, cum_cost, tail_price = tariff_tables
+
+    # Position of each start time on the in-period time axis (time after the horizon counts 1:1)
+    horizon = time_points[-1]
+    release = np.interp(starts, time_points, in_period_time) + np.maximum(starts - horizon, 0)
+    u_end = cum_p + np.maximum.accumulate(release - (cum_p - p), axis=2)
+    u_start = u_end - p
+
+    def cost(u):
+        return np.interp(u, cum_lengths, cum_cost) + np.maximum(u - cum_lengths[-1], 0) * tail_price
+
+    return (cost(u_end) - cost(u_start)).sum(axis=2)
+
+
+def batch_objectives(orders, starts, pt, energy_rates, tariff_tables, per_machine=False):
+    """
+    Cmax and (unrounded) TEC of every schedule of a (pop, machines, jobs) tensor.
+    With per_machine=True the (pop, machines) TEC (energy rate included) and completion times follow.
+    """
+    num_machines = orders.shape[1]
+    p = pt[orders, np.arange(num_machines)[None, :, None]]
+
+    cmax = starts[:, -1, -1] + p[:, -1, -1]
+    machine_tec = batch_machine_energy(starts, p, np.cumsum(p, axis=2), tariff_tables)
+    rates = np.asarray(energy_rates, dtype=np.float64)
+    tec = machine_tec @ rates
+    if per_machine:
+        return cmax, tec, machine_tec * rates, starts[:, :, -1] + p[:, :, -1]
+    return cmax, tec
+
+
+def batch_scenario_objectives(orders, starts, pt, scenarios):
+    """
+    Cmax and the (pop, scenarios) unrounded TEC of every schedule under every scenario of a ScenarioSet.
+    Cmax and the processing tensors are shared, the tariff walk runs once per tariff and the rate
+    configurations of all tariffs are applied with one matrix product.
+    """
+    num_machines = orders.shape[1]
+    p = pt[orders, np.arange(num_machines)[None, :, None]]
+    cum_p = np.cumsum(p, axis=2)
+
+    cmax = starts[:, -1, -1] + p[:, -1, -1]
+    energy = np.stack([batch_machine_energy(starts, p, cum_p, tables) for tables in scenarios.tariff_tables], axis=1)
+    tec = energy @ scenarios.rates  # (pop, tariffs, rate configurations)
+    return cmax, tec.reshape(len(orders), -1)
+
+
+def population_to_arrays(population):
+    """Stack list schedules into (pop, machines, jobs) order and start tensors."""
+    pop_size, num_machines, num_jobs = len(population), len(population[0]), len(population[0][0])
+    flat = chain.from_iterable(chain.from_iterable(chain.from_iterable(population)))
+    arr = np.fromiter(flat, dtype=np.int64, count=2 * pop_size * num_machines * num_jobs)
+    arr = arr.reshape(pop_size, num_machines, num_jobs, 2)
+    return np.ascontiguousarray(arr[..., 0]), np.ascontiguousarray(arr[..., 1])
+
+
+def evaluate_population(population, ctx, recompute_starts=False, scenarios=None):
+    """
+    Evaluate all individuals in one vectorised pass and write their fitness values (Cmax, TEC).
+    With recompute_starts=True the start times are first updated (update_start_times rule) and written back.
+    The per-machine objectives of the individuals are refreshed on the way (always under ctx).
+    With a ScenarioSet the TEC of the fitness is the worst one over its scenarios (robust objective).
+    """
+    if not population:
+        return []
+    evaluation_counter.add(len(population))
+    orders, starts = population_to_arrays(population)
+    if recompute_starts:
+        batch_update_start_times(orders, starts, ctx.pt)
+        for ind, order, start in zip(population, orders, starts):
+            arrays_to_schedule(order, start, ind)
+
+    _, _, machine_tec, completion = batch_objectives(orders, starts, ctx.pt, ctx.rates, ctx.tariff_tables, per_machine=True)
+    worst_tec = [None] * len(population)
+    if scenarios is not None:
+        _, scenario_tec = batch_scenario_objectives(orders, starts, ctx.pt, scenarios)
+        worst_tec = scenario_tec.max(axis=1).tolist()
+    fitnesses = []
+    for ind, tec, done, worst in zip(population, machine_tec.tolist(), completion.tolist(), worst_tec):
+        objectives = MachineObjectives(len(tec))
+        objectives.tec, objectives.completion, objectives.dirty = tec, done, [False] * len(tec)
+        ind.machine_objectives = objectives
+        ind.fitness.values = objectives.fitness() if worst is None else (done[-1], round(worst, 2))
+        fitnesses.append(ind.fitness.values)
+    return fitnesses
+
+
+def scenario_fronts(population, ctx, scenarios):
+    """Non-dominated (Cmax, TEC) points of the population under every scenario : {scenario name: points}."""
+    if not population:
+        return {name: [] for name in scenarios.names}
+    orders, starts = population_to_arrays(population)
+    cmax, scenario_tec = batch_scenario_objectives(orders, starts, ctx.pt, scenarios)
+    cmax = cmax.tolist()
+    return {name: nondominated_points(zip(cmax, np.round(column, 2).tolist()))
+            for name, column in zip(scenarios.names, scenario_tec.T)}
+
+
 ##################################################################################
 ######################## NSGA OPERATORS ##########################################
 ##################################################################################
@@ -406,11 +1096,12 @@ def print_full_schedule(individual):
 
 # ### Two point crossover
 
-def cxTwoPoint(ind1, ind2, machines, jobs, processing_times):
+def cxTwoPoint(ind1, ind2, ctx):
     """
     Two-point crossover for flow shop scheduling problem.
     Swaps job sequences between two crossover points while preserving job order constraints.
     """
+    machines, jobs = ctx.machines, ctx.jobs
     # Select two random crossover points ensuring cxpoint1 < cxpoint2
     cxpoint1, cxpoint2 = sorted(random.sample(range(1, jobs), 2))  # Two unique points
 
@@ -430,17 +1121,17 @@ def cxTwoPoint(ind1, ind2, machines, jobs, processing_times):
         ind1[m] = [(job_num, *job[1:]) for job_num, job in zip(jobs_ind1, ind1[m])]
         ind2[m] = [(job_num, *job[1:]) for job_num, job in zip(jobs_ind2, ind2[m])]
 
-    repair_and_update(ind1,machines, jobs, processing_times)
-    repair_and_update(ind2,machines, jobs, processing_times)
+    repair_and_update(ind1,machines, jobs, ctx.processing_times)
+    repair_and_update(ind2,machines, jobs, ctx.processing_times)
+    invalidate_machines(ind1)
+    invalidate_machines(ind2)
 
     return ind1, ind2
-def pmx_crossover(parent1, parent2, processing_times):
+def pmx_crossover(parent1, parent2, ctx):
     """
     Perform Partially Mapped Crossover (PMX) between two parents.
     Extract job IDs, apply crossover, and adjust start times.
     """
-    if isinstance(processing_times, list):
-        processing_times = np.array(processing_times)
     # Number of machines
     num_machines = len(parent1)
 
@@ -488,28 +1179,31 @@ def pmx_crossover(parent1, parent2, processing_times):
                 child2_job_ids[machine][i] = job
 
     # Adjust start times for both children
-    child1 = adjust_start_times(child1_job_ids, processing_times)
-    child2 = adjust_start_times(child2_job_ids, processing_times)
+    child1 = adjust_start_times(child1_job_ids, ctx)
+    child2 = adjust_start_times(child2_job_ids, ctx)
 
     return child1, child2
 
-def adjust_start_times(child, processing_times):
-    # Ensure processing_times is a NumPy array
-    if isinstance(processing_times, list):
-        processing_times = np.array(processing_times)
+def adjust_start_times(child, ctx):
+    if _BACKEND == "numba":
+        order = np.asarray(child, dtype=np.int64)
+        starts = adjust_start_times_kernel(order, np.empty_like(order), ctx.pt)
+        child[:] = [list(zip(o, s)) for o, s in zip(order.tolist(), starts.tolist())]
+        return child
 
     num_machines = len(child)
-    job_ready_times = [0] * len(processing_times)
+    job_ready_times = [0] * ctx.jobs
 
     for machine in range(num_machines):
         machine_ready_time = 0
         num_jobs = len(child[machine])
+        machine_times = ctx.pt_columns[machine]
 
         for i in range(num_jobs):
             job_id = child[machine][i]
 
 
-            processing_time = processing_times[job_id, machine]
+            processing_time = machine_times[job_id]
             #start_time = max(machine_ready_time, job_ready_times[job_id])
             if machine_ready_time > job_ready_times[job_id]:
                 start_time = machine_ready_time
@@ -527,17 +1221,18 @@ def adjust_start_times(child, processing_times):
 
 
 # ### Unifrom crossover
-def uniform_crossover(ind1, ind2, machines, jobs, processing_times, period_data):
+def uniform_crossover(ind1, ind2, ctx):
     """
     Uniform crossover optimized for TEC.
     Swaps job allocations between parents probabilistically, prioritizing cheap periods.
     Each schedule is a list of machine schedules, where each machine schedule is a list of (job_id, start_time).
     """
     # Extract period data
-    period_starts = period_data['start']
-    period_ends = period_data['end']
-    period_prices = period_data['prices']
-    time_horizon = period_data['time_horizon']
+    period_starts = ctx.time_periods_start
+    period_ends = ctx.time_periods_end
+    period_prices = ctx.energy_prices
+    processing_times = ctx.processing_times
+    machines = ctx.machines
 
     # Perform uniform crossover for each machine
     for m in range(machines):
@@ -554,7 +1249,7 @@ def uniform_crossover(ind1, ind2, machines, jobs, processing_times, period_data)
                 # Check if the current allocation is in a cheap period
                 is_cheap = False
                 for s, e, p in zip(period_starts, period_ends, period_prices):
-                    if s <= start_time and start_time + pt <= e and p < 0.12:
+                    if s <= start_time and start_time + pt <= e and p < ctx.cheap_price:
                         is_cheap = True
                         break
 
@@ -563,7 +1258,7 @@ def uniform_crossover(ind1, ind2, machines, jobs, processing_times, period_data)
                     cheapest_start = None
                     cheapest_cost = float('inf')
                     for s, e, p in zip(period_starts, period_ends, period_prices):
-                        if p >= 0.12:
+                        if p >= ctx.cheap_price:
                             continue  # Skip expensive periods
                         candidate_start = max(start_time, s)
                         if candidate_start + pt <= e:
@@ -576,15 +1271,155 @@ def uniform_crossover(ind1, ind2, machines, jobs, processing_times, period_data)
                     if cheapest_start is not None:
                         schedule[m][i] = (job_id, cheapest_start)
 
+    invalidate_machines(ind1)
+    invalidate_machines(ind2)
     return ind1, ind2
 
 
+# ## Array crossover kernels
+# The kernels work on (machines, jobs) order arrays, all machines at once, and every row of a child is
+# a permutation of the jobs by construction (no repair pass). Segment membership is a (machines, jobs)
+# boolean mask indexed by job, so each kernel is O(machines x jobs) (PMX adds one pass per link of the
+# longest mapping chain). array_crossover rebuilds the start times of both children with a single
+# batch_update_start_times call.
+
+def segment_mask(order, first, last):
+    """mask[m, job] is True when job is in order[m, first:last]."""
+    machines, jobs = order.shape
+    mask = np.zeros((machines, jobs), dtype=bool)
+    mask[np.arange(machines)[:, None], order[:, first:last]] = True
+    return mask
+
+
+def two_point_orders(order1, order2, first, last):
+    """
+    order1 with the [first, last) segment of order2. The positions outside the segment holding a job the
+    segment brings in get the jobs it pushed out, in their order. Returns the child and the mask of these
+    repaired positions.
+    """
+    rows = np.arange(order1.shape[0])[:, None]
+    incoming = segment_mask(order2, first, last)
+    outside = np.ones(order1.shape, dtype=bool)
+    outside[:, first:last] = False
+    repaired = outside & incoming[rows, order1]
+    leaving = order1[:, first:last]
+
+    child = order1.copy()
+    child[:, first:last] = order2[:, first:last]
+    # Every row has as many repaired positions as pushed out jobs, row-major order keeps them aligned
+    child[repaired] = leaving[~incoming[rows, leaving]]
+    return child, repaired
+
+
+def pmx_orders(order1, order2, first, last):
+    """PMX child : the [first, last) segment of order2, the other genes of order1 mapped out of the segment."""
+    machines, jobs = order1.shape
+    rows = np.arange(machines)[:, None]
+    incoming = segment_mask(order2, first, last)
+    mapping = np.tile(np.arange(jobs), (machines, 1))
+    mapping[rows, order2[:, first:last]] = order1[:, first:last]
+
+    child = order1.copy()
+    child[:, first:last] = order2[:, first:last]
+    genes = np.concatenate((order1[:, :first], order1[:, last:]), axis=1)
+    clash = incoming[rows, genes]
+    while clash.any():
+        genes = np.where(clash, mapping[rows, genes], genes)
+        clash = incoming[rows, genes]
+    child[:, :first], child[:, last:] = genes[:, :first], genes[:, first:]
+    return child
+
+
+def ox_orders(order1, order2, first, last):
+    """OX child : the [first, last) segment of order1, the other jobs in order2's order from `last` on."""
+    machines, jobs = order1.shape
+    rows = np.arange(machines)[:, None]
+    kept = segment_mask(order1, first, last)
+    rotated = np.roll(order2, -last, axis=1)
+    fill = rotated[~kept[rows, rotated]].reshape(machines, jobs - (last - first))
+
+    child = order1.copy()
+    child[:, np.r_[last:jobs, 0:first]] = fill
+    return child
+
+
+def uniform_orders(order1, order2, keep):
+    """order1's jobs at the `keep` positions, the other jobs in the order they have in order2."""
+    machines, jobs = order1.shape
+    rows = np.arange(machines)[:, None]
+    kept = np.zeros((machines, jobs), dtype=bool)
+    kept[rows, order1] = keep
+
+    child = order1.copy()
+    child[~keep] = order2[~kept[rows, order2]]
+    return child
+
+
+def start_prices(starts, ctx):
+    """Price of the period each start time falls in (the next period between two periods, tail price after them)."""
+    period_starts, period_ends, prices = ctx.tariff_arrays
+    index = np.searchsorted(period_ends, starts, side="right")
+    return prices[index]
+
+
+def cheap_starts(starts, p, ctx):
+    """Start times moved to the first cheap period that can hold the whole operation, when there is one."""
+    period_starts, period_ends, prices = ctx.tariff_arrays
+    cheap = prices[:-1] < ctx.cheap_price
+    if not cheap.any():
+        return starts
+    cheap_begin, cheap_end = period_starts[cheap], period_ends[cheap]
+    k = np.searchsorted(cheap_end, starts + p)
+    found = k < len(cheap_end)
+    k = np.minimum(k, len(cheap_end) - 1)
+    moved = np.maximum(starts, cheap_begin[k])
+    return np.where(found & (moved + p <= cheap_end[k]), moved, starts)
+
+
+def array_crossover(ind1, ind2, ctx, kind):
+    """
+    Two children of two schedules with the array kernel `kind` : "two_point", "pmx", "ox" or "uniform_tec".
+    two_point children keep the start times of their positions as release dates (repaired positions
+    start from 0), uniform_tec takes every position from the parent whose job starts in the cheaper
+    period and moves the kept jobs into cheap periods. Returns two list schedules, parents are not modified.
+    """
+    orders, starts = population_to_arrays([ind1, ind2])
+    first, last = sorted(random.sample(range(ctx.jobs + 1), 2))
+    releases = np.zeros_like(starts)
+
+    if kind == "two_point":
+        child1, repaired1 = two_point_orders(orders[0], orders[1], first, last)
+        child2, repaired2 = two_point_orders(orders[1], orders[0], first, last)
+        releases[0] = np.where(repaired1, 0, starts[0])
+        releases[1] = np.where(repaired2, 0, starts[1])
+    elif kind == "pmx":
+        child1 = pmx_orders(orders[0], orders[1], first, last)
+        child2 = pmx_orders(orders[1], orders[0], first, last)
+    elif kind == "ox":
+        child1 = ox_orders(orders[0], orders[1], first, last)
+        child2 = ox_orders(orders[1], orders[0], first, last)
+    elif kind == "uniform_tec":
+        price = start_prices(starts, ctx)
+        coin = np.random.default_rng(random.getrandbits(64)).random(price.shape[1:])
+        keep1 = (price[0] < price[1]) | ((price[0] == price[1]) & (coin < 0.5))
+        child1 = uniform_orders(orders[0], orders[1], keep1)
+        child2 = uniform_orders(orders[1], orders[0], ~keep1)
+        p = ctx.pt[orders, np.arange(ctx.machines)[None, :, None]]
+        moved = cheap_starts(starts, p, ctx)
+        releases[0] = np.where(keep1, moved[0], 0)
+        releases[1] = np.where(keep1, 0, moved[1])
+    else:
+        raise ValueError(f"Unknown crossover: {kind}")
+
+    children = np.stack((child1, child2))
+    batch_update_start_times(children, releases, ctx.pt)
+    return arrays_to_schedule(children[0], releases[0]), arrays_to_schedule(children[1], releases[1])
 
 
 # ## Mutation
 
 # ### Swap mutation
-def mutSwap(individual, processing_times):
+def mutSwap(individual, ctx):
     """
     Perform a swap mutation on a single machine's schedule.
     """
@@ -605,17 +1440,19 @@ def mutSwap(individual, processing_times):
         machine[job2] = job2_tuple
 
         # Recalculate start times after the mutation
-        update_start_times(individual, processing_times)
+        update_start_times(individual, ctx.processing_times)
+        invalidate_machines(individual)
 
     return individual
 
 
 # ### Inversion mutation
-def inversion_mutation(schedule, machines, processing_times):
+def inversion_mutation(schedule, ctx):
 
     
     new_schedule = [list(machine) for machine in schedule]
-    num_jobs = len(processing_times)
+    machines = ctx.machines
+    num_jobs = ctx.jobs
     # Randomly select a machine
     machine = random.randint(0, machines - 1)
 
@@ -642,7 +1479,7 @@ def inversion_mutation(schedule, machines, processing_times):
     new_schedule[machine] = [(inverted_job_indexes[i], start_times[i]) for i in range(len(job_indexes))]
 
     # Recalculate the start times for the machine
-    update_start_times_local(new_schedule, processing_times,machine)
+    update_start_times_local(new_schedule, ctx.processing_times,machine)
 
 
     return new_schedule
@@ -650,13 +1487,17 @@ def inversion_mutation(schedule, machines, processing_times):
 
 
 # Total Energy Cost for a Job (given start time and machine)
-def total_energy_cost(individual,processing_times,time_periods,energy_prices,energy_consumption_rates,job_index, machine_index, start_time):
+def total_energy_cost(individual, ctx, job_index, machine_index, start_time):
+
+    time_periods = ctx.time_periods_end
+    energy_prices = ctx.energy_prices
+    energy_rate = ctx.energy_rates[machine_index]
 
     # Get the job number (from the individual schedule)
     job_number = individual[machine_index][job_index][0]
 
     # Get the processing time for this job on the given machine
-    processing_time = processing_times[job_number][machine_index]
+    processing_time = ctx.pt_columns[machine_index][job_number]
 
     # Calculate the end time of the job
     end_time = start_time + processing_time
@@ -664,8 +1505,6 @@ def total_energy_cost(individual,processing_times,time_periods,energy_prices,ene
     total_cost = 0  # Initialize total energy cost accumulator
     current_time = start_time  # Set the current time to the start time of the job
 
-    energy_prices.append(energy_prices[-1])
-
     # Loop through all time periods (end times)
     for i in range(len(time_periods)):
         # Get the start and end times of the current period
@@ -685,7 +1524,7 @@ def total_energy_cost(individual,processing_times,time_periods,energy_prices,ene
 
             if time_in_period > 0:  # Only add cost if there's overlap with the period
                 # Add the energy cost for this period (time * price * consumption rate)
-                total_cost += time_in_period * period_price * energy_consumption_rates[machine_index]
+                total_cost += time_in_period * period_price * energy_rate
 
             # Move current time forward to the end of this period
             current_time = period_end_time
@@ -698,107 +1537,129 @@ def total_energy_cost(individual,processing_times,time_periods,energy_prices,ene
     if current_time < end_time:
         # Use the energy price of the last period for the remaining time
         remaining_time = end_time - current_time
-        last_period_price = energy_prices[-1]  # Use the last price
-        total_cost += remaining_time * last_period_price * energy_consumption_rates[machine_index]
+        last_period_price = ctx.tail_price  # Use the last price
+        total_cost += remaining_time * last_period_price * energy_rate
 
     return total_cost
 
 # Calculate cost efficiency for a job
-def cost_efficiency(individual,processing_times,job_index, machine_index,time_periods,time_periods_start,energy_prices,energy_consumption_rates):
+def cost_efficiency(individual, ctx, job_index, machine_index):
     start_time = individual[machine_index][job_index][1]  # Get start time of job
-    processing_time = processing_times[individual[machine_index][job_index][0]][machine_index]  # Get processing time
-    return total_energy_cost(individual,processing_times,time_periods,energy_prices,energy_consumption_rates,job_index, machine_index, start_time)
-
+    return total_energy_cost(individual, ctx, job_index, machine_index, start_time)
 
 
-def calculate_tec_mach(schedule, processing_times, energy_consumption_rates, time_periods, energy_prices, machine_index):
-    TEC = 0
-    machine_schedule = schedule[machine_index]  # Select the schedule for the specific machine
-
-    for job, start_time in machine_schedule:
-        processing_time = processing_times[job - 1][machine_index]
-        energy_rate = energy_consumption_rates[machine_index]
+# Pairs of machines scored at most by machine_sequence_swap_logic (pruned pairs are not counted)
+MACHINE_SWAP_MAX_PAIRS = 200
 
-        # Calculate TEC for each time unit during the job's processing
-        for t in range(start_time, start_time + processing_time):
-            energy_price = get_energy_price(t, time_periods, energy_prices)
-            TEC += energy_price * energy_rate
 
-    return TEC
+def cheapest_energy_after(release, duration, ctx):
+    """
+    Lowest cost of `duration` time units of processing at rate 1 that start no earlier than `release`:
+    the cheapest in-period time after `release` is filled first, time after the horizon costs ctx.tail_price.
+    """
+    slots = [(ctx.tail_price, float("inf"))]
+    for start, end, price in zip(ctx.time_periods_start, ctx.time_periods_end, ctx.energy_prices):
+        if end > release:
+            slots.append((price, end - max(start, release)))
+    slots.sort()
+
+    cost = 0
+    for price, available in slots:
+        used = min(available, duration)
+        cost += price * used
+        duration -= used
+        if duration <= 0:
+            break
+    return cost
 
-def machine_sequence_swap_logic(schedule, processing_times,machines, jobs, energy_prices, energy_consumption_rates, time_periods_end, time_periods_start,time_horizon): 
-    
-    tec_values = []
-    solutions = []
-    dominating_solution = None
 
-    original_fitness = evaluate(schedule, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-    original_tec, original_cmax = original_fitness[1], original_fitness[0]
+def exchange_cmax_bounds(schedule, ctx):
+    """
+    bounds[a, b] : lower bound of Cmax once machine a runs the job order of machine b (start times kept
+    as release dates, as update_start_times does). Machine a alone gives the completion of every job,
+    the processing left on the following machines is added.
+    """
+    order, starts = schedule_to_arrays(schedule)
+    pt = ctx.pt
+    num_machines = order.shape[0]
+    tails = np.cumsum(pt[:, ::-1], axis=1)[:, ::-1] - pt  # tails[j, m] : processing of job j after machine m
 
-    # Create a copy of the original schedule to modify
-    new_schedule = [list(machine) for machine in schedule]
+    bounds = np.empty((num_machines, num_machines), dtype=np.int64)
+    for a in range(num_machines):
+        p = pt[order, a]  # (machines, jobs) : every machine's order run on machine a
+        cum_p = np.cumsum(p, axis=1)
+        finish = cum_p + np.maximum.accumulate(starts[a] - (cum_p - p), axis=1)
+        bounds[a] = (finish + tails[order, a]).max(axis=1)
+    return bounds
 
-    for machine in range(machines):
-        # Calculate TEC for the current machine and append it to the tec_values list
-        tec = calculate_tec_mach_vnd(schedule, processing_times, energy_prices, time_periods_start, time_periods_end, energy_consumption_rates,machine)
-        tec_values.append(tec)
 
-    # Sort the TEC values and select the machine with the highest TEC and the machine with the second-highest TEC
-    sorted_tec_indices = sorted(range(machines), key=lambda x: tec_values[x], reverse=True)
-    i = 0
+def machine_sequence_swap_logic(schedule, ctx):
+    """
+    Exchange the job orders of two machines, over all pairs, the pairs with the highest TEC first.
+    A pair is skipped when it can not dominate the schedule :
+      - its Cmax lower bound (exchange_cmax_bounds) is above the current Cmax, or
+      - its Cmax can not decrease and the TEC can not decrease either. Start times never move
+        earlier in update_start_times, so the TEC of machine m can at most drop to the cheapest
+        energy after its first start (slack_m), for the changed machines and the ones after them.
+    At most MACHINE_SWAP_MAX_PAIRS pairs are yielded.
+    """
+    machines = ctx.machines
 
-    while (i < machines):
-        
-        machine1 = sorted_tec_indices[i]  # The machine with the highest TEC
-        machine2 = sorted_tec_indices[i + 1]  # The machine with the second-highest TEC
+    # Per-machine TEC (cached on the schedule when VND gives it one)
+    tec_values = machine_objectives(schedule, ctx).tec
 
-        # Extract job indexes from the schedules of the two machines
-        job_indexes1 = [job[0] for job in new_schedule[machine1]]
-        job_indexes2 = [job[0] for job in new_schedule[machine2]]
+    slacks = []
+    for machine in range(machines):
+        # Every machine processes all the jobs
+        workload = sum(ctx.pt_columns[machine])
+        cheapest = ctx.energy_rates[machine] * cheapest_energy_after(schedule[machine][0][1], workload, ctx)
+        slacks.append(tec_values[machine] - cheapest)
 
-        # Swap the job indexes between the two machines
-        for i, job in enumerate(schedule[machine1]):
-            new_schedule[machine1][i] = (job_indexes2[i], job[1])
+    # Machines before the first changed one keep their start times only if the schedule is settled
+    settled = start_times_settled(schedule, ctx.processing_times)
+    slack_from = list(accumulate(reversed(slacks)))[::-1]  # slack_from[m] : slack of machines m..M-1
 
-        for i, job in enumerate(schedule[machine2]):
-            new_schedule[machine2][i] = (job_indexes1[i], job[1])
+    current_cmax = calculate_cmax(schedule, ctx.processing_times)
+    cmax_bounds = exchange_cmax_bounds(schedule, ctx)
+    last_machine = machines - 1
 
-        # Recalculate the start times for the machines
-        update_start_times(new_schedule, processing_times)
+    pairs = sorted(combinations(range(machines), 2), key=lambda pair: tec_values[pair[0]] + tec_values[pair[1]], reverse=True)
 
-        # Calculate the new fitness
-        new_fitness = evaluate(new_schedule, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
+    yielded = 0
+    for machine1, machine2 in pairs:
+        if yielded >= MACHINE_SWAP_MAX_PAIRS:
+            break
 
-        new_tec, new_cmax = new_fitness[1], new_fitness[0]
-        delta_tec = new_tec - original_tec
-        delta_cmax = new_cmax - original_cmax
-        
-        if delta_tec == 0 and delta_cmax == 0:
+        cmax_bound = max(cmax_bounds[machine1, machine2], cmax_bounds[machine2, machine1])
+        if last_machine not in (machine1, machine2):
+            # The last machine keeps its order and its jobs can only start later
+            cmax_bound = max(cmax_bound, current_cmax)
+        if cmax_bound > current_cmax:
             continue
 
-        # Check if the new solution dominates the original one
-        if new_cmax <= time_horizon:
-            if dominates(new_fitness, original_fitness):
-                dominating_solution = (new_schedule, new_fitness)
-                return solutions, dominating_solution
-            else:
-                # Store non-dominating solutions with improvement in one objective
-                if (delta_tec < 0 and delta_cmax > 0) or (delta_cmax < 0 and delta_tec > 0):
-                    solutions.append((new_schedule, new_fitness))
+        tec_gain_bound = slack_from[min(machine1, machine2) if settled else 0]
+        if cmax_bound == current_cmax and tec_gain_bound <= 0:
+            continue
 
-        i += 1
-  
-    return solutions, dominating_solution
+        if tec_values[machine1] < tec_values[machine2]:
+            machine1, machine2 = machine2, machine1
+        yielded += 1
+        yield Move("exchange", machine1, (machine2,))
 
-def calculate_tec_mach_vnd(schedule, processing_times, energy_prices, time_periods_start, time_periods_end, energy_rates,machine_index):
+def calculate_tec_mach_vnd(schedule, ctx, machine_index):
     Tec = 0  # Total Energy Consumption
     
-    energy_rate = energy_rates[machine_index]
+    energy_prices = ctx.energy_prices
+    time_periods_start = ctx.time_periods_start
+    time_periods_end = ctx.time_periods_end
+    num_periods = len(time_periods_end)
+    machine_times = ctx.pt_columns[machine_index]
+    energy_rate = ctx.energy_rates[machine_index]
     idx = 0  # Current time period index
     current_time = 0  # Tracks time progress on the machine
 
     for job, start_time in schedule[machine_index]:
-        processing_time = processing_times[job][machine_index]
+        processing_time = machine_times[job]
 
         # Ensure `current_time` aligns with both `start_time` and period start
         if current_time < start_time:
@@ -806,8 +1667,8 @@ def calculate_tec_mach_vnd(schedule, processing_times, energy_prices, time_perio
 
         while processing_time > 0:
             # If all periods are exhausted, take the price of the last period
-            if idx >= len(time_periods_end):
-                remaining_energy_price = energy_prices[-1]
+            if idx >= num_periods:
+                remaining_energy_price = ctx.tail_price
                 energy_used = remaining_energy_price * energy_rate * processing_time
                 Tec += energy_used
                 current_time += processing_time
@@ -863,18 +1724,13 @@ def calculate_cmax_mach(schedule, processing_times, machine_index):
 # 
 # We choose the job with the highest cost efficiency because it is the most expensive in terms of energy used for the time it takes to process. By moving or adjusting this job, we can try to reduce the total energy cost and make the schedule more efficient.
 
-def insert_jobs_within_machine(schedule, processing_times, energy_prices, energy_consumption_rates, time_periods, time_periods_start, num_jobs_to_insert=1):
+def insert_jobs_within_machine(schedule, ctx, num_jobs_to_insert=1):
 
     # Step 1: Randomly select a machine from the list of machines
     num_machines = len(schedule)
 
-    tec_values = []
-
-    # Loop through each machine to calculate TEC
-    for machine in range(num_machines):
-        # Calculate TEC for the current machine and append it to the tec_values list
-        tec = calculate_tec_mach(schedule, processing_times, energy_consumption_rates, time_periods, energy_prices, machine)
-        tec_values.append(tec)
+    # Per-machine TEC, only the machines changed since the last evaluation are recomputed
+    tec_values = machine_objectives(schedule, ctx).tec
 
     # Select machines with the highest TEC
     machine_index = max(range(num_machines), key=lambda x: tec_values[x])
@@ -884,9 +1740,7 @@ def insert_jobs_within_machine(schedule, processing_times, energy_prices, energy
     # Step 1: Create a list of job indices sorted by cost efficiency (highest to lowest)
     sorted_indices = sorted(
         range(len(selected_machine_schedule)),
-        key=lambda idx: cost_efficiency(
-            schedule, processing_times, idx, machine_index, time_periods, time_periods_start, energy_prices, energy_consumption_rates
-        ),
+        key=lambda idx: cost_efficiency(schedule, ctx, idx, machine_index),
         reverse=True  # Sort in descending order of cost efficiency
     )
 
@@ -902,16 +1756,18 @@ def insert_jobs_within_machine(schedule, processing_times, energy_prices, energy
     ]
 
     # Step 5: Insert the selected jobs at the chosen position in the schedule
-    schedule[machine_index] = (
+    new_schedule = [list(machine) for machine in schedule]
+    new_schedule[machine_index] = (
         selected_machine_schedule[:insert_position]
         + jobs_to_move
         + selected_machine_schedule[insert_position:]
     )
 
     # Step 6: Recalculate the start times after the insertion in the schedule
-    update_start_times(schedule, processing_times)
+    update_start_times(new_schedule, ctx.processing_times)
 
-    # Return the modified schedule directly
+    # Return the modified schedule directly (only the machines that changed are invalidated)
+    assign_schedule(schedule, new_schedule)
     return schedule
 
 
@@ -921,15 +1777,23 @@ def insert_jobs_within_machine(schedule, processing_times, energy_prices, energy
 
 
 # ### NFS heuristic
-def nfs_heuristic(machines, jobs, processing_times, p, energy_consumption_rates, energy_prices, time_periods):
+def nfs_heuristic(ctx, p):
     """
     Non-permutation flowshop scheduling algorithm with straight insertion, anticipation, and delay while includeing start times for makespan calculation.
     """
+    machines, jobs, processing_times = ctx.machines, ctx.jobs, ctx.processing_times
+
+    # With the numba backend the completion table is a (jobs, machines) array instead of a dict
+    use_jit = _BACKEND == "numba"
+    pt_array = ctx.pt
 
     def calculate_makespan(schedule, processing_times, machines, global_job_completion):
         """
         Calculate the makespan for a given schedule on all machines.
         """
+        if use_jit:
+            return int(nfs_makespan_kernel(np.asarray(schedule, dtype=np.int64), pt_array, machines, global_job_completion))
+
         max_completion = 0
         for machine in range(machines):
             completion_time = 0
@@ -996,7 +1860,10 @@ def nfs_heuristic(machines, jobs, processing_times, p, energy_consumption_rates,
             temp_schedule = schedule[:pos] + [job] + schedule[pos:]
 
             # Create a deep copy of the global completion times for testing
-            temp_global_completion = {k: v[:] for k, v in global_job_completion.items()}
+            if use_jit:
+                temp_global_completion = global_job_completion.copy()
+            else:
+                temp_global_completion = {k: v[:] for k, v in global_job_completion.items()}
 
             # Calculate makespan for this temporary schedule
             makespan = calculate_makespan(temp_schedule, processing_times, machines, temp_global_completion)
@@ -1014,7 +1881,10 @@ def nfs_heuristic(machines, jobs, processing_times, p, energy_consumption_rates,
 
     # Initialize the schedules
     partial_schedules = [[] for _ in range(machines)]
-    global_job_completion = {job: [0] * machines for job in range(jobs)}
+    if use_jit:
+        global_job_completion = np.zeros((jobs, machines), dtype=np.int64)
+    else:
+        global_job_completion = {job: [0] * machines for job in range(jobs)}
     job_completion_times = [0] * jobs
 
 
@@ -1167,9 +2037,160 @@ def get_similarity(ind1, ind2):
 
     return similarity_percentage
 
-def left_shift_schedule(schedule, processing_times, period_ends, job_info, chosen_periods):
+# ## Period index
+# Chosen periods are disjoint, so sorting them by start time is the same as sorting them by end time.
+# The index keeps them in chronological order and answers the lookups of tec_reducer and of the
+# shift passes with bisect / segment tree descents instead of linear scans.
+
+class PeriodIndex:
+    """
+    Chronologically sorted periods (start, end, price) with bisect lookup, contiguity links and price ranks.
+    """
+
+    __slots__ = ("periods", "starts", "ends", "prices", "first_index", "contiguous_next",
+                 "price_rank", "prefix_max_rank", "reach", "_size", "_reach_tree", "_price_tree")
+
+    def __init__(self, periods):
+        self.periods = sorted(periods, key=lambda x: x[0])
+        self.starts = [p[0] for p in self.periods]
+        self.ends = [p[1] for p in self.periods]
+        self.prices = [p[2] for p in self.periods]
+        num_periods = len(self.periods)
+
+        # Index of the first occurrence of each period (chosen periods may contain repeats)
+        self.first_index = list(range(num_periods))
+        for i in range(1, num_periods):
+            if self.periods[i] == self.periods[i - 1]:
+                self.first_index[i] = self.first_index[i - 1]
+
+        # contiguous_next[i] : period i ends right before period i + 1 starts
+        self.contiguous_next = [
+            i < num_periods - 1 and self.ends[i] + 1 == self.starts[i + 1] for i in range(num_periods)
+        ]
+
+        # Dense price ranks and, for each position, the highest rank seen strictly before it
+        ranks = {price: rank for rank, price in enumerate(sorted(set(self.prices)))}
+        self.price_rank = [ranks[price] for price in self.prices]
+        self.prefix_max_rank = [-1] * (num_periods + 1)
+        for i, rank in enumerate(self.price_rank):
+            self.prefix_max_rank[i + 1] = max(self.prefix_max_rank[i], rank)
+
+        # reach[i] : longest job that can end at the end of period i, alone or spanning its contiguous predecessor
+        self.reach = [
+            self.ends[i] - (self.starts[i - 1] if i > 0 and self.contiguous_next[i - 1] else self.starts[i])
+            for i in range(num_periods)
+        ]
+
+        # Segment trees : max of reach (backward placement) and min of prices (cheaper period search)
+        self._size = 1
+        while self._size < num_periods:
+            self._size *= 2
+        self._reach_tree = [float('-inf')] * (2 * self._size)
+        self._price_tree = [float('inf')] * (2 * self._size)
+        self._reach_tree[self._size:self._size + num_periods] = self.reach
+        self._price_tree[self._size:self._size + num_periods] = self.prices
+        for node in range(self._size - 1, 0, -1):
+            self._reach_tree[node] = max(self._reach_tree[2 * node], self._reach_tree[2 * node + 1])
+            self._price_tree[node] = min(self._price_tree[2 * node], self._price_tree[2 * node + 1])
+
+    def __len__(self):
+        return len(self.periods)
+
+    def period_at(self, time):
+        """Index (first occurrence) of the period containing `time` (bounds included), or None."""
+        i = bisect_right(self.starts, time) - 1
+        if i < 0 or time > self.ends[i]:
+            return None
+        # Periods sharing a boundary : the earliest one owns it
+        while i > 0 and self.ends[i - 1] >= time:
+            i -= 1
+        return self.first_index[i]
+
+    def has_more_expensive_before(self, idx):
+        """True if a period placed before position `idx` is more expensive than period `idx`."""
+        return self.prefix_max_rank[idx] > self.price_rank[idx]
+
+    def last_reaching(self, hi, pt):
+        """Largest index i <= hi such that a job of length pt can end at the end of period i, or -1."""
+        tree = self._reach_tree
+
+        def search(node, node_lo, node_hi):
+            if node_lo > hi or tree[node] < pt:
+                return -1
+            if node_lo == node_hi:
+                return node_lo
+            mid = (node_lo + node_hi) // 2
+            found = search(2 * node + 1, mid + 1, node_hi)
+            return found if found != -1 else search(2 * node, node_lo, mid)
+
+        return search(1, 0, self._size - 1) if hi >= 0 else -1
+
+    def first_cheaper(self, lo, price):
+        """Smallest index i >= lo whose price is strictly lower than `price`, or -1."""
+        tree = self._price_tree
+        num_periods = len(self.periods)
+
+        def search(node, node_lo, node_hi):
+            if node_hi < lo or node_lo >= num_periods or tree[node] >= price:
+                return -1
+            if node_lo == node_hi:
+                return node_lo
+            mid = (node_lo + node_hi) // 2
+            found = search(2 * node, node_lo, mid)
+            return found if found != -1 else search(2 * node + 1, mid + 1, node_hi)
+
+        return search(1, 0, self._size - 1)
+
+    def latest_placement(self, latest_end, pt):
+        """
+        Backward placement used by tec_reducer : walk the periods from the latest one and return the
+        (start, end) of the first position where the job, ending no later than `latest_end`, fits in a
+        period or across two contiguous periods.
+        """
+        num_periods = len(self.periods)
+        last = num_periods - 1
+
+        if latest_end == float('inf'):
+            # No constraint : the job is aligned on the end of each period
+            i = self.last_reaching(last, pt)
+            if i != -1:
+                return self.ends[i] - pt, self.ends[i]
+        else:
+            # Periods ending after latest_end all try the same window, the earliest of them decides
+            g = bisect_left(self.ends, latest_end)
+            job_start = latest_end - pt
+            if g < num_periods:
+                if self.starts[g] <= job_start:
+                    return job_start, latest_end
+                if g > 0 and self.contiguous_next[g - 1] and self.starts[g - 1] <= job_start:
+                    return job_start, latest_end
+            # Earlier periods : the job is aligned on the end of the period (the latest one never is)
+            i = self.last_reaching(min(g - 1, last - 1), pt)
+            if i != -1:
+                return self.ends[i] - pt, self.ends[i]
+
+        # Nothing fits : keep the alignment on the earliest period
+        job_end = latest_end if num_periods == 1 else min(self.ends[0], latest_end)
+        if job_end == float('inf'):
+            job_end = self.ends[0]
+        return job_end - pt, job_end
+
+    def earliest_fit(self, earliest_start, pt):
+        """
+        Forward search used by left_shift_schedule : index of the first period where a job released at
+        `earliest_start` can end, either inside the period or spilling into a contiguous more expensive one.
+        """
+        first_open = bisect_left(self.ends, earliest_start)
+        first_fit = bisect_left(self.ends, earliest_start + pt)
+        i = first_fit - 1
+        if first_open <= i and first_fit < len(self.periods) and self.contiguous_next[i] \
+                and self.prices[i] < self.prices[i + 1]:
+            return i
+        return first_fit if first_fit < len(self.periods) else None
+
+
+def left_shift_schedule(schedule, processing_times, period_ends, job_info, period_index):
     num_machines = len(schedule)
-    chosen_periods_sorted = sorted(chosen_periods, key=lambda x: x[0])  # Sort chosen_periods by start time (chronological order)
 
     horizon_end = max(period_ends)  # Ensure jobs stay within the defined horizon
 
@@ -1185,23 +2206,13 @@ def left_shift_schedule(schedule, processing_times, period_ends, job_info, chose
                 max_shift = max(max_shift, job_info[job_id][m-1]['end'])
 
             # Find the earliest period in chosen_periods where the job can fit
-            best_period = None
-            for p_idx, p in enumerate(chosen_periods_sorted):
-                if p[1] >= max_shift and p[1] - max_shift >= pt:
-                    best_period = p
-                    break
-                # Check if the job can span across two contiguous from thee chosen periods
-                if p_idx < len(chosen_periods_sorted) - 1 :
-                    next_p = chosen_periods_sorted[p_idx + 1]
-                    if p[1] + 1 == next_p[0] and p[2] < next_p[2]:  # Contiguous and cheaper
-                        if p[1] >= max_shift and next_p[1] - max_shift >= pt:
-                            best_period = p
-                            break
-
-            if best_period is None:
+            # (alone, or spanning into a contiguous period of the chosen periods)
+            best_period_idx = period_index.earliest_fit(max_shift, pt)
+
+            if best_period_idx is None:
                 break
 
-            new_start = max(max_shift, best_period[0]) # for the first job on the first machine (in case the very first period isn't the cheapest)
+            new_start = max(max_shift, period_index.starts[best_period_idx]) # for the first job on the first machine (in case the very first period isn't the cheapest)
             new_end = new_start + pt
 
             # Ensure job does not exceed the scheduling horizon
@@ -1225,19 +2236,10 @@ def left_shift_schedule(schedule, processing_times, period_ends, job_info, chose
 
     return job_info
  
-def right_shift_schedule(schedule, processing_times, period_ends, job_info, chosen_periods):
+def right_shift_schedule(schedule, processing_times, period_ends, job_info, period_index):
     num_machines = len(schedule)
-    chosen_periods_sorted = sorted(chosen_periods, key=lambda x: x[0])
     horizon_end = max(period_ends)
-
-    def get_period_for_time(time):
-        """Helper function to find which period a time belongs to"""
-        return next((p for p in chosen_periods_sorted if p[0] <= time <= p[1]), None)
-    
-    def has_more_expensive_period_before(period):
-        """Check if there are any more expensive periods before the given period"""
-        period_idx = chosen_periods_sorted.index(period)
-        return any(p[2] > period[2] for p in chosen_periods_sorted[:period_idx])
+    starts, ends, prices = period_index.starts, period_index.ends, period_index.prices
 
     def get_latest_allowed_end(machine, job_idx, job_id):
         """Calculate the latest possible end time for a job given constraints"""
@@ -1265,9 +2267,10 @@ def right_shift_schedule(schedule, processing_times, period_ends, job_info, chos
             current_end = job_info[job_id][m]['end']
             
             # Find current period and maximum allowed end time
-            current_period = get_period_for_time(current_start)
-            if not current_period: #if the job is not assigned to any of the periods
+            current_period_idx = period_index.period_at(current_start)
+            if current_period_idx is None: #if the job is not assigned to any of the periods
                 continue
+            current_price = prices[current_period_idx]
                 
             allowed_end = get_latest_allowed_end(m, j, job_id)
             if allowed_end <= current_end:
@@ -1277,54 +2280,45 @@ def right_shift_schedule(schedule, processing_times, period_ends, job_info, chos
             best_start = current_start
             best_end = current_end
 
-            # Get the index of the current period
-            current_period_idx = chosen_periods_sorted.index(current_period)
-
             # Check if there is a more expensive period before the current period
-            has_expensive_period_before = has_more_expensive_period_before(current_period)
+            has_expensive_period_before = period_index.has_more_expensive_before(current_period_idx)
             
-            assigned = False 
             # Try to shift the job to a cheaper period in the periods that come after the current one (from the chosen periods)
-            for period in chosen_periods_sorted[current_period_idx + 1:]:
-                if period[2] >= current_period[2]:
-                    continue  # Skip same or more expensive periods because no need to shift to them
-
-
-                 
+            # (same or more expensive periods are skipped because there is no need to shift to them)
+            period_idx = period_index.first_cheaper(current_period_idx + 1, current_price)
+            while period_idx != -1:
                 # We check if the job can start in this period and end in a contiguous period
-                start_in_period = max(period[0], allowed_end - pt) 
+                start_in_period = max(starts[period_idx], allowed_end - pt) 
                 end_in_period = start_in_period + pt
 
                 # Case 1 : Job fits entirely in this period 
-                if period[0] <= start_in_period and end_in_period <= period[1]:
+                if starts[period_idx] <= start_in_period and end_in_period <= ends[period_idx]:
                     best_start = start_in_period
                     best_end = end_in_period
                     break  # Stop searching, we found a valid shift
 
                 # Case 2: Job spans into a contiguous cheaper period
-                else:
-                    # Find the next contiguous period
-                    period_idx = chosen_periods_sorted.index(period)
-                    if period_idx < len(chosen_periods_sorted) - 1 :
-                        next_period = chosen_periods_sorted[period_idx + 1]
-                        if period[1] + 1 == next_period[0] :  # Periods are contiguous
-                            # Check if the job can span into the next period
-                            time_in_first_period = period[1] - start_in_period
-                            time_in_second_period = pt - time_in_first_period
-
-                            if time_in_second_period <= next_period[1] - next_period[0]:
-                                best_start = start_in_period
-                                best_end = start_in_period + pt
-                                break  # We stop searching because we found a valid shift
+                first_idx = period_index.first_index[period_idx]
+                if period_index.contiguous_next[first_idx]:  # Periods are contiguous
+                    # Check if the job can span into the next period
+                    time_in_first_period = ends[first_idx] - start_in_period
+                    time_in_second_period = pt - time_in_first_period
+
+                    if time_in_second_period <= ends[first_idx + 1] - starts[first_idx + 1]:
+                        best_start = start_in_period
+                        best_end = start_in_period + pt
+                        break  # We stop searching because we found a valid shift
+
+                period_idx = period_index.first_cheaper(period_idx + 1, current_price)
 
             # If there is a more expensive period before the current period and no cheaper period was found,
             # schedule the job as late as possible within the current period
-            if has_expensive_period_before and best_start == current_start and best_end == current_end or has_expensive_period_before:
+            if has_expensive_period_before:
                
             
                 #latest_start = min(current_period[1] - pt, allowed_end - pt)
-                latest_start = max(current_period[1] - pt, allowed_end - pt)
-                if latest_start >= current_period[0]:
+                latest_start = max(ends[current_period_idx] - pt, allowed_end - pt)
+                if latest_start >= starts[current_period_idx]:
                     best_start = latest_start
                     best_end = latest_start + pt
                 
@@ -1332,7 +2326,7 @@ def right_shift_schedule(schedule, processing_times, period_ends, job_info, chos
 
             # If there is no more expensive period before the current period and no cheaper period was found,
             # leave the job where it is
-            elif not has_expensive_period_before and best_start == current_start and best_end == current_end:
+            elif best_start == current_start and best_end == current_end:
                 
                 continue
 
@@ -1352,20 +2346,20 @@ def right_shift_schedule(schedule, processing_times, period_ends, job_info, chos
                     
                     
                 
-                best_period = get_period_for_time(best_end)
-                if best_period and (best_period[2] > current_period[2]) :
+                best_period_idx = period_index.period_at(best_end)
+                if best_period_idx is not None and (prices[best_period_idx] > current_price) :
                     continue
                 job_info[job_id][m]['end'] = best_end
                 job_info[job_id][m]['start'] = best_end - pt
-                best_start = best_end - pt
-                schedule[m][j] = (job_id, best_start)
                
     return job_info
 
-def tec_reducer(schedule, processing_times, period_starts, period_ends, prices):
+def tec_reducer(schedule, ctx):
 
+    processing_times = ctx.processing_times
+    period_starts, period_ends, prices = ctx.time_periods_start, ctx.time_periods_end, ctx.energy_prices
     num_machines = len(schedule)
-    num_jobs = len(processing_times)
+    num_jobs = ctx.jobs
     job_info = [{} for _ in range(num_jobs)]
 
     # (1) Compute cmax of the initial schedule 
@@ -1376,17 +2370,21 @@ def tec_reducer(schedule, processing_times, period_starts, period_ends, prices):
     #all_periods = sorted(zip(period_starts, period_ends, prices), key=lambda x: (x[2], x[0]))
     periods = list(zip(period_starts, period_ends, prices))
 
-    all_periods = sorted(
-        periods,
-        key=lambda x: (
-            x[2],  # Sort by price first
-            not (
-                (periods.index(x) > 0 and periods[periods.index(x) - 1][2] < x[2]) or
-                (periods.index(x) < len(periods) - 1 and periods[periods.index(x) + 1][2] < x[2])
-            ),  # Prioritize adjacency to a cheaper period
-            x[0]  # Use start time as a final tiebreaker
+    def next_to_cheaper(i):
+        """Prioritize adjacency to a cheaper period"""
+        return (i > 0 and periods[i - 1][2] < periods[i][2]) or \
+               (i < len(periods) - 1 and periods[i + 1][2] < periods[i][2])
+
+    all_periods = [
+        periods[i] for i in sorted(
+            range(len(periods)),
+            key=lambda i: (
+                periods[i][2],  # Sort by price first
+                not next_to_cheaper(i),
+                periods[i][0]  # Use start time as a final tiebreaker
+            )
         )
-    )
+    ]
     chosen_periods = []
     remaining = cmax
     for (ps, pe, pr) in all_periods:
@@ -1404,29 +2402,21 @@ def tec_reducer(schedule, processing_times, period_starts, period_ends, prices):
             if remaining <= 0:
                 break
 
-    # Sort periods by end time for backward scheduling
-    chosen_periods.sort(key=lambda x: x[1], reverse=True)
-    
-    # Helper function to check if periods are contiguous
-    def are_periods_contiguous(period1, period2):
-        return period1[1] + 1  == period2[0]
+    # Index of the chosen periods, shared by the backward placement and the shift passes
+    period_index = PeriodIndex(chosen_periods)
 
     # Start with the last job on the last machine
     last_machine = num_machines - 1
     last_job_idx = len(schedule[last_machine]) - 1
 
-    # Initialize with first (latest) period
-    current_period_idx = 0
-    current_period = chosen_periods[current_period_idx]
-
     # Schedule the very last job
     last_job_id = schedule[last_machine][last_job_idx][0]
     last_job_pt = processing_times[last_job_id][last_machine]
 
     # Place it at the end of the latest period
     job_info[last_job_id][last_machine] = {
-        'start': current_period[1] - last_job_pt,
-        'end': current_period[1]
+        'start': period_index.ends[-1] - last_job_pt,
+        'end': period_index.ends[-1]
     }
 
     # Process remaining jobs backward
@@ -1434,8 +2424,6 @@ def tec_reducer(schedule, processing_times, period_starts, period_ends, prices):
         start_j = len(schedule[m]) - 1 if m != last_machine else last_job_idx - 1
 
         for j in reversed(range(start_j + 1)):
-            current_period_idx = 0
-            current_period = chosen_periods[current_period_idx]
             current_job_id = schedule[m][j][0]
             pt = processing_times[current_job_id][m]
 
@@ -1449,50 +2437,12 @@ def tec_reducer(schedule, processing_times, period_starts, period_ends, prices):
                 latest_possible_end = next_job_start
 
             # Constraint 2  : Must end before the same job starts on next machine
-            if m < num_machines - 1:
-                next_machine_jobs = [job_id for job_id, _ in schedule[m + 1]]
-                if current_job_id in next_machine_jobs:
-                    next_machine_start = job_info[current_job_id][m + 1]['start']
-                    latest_possible_end = min(latest_possible_end, next_machine_start)
-
-            # If no constraints found (case of the last job), use current period end
-            if latest_possible_end == float('inf'):
-                latest_possible_end = current_period[1]
-
-            # Calculate initial job timing
-            job_end = latest_possible_end
-            job_start = job_end - pt
-
-            # Find appropriate periods for the job
-            placed = False
-            while not placed:
-                
-                # Check if job fits entirely in the current period
-                if job_end <= current_period[1] and job_start >= current_period[0]:
-                    placed = True
-                # Check if job can span between current period and next chosen period
-                elif (current_period_idx < len(chosen_periods) - 1 and
-                      are_periods_contiguous(chosen_periods[current_period_idx + 1], current_period) and
-                      job_end <= current_period[1] and
-                      job_start >= chosen_periods[current_period_idx + 1][0]):
-                    
-                    #print(f"hereee")
-                    
-                    # Ensure both periods are chosen
-                    if (current_period in chosen_periods and
-                        chosen_periods[current_period_idx + 1] in chosen_periods):
-                        placed = True
-                else:
-                    # Move to the next chosen period
-                    current_period_idx += 1
-                    if current_period_idx >= len(chosen_periods):
-                        break
-                    current_period = chosen_periods[current_period_idx]
-                    # Place at the end of this period and check constraints again
-                    job_end = min(current_period[1], latest_possible_end)
-                    job_start = job_end - pt
+            if m < num_machines - 1 and (m + 1) in job_info[current_job_id]:
+                next_machine_start = job_info[current_job_id][m + 1]['start']
+                latest_possible_end = min(latest_possible_end, next_machine_start)
 
-            # Store the job timing
+            # Find appropriate periods for the job (latest period first), and store the job timing
+            job_start, job_end = period_index.latest_placement(latest_possible_end, pt)
             job_info[current_job_id][m] = {
                 'start': job_start,
                 'end': job_end
@@ -1500,9 +2450,9 @@ def tec_reducer(schedule, processing_times, period_starts, period_ends, prices):
 
     
     
-    job_info = left_shift_schedule(schedule, processing_times, period_ends, job_info, chosen_periods)
+    job_info = left_shift_schedule(schedule, processing_times, period_ends, job_info, period_index)
     if random.random() > 0.5 : 
-        job_info = right_shift_schedule(schedule, processing_times, period_ends, job_info, chosen_periods)
+        job_info = right_shift_schedule(schedule, processing_times, period_ends, job_info, period_index)
 
     # Build final schedule 
     final_schedule = []
@@ -1517,29 +2467,147 @@ def tec_reducer(schedule, processing_times, period_starts, period_ends, prices):
 
 
 
-def init_population(processing_times, energy_prices, energy_consumption_rates, size_pop, time_periods, time_periods_start, time_periods_end, jobs, machines):
-    population = []
+# ## NFS schedule cache
+# nfs_heuristic only looks at the processing times, so the NFS part of the initial population is the same
+# for every tariff and rate configuration. With a cache every NFS schedule is drawn from its own random
+# state seeded by (seed, p, attempt) and stored as compact arrays (orders uint16, starts int32) under
+# NFS_CACHE/<instance key>/. Hits and misses then build the same population and leave the global random
+# state alone, later runs of the instance only read the files.
 
-    # First solution using NFS heuristic
-    nfs_size = int(0.2*size_pop)
+NFS_CACHE = "nfs_cache"
 
-    random_size = size_pop - nfs_size
 
-    start_value = 0.1
-    increment = round((1 - start_value) / (nfs_size - 1), 2)  # Distribute the values across the range from start_value to 1
+def instance_key(ctx):
+    """Identifier of the processing times of an instance : J{jobs}_M{machines}_{hash}."""
+    digest = hashlib.sha1(np.ascontiguousarray(ctx.pt).tobytes()).hexdigest()[:12]
+    return f"J{ctx.jobs}_M{ctx.machines}_{digest}"
 
-    # Generate alpha values dynamically
-    p_values = [round(start_value + i * increment, 2) for i in range(nfs_size)]
 
-    existing_schedules = []
-    cpt = 0
-    idx = 0
+class NFSCache:
+    """
+    NFS schedules on disk, one .npz file per (instance, p value, seed). Several processes can share
+    the directory (files are written under a temporary name and renamed).
+    """
+
+    def __init__(self, directory=NFS_CACHE):
+        self.directory = directory
+
+    def path(self, ctx, p, seed):
+        return os.path.join(self.directory, instance_key(ctx), f"seed{seed}_p{p:.2f}.npz")
+
+    def load(self, ctx, p, seed):
+        """Cached schedule (list of machine lists) or None."""
+        path = self.path(ctx, p, seed)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            order, starts = data["order"].astype(np.int64), data["starts"].astype(np.int64)
+        if order.shape != (ctx.machines, ctx.jobs):
+            return None
+        return arrays_to_schedule(order, starts)
+
+    def store(self, ctx, p, seed, schedule):
+        path = self.path(ctx, p, seed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        order, starts = schedule_to_arrays(schedule)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            np.savez(file, order=order.astype(np.uint16), starts=starts.astype(np.int32))
+        os.replace(temporary, path)
+
+    def schedule(self, ctx, p, seed):
+        """Feasible NFS schedule for p, from the cache or computed (and stored) with its own random state."""
+        schedule = self.load(ctx, p, seed)
+        if schedule is not None:
+            return schedule
+        state = random.getstate()
+        try:
+            attempt = 0
+            while True:
+                random.seed(f"nfs-{seed}-{p:.2f}-{attempt}")
+                schedule = nfs_heuristic(ctx, p)
+                if is_schedule_feasible(schedule, ctx.processing_times):
+                    break
+                attempt += 1
+        finally:
+            random.setstate(state)
+        self.store(ctx, p, seed, schedule)
+        return schedule
+
+
+# ## Schedule archive
+# The schedules of a run (final front, and a sample of the last population) in one compressed .npz :
+#   orders       : (n, machines, jobs) uint16 job orders
+#   start_deltas : start times delta-encoded along each machine (the first delta is the first start),
+#                  in the smallest unsigned type that holds them
+#   fitness      : (n, 2) (Cmax, TEC) of the run, front : (n,) True for the front schedules
+# init_population(warm_start=...) seeds a new population with them.
+
+def save_schedule_archive(path, front, explored=()):
+    """Write the front and explored individuals (schedules with a fitness) to `path`. Returns the path."""
+    individuals = list(front) + list(explored)
+    if not individuals:
+        return None
+    orders, starts = population_to_arrays(individuals)
+    deltas = np.diff(starts, axis=2, prepend=0)
+    dtype = np.min_scalar_type(int(deltas.max())) if deltas.min() >= 0 else np.int32
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Written under a temporary name and renamed, readers never see a partial archive (as NFSCache.store)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        np.savez_compressed(file,
+                            orders=orders.astype(np.uint16),
+                            start_deltas=deltas.astype(dtype),
+                            fitness=np.array([ind.fitness.values for ind in individuals], dtype=np.float64),
+                            front=np.arange(len(individuals)) < len(front))
+    os.replace(temporary, path)
+    return path
+
+
+def load_schedule_archive(path):
+    """[(schedule, (Cmax, TEC), on_front), ...] of an archive written by save_schedule_archive."""
+    with np.load(path) as data:
+        orders = data["orders"].astype(np.int64)
+        starts = np.cumsum(data["start_deltas"].astype(np.int64), axis=2)
+        fitness, front = data["fitness"].tolist(), data["front"].tolist()
+    return [(arrays_to_schedule(order, start), tuple(values), on_front)
+            for order, start, values, on_front in zip(orders, starts, fitness, front)]
+
+
+def init_population(ctx, size_pop, nfs_cache=None, nfs_seed=0, warm_start=None):
+    """
+    size_pop // 5 NFS schedules (p from 0.1 to 1) and random ones. With an NFSCache the NFS schedules are
+    read from / written to the cache under nfs_seed.
+    warm_start (schedule archive path) : the feasible archived schedules of the instance, front first,
+    take the place of random individuals.
+    """
+    create_types()
+    population = []
+    machines, jobs, processing_times = ctx.machines, ctx.jobs, ctx.processing_times
+
+    # First solution using NFS heuristic
+    nfs_size = int(0.2*size_pop)
+
+    random_size = size_pop - nfs_size
+
+    start_value = 0.1
+    increment = round((1 - start_value) / (nfs_size - 1), 2)  # Distribute the values across the range from start_value to 1
+
+    # Generate alpha values dynamically
+    p_values = [round(start_value + i * increment, 2) for i in range(nfs_size)]
+
+    existing_schedules = []
+    cpt = 0
+    idx = 0
     for p in p_values:
         #print(f"p value : {p}")
         while True:
             # Generate a schedule using the NFS heuristic
             initial_time = time.time()
-            schedule = nfs_heuristic(machines, jobs, processing_times, p, energy_consumption_rates, energy_prices, time_periods)
+            if nfs_cache is not None:
+                schedule = nfs_cache.schedule(ctx, p, nfs_seed)
+            else:
+                schedule = nfs_heuristic(ctx, p)
             final_time = time.time()
             exec_time_nfs = final_time - initial_time
             # Ensure the schedule is feasible
@@ -1567,7 +2635,20 @@ def init_population(processing_times, energy_prices, energy_consumption_rates, s
                 break  # Move to the next individual
         idx+=1
 
-    
+
+    if warm_start is not None and os.path.exists(warm_start):
+        archived = sorted(load_schedule_archive(warm_start), key=lambda entry: not entry[2])
+        seeded = 0
+        for schedule, _, _ in archived:
+            if seeded == random_size:
+                break
+            if len(schedule) != machines or len(schedule[0]) != jobs or not is_schedule_feasible(schedule, processing_times):
+                continue
+            population.append(creator.Individual(schedule))
+            seeded += 1
+        random_size -= seeded
+        print(f"{seeded} individuals from {warm_start}")
+
     for _ in range(random_size ) :
         new_individual = create_individual(machines, jobs, processing_times)
 
@@ -1585,14 +2666,398 @@ def init_population(processing_times, energy_prices, energy_consumption_rates, s
 ######################## VND FUNCTIONS ## ########################################
 ##################################################################################
 
-def insert_jobs_within_machine2(schedule, processing_times,machines,jobs, energy_prices, energy_consumption_rates, time_periods_end, time_periods_start,time_horizon):
+# ## Move journal
+# Neighborhood moves are applied in place on the working schedule. The journal records the old
+# (job, start) tuple of every position a move or the start time update touches, so the candidate is
+# undone by restoring only those positions. A schedule is copied only when a move is accepted.
 
-    solutions = []
-    dominating_solution = None
+class MoveJournal:
+    """
+    Undo log of the positions changed on a schedule.
+    """
 
-    original_fitness = evaluate(schedule, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-    original_tec, original_cmax = original_fitness[1], original_fitness[0]
-    
+    __slots__ = ("schedule", "entries")
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.entries = []
+
+    def set(self, machine, position, value):
+        row = self.schedule[machine]
+        self.entries.append((machine, position, row[position]))
+        row[position] = value
+
+    def set_slice(self, machine, first_position, values):
+        """Write `values` from `first_position` on, recording only the positions that actually change."""
+        row = self.schedule[machine]
+        for position, value in enumerate(values, first_position):
+            if row[position] != value:
+                self.entries.append((machine, position, row[position]))
+                row[position] = value
+
+    def mark(self):
+        return len(self.entries)
+
+    def touched_machines(self, mark=0):
+        """Machines changed since `mark` was taken."""
+        return {machine for machine, _, _ in self.entries[mark:]}
+
+    def undo(self, mark=0):
+        """Restore the schedule to its state when `mark` was taken."""
+        entries = self.entries
+        schedule = self.schedule
+        while len(entries) > mark:
+            machine, position, value = entries.pop()
+            schedule[machine][position] = value
+
+
+def materialize(schedule):
+    """Copy of the current state of a schedule (used for accepted moves only)."""
+    return [list(machine) for machine in schedule]
+
+
+class WorkingSchedule(list):
+    """Schedule the VND neighborhoods work on, carrying the per-machine objectives of its state."""
+
+    __slots__ = ("machine_objectives",)
+
+
+def update_start_times_journaled(schedule, processing_times, journal, first_machine=0, last_machine=None, stop_machine=None):
+    """
+    update_start_times restricted to the machines from `first_machine` on, with every changed start time
+    recorded in the journal. With first_machine > 0 the schedule must have been settled (see
+    start_times_settled) before the move, the pass then stops at the first machine after `last_machine`
+    (the last one the move changed, first_machine by default) where no start time changes.
+    With first_machine = 0 it is a full update_start_times.
+    stop_machine : last machine updated, the pass can be resumed later from stop_machine + 1.
+    """
+    if last_machine is None:
+        last_machine = first_machine
+    num_machines = len(schedule) if stop_machine is None else stop_machine + 1
+    job_ready = {}
+    if first_machine > 0:
+        for job, start_time in schedule[first_machine - 1]:
+            job_ready[job] = start_time + processing_times[job][first_machine - 1]
+
+    for machine in range(first_machine, num_machines):
+        row = schedule[machine]
+        machine_ready = 0
+        changed = False
+        for i, (job, old_start) in enumerate(row):
+            start_time = old_start
+            if i > 0 and machine_ready > start_time:
+                start_time = machine_ready
+            if machine > 0:
+                ready = job_ready.get(job, 0)
+                if ready > start_time:
+                    start_time = ready
+            machine_ready = start_time + processing_times[job][machine]
+            job_ready[job] = machine_ready
+            if start_time != old_start:
+                journal.set(machine, i, (job, start_time))
+                changed = True
+        if not changed and 0 < first_machine and last_machine < machine:
+            break
+
+
+def start_times_settled(schedule, processing_times):
+    """True if update_start_times would leave the schedule unchanged."""
+    journal = MoveJournal(schedule)
+    update_start_times_journaled(schedule, processing_times, journal)
+    settled = not journal.entries
+    journal.undo()
+    return settled
+
+
+def move_block(journal, machine, start_index, length, insert_position):
+    """
+    Move `length` jobs starting at `start_index` so that they start at `insert_position` of the machine
+    once removed, with their start times reset to 0.
+    """
+    row = journal.schedule[machine]
+    block = [(job, 0) for job, _ in row[start_index:start_index + length]]
+    rest = row[:start_index] + row[start_index + length:]
+    new_row = rest[:insert_position] + block + rest[insert_position:]
+    first = min(start_index, insert_position)
+    last = max(start_index, insert_position) + length
+    journal.set_slice(machine, first, new_row[first:last])
+
+
+def swap_blocks(journal, machine, start_index1, start_index2, length):
+    """Exchange two non-overlapping blocks of `length` jobs on a machine, with their start times reset to 0."""
+    row = journal.schedule[machine]
+    block1 = [(job, 0) for job, _ in row[start_index1:start_index1 + length]]
+    block2 = [(job, 0) for job, _ in row[start_index2:start_index2 + length]]
+    journal.set_slice(machine, start_index1, block2)
+    journal.set_slice(machine, start_index2, block1)
+
+
+# ## Move descriptors
+# Neighborhoods are generators of lightweight moves, all relative to the schedule they were given :
+#   Move("insert", machine, (start_index, length, insert_position))  move a block of jobs
+#   Move("swap", machine, (start_index1, start_index2, length))       exchange two blocks of jobs
+#   Move("swap_chain", machine, ((idx1, idx2), ...))                  successive pair swaps
+#   Move("relocate", machine, (old_position, insert_position, start)) move one job with a new start time
+#   Move("exchange", machine1, (machine2,))                           exchange the job orders of two machines
+#   Move("tail", machine, (first_position, jobs))                     new job order from first_position on
+# Moved jobs get a start time of 0 (the start time update places them), except for "relocate". "tail"
+# resets the start times of the whole tail, which is then left-shifted.
+# scan_neighborhood scores the moves, so no candidate schedule is built unless it is kept.
+
+Move = namedtuple("Move", ["kind", "machine", "positions"])
+
+
+def apply_move(journal, move):
+    """Apply a move on the journal's schedule (start times not updated). Returns the first and last changed machines."""
+    kind, machine, positions = move
+    schedule = journal.schedule
+    if kind == "insert":
+        start_index, length, insert_position = positions
+        move_block(journal, machine, start_index, length, insert_position)
+    elif kind == "swap":
+        start_index1, start_index2, length = positions
+        swap_blocks(journal, machine, start_index1, start_index2, length)
+    elif kind == "swap_chain":
+        row = schedule[machine]
+        for idx1, idx2 in positions:
+            job1, job2 = row[idx1][0], row[idx2][0]
+            journal.set(machine, idx1, (job2, 0))
+            journal.set(machine, idx2, (job1, 0))
+    elif kind == "relocate":
+        old_position, insert_position, new_start_time = positions
+        row = schedule[machine]
+        remaining_jobs = row[:old_position] + row[old_position + 1:]
+        new_row = remaining_jobs[:insert_position] + [(row[old_position][0], new_start_time)] + remaining_jobs[insert_position:]
+        first = min(old_position, insert_position)
+        last = max(old_position, insert_position) + 1
+        journal.set_slice(machine, first, new_row[first:last])
+    elif kind == "exchange":
+        other = positions[0]
+        row1, row2 = schedule[machine], schedule[other]
+        new_row1 = [(job2, start1) for (job2, _), (_, start1) in zip(row2, row1)]
+        new_row2 = [(job1, start2) for (job1, _), (_, start2) in zip(row1, row2)]
+        journal.set_slice(machine, 0, new_row1)
+        journal.set_slice(other, 0, new_row2)
+        return min(machine, other), max(machine, other)
+    elif kind == "tail":
+        first_position, jobs = positions
+        journal.set_slice(machine, first_position, [(job, 0) for job in jobs])
+    else:
+        raise ValueError(f"Unknown move kind '{kind}'")
+    return machine, machine
+
+
+def apply_move_arrays(order, starts, move):
+    """Same as apply_move on the (machines, jobs) order / start arrays of a schedule, in place."""
+    kind, machine, positions = move
+    row_order, row_starts = order[machine], starts[machine]
+    if kind == "insert":
+        start_index, length, insert_position = positions
+        block = row_order[start_index:start_index + length].copy()
+        rest_order = np.concatenate((row_order[:start_index], row_order[start_index + length:]))
+        rest_starts = np.concatenate((row_starts[:start_index], row_starts[start_index + length:]))
+        row_order[:] = np.concatenate((rest_order[:insert_position], block, rest_order[insert_position:]))
+        row_starts[:] = np.concatenate((rest_starts[:insert_position], np.zeros(length, dtype=row_starts.dtype), rest_starts[insert_position:]))
+    elif kind == "swap":
+        start_index1, start_index2, length = positions
+        block1 = row_order[start_index1:start_index1 + length].copy()
+        row_order[start_index1:start_index1 + length] = row_order[start_index2:start_index2 + length]
+        row_order[start_index2:start_index2 + length] = block1
+        row_starts[start_index1:start_index1 + length] = 0
+        row_starts[start_index2:start_index2 + length] = 0
+    elif kind == "swap_chain":
+        for idx1, idx2 in positions:
+            row_order[idx1], row_order[idx2] = row_order[idx2], row_order[idx1]
+            row_starts[idx1] = row_starts[idx2] = 0
+    elif kind == "relocate":
+        old_position, insert_position, new_start_time = positions
+        job = row_order[old_position]
+        rest_order = np.delete(row_order, old_position)
+        rest_starts = np.delete(row_starts, old_position)
+        row_order[:] = np.insert(rest_order, insert_position, job)
+        row_starts[:] = np.insert(rest_starts, insert_position, new_start_time)
+    elif kind == "exchange":
+        other = positions[0]
+        order[[machine, other]] = order[[other, machine]]
+    elif kind == "tail":
+        first_position, jobs = positions
+        row_order[first_position:] = jobs
+        row_starts[first_position:] = 0
+    else:
+        raise ValueError(f"Unknown move kind '{kind}'")
+
+
+class TradeOffReservoir:
+    """
+    Uniform sample of `size` trade-off candidates (better in one objective, worse in the other) among all
+    those offered, kept by reservoir sampling. A candidate schedule is only built when it enters the sample.
+    """
+
+    __slots__ = ("size", "seen", "sample")
+
+    def __init__(self, size=1):
+        self.size = size
+        self.seen = 0
+        self.sample = []
+
+    def offer(self, build_schedule, fitness):
+        self.seen += 1
+        if len(self.sample) < self.size:
+            self.sample.append((build_schedule(), fitness))
+            return
+        slot = random.randrange(self.seen)
+        if slot < self.size:
+            self.sample[slot] = (build_schedule(), fitness)
+
+
+def classify_move(new_fitness, original_fitness, time_horizon):
+    """'dominating', 'trade_off' or None for a candidate of fitness new_fitness."""
+    delta_cmax = new_fitness[0] - original_fitness[0]
+    delta_tec = new_fitness[1] - original_fitness[1]
+    if (delta_tec == 0 and delta_cmax == 0) or new_fitness[0] > time_horizon:
+        return None
+    if dominates(new_fitness, original_fitness):
+        return "dominating"
+    if (delta_tec < 0 and delta_cmax > 0) or (delta_cmax < 0 and delta_tec > 0):
+        return "trade_off"
+    return None
+
+
+# ## Lower-bound screening
+# A move changing machines first..last of a settled schedule leaves the machines before `first` as they are
+# and can only delay jobs on the machines after `last` (start times act as release dates). Once the rows
+# first..last are updated they are exact, and the machines after `last` are bounded :
+#   Cmax >= old completion of each of them, and >= finish on `last` + processing left (pt_tails)
+#   TEC  >= per machine, the largest of : sum over jobs of p * cheapest price from the job's old start on,
+#           and the cheapest fill of the whole workload from the first old start on (cheapest_energy_after)
+# As the last machine's old completion is in the bound, such a move cannot lower Cmax : it is dropped when
+# the TEC bound does not go below the current TEC, or when the Cmax bound is over the horizon.
+
+def screening_bounds(schedule, objectives, ctx):
+    """
+    Per base schedule : (tec_before, tec_after, completion_after) with tec_before[m] the TEC of machines
+    before m, tec_after[m] the TEC bound of machines after m, completion_after[m] their largest completion.
+    """
+    num_machines = len(schedule)
+    machine_bounds = []
+    for m, row in enumerate(schedule):
+        machine_times = ctx.pt_columns[m]
+        job_bound = sum(machine_times[job] * ctx.price_floor[bisect_right(ctx.time_periods_end, start)]
+                        for job, start in row)
+        fill_bound = cheapest_energy_after(row[0][1], sum(machine_times), ctx)
+        machine_bounds.append(ctx.energy_rates[m] * max(job_bound, fill_bound))
+
+    tec_before = [0.0] + list(accumulate(objectives.tec))
+    tec_after = list(accumulate(reversed(machine_bounds[1:] + [0.0])))[::-1]
+    completion_after = list(accumulate(reversed(objectives.completion[1:] + [0]), max))[::-1]
+    return tec_before, tec_after, completion_after
+
+
+def screen_move(schedule, first_machine, last_machine, original_fitness, bounds, ctx):
+    """
+    Rows first_machine..last_machine (< last machine) of `schedule` already updated. Returns their TEC as
+    {machine: tec} when the move can still dominate or trade off against original_fitness, else None.
+    """
+    tec_before, tec_after, completion_after = bounds
+    machine_times = ctx.pt_columns[last_machine]
+    tails = ctx.pt_tails[last_machine]
+    cmax_bound = max(completion_after[last_machine],
+                     max(start + machine_times[job] + tails[job] for job, start in schedule[last_machine]))
+    if cmax_bound > ctx.time_horizon:
+        return None
+
+    rows_tec = {m: calculate_tec_mach_vnd(schedule, ctx, m) for m in range(first_machine, last_machine + 1)}
+    tec_bound = tec_before[first_machine] + sum(rows_tec.values()) + tec_after[last_machine]
+    # Cmax cannot decrease, the (rounded) TEC has to
+    if tec_bound >= original_fitness[1] - 0.004:
+        return None
+    return rows_tec
+
+
+# Moves scored per NumPy batch, and the smallest instance (machines * jobs) where batching pays off.
+# Below it the moves are applied one by one on the schedule with a MoveJournal (and screened first,
+# which moves the break-even point up).
+VND_BATCH_SIZE = 8
+VND_BATCH_MIN_SIZE = 500
+
+
+def journal_candidates(schedule, moves, original_fitness, ctx):
+    """
+    Apply the moves one at a time on `schedule` (MoveJournal) and yield the fitness of every candidate the
+    lower-bound screening keeps against original_fitness. The candidate is the state of `schedule` until the
+    next item is requested (or the generator is closed), the move is then undone.
+    """
+    journal = MoveJournal(schedule)
+    # Start times only need updating from the changed machine on when the schedule is settled
+    settled = start_times_settled(schedule, ctx.processing_times)
+    # Only the machines a candidate changed are walked, the others come from the base schedule
+    objectives = machine_objectives(schedule, ctx)
+    bounds = screening_bounds(schedule, objectives, ctx) if settled else None
+    last_row = len(schedule) - 1
+    for move in moves:
+        first_machine, last_machine = apply_move(journal, move)
+        try:
+            if bounds is not None and last_machine < last_row:
+                # Changed rows first, the machines after them only if the bounds leave a chance
+                update_start_times_journaled(schedule, ctx.processing_times, journal, first_machine, last_machine,
+                                             stop_machine=last_machine)
+                rows_tec = screen_move(schedule, first_machine, last_machine, original_fitness, bounds, ctx)
+                if rows_tec is None:
+                    continue
+                update_start_times_journaled(schedule, ctx.processing_times, journal, last_machine + 1, last_machine)
+            else:
+                rows_tec = None
+                update_start_times_journaled(schedule, ctx.processing_times, journal, first_machine if settled else 0, last_machine)
+            yield evaluate_changed(schedule, objectives, journal.touched_machines(), ctx, rows_tec)
+        finally:
+            journal.undo()
+
+
+def scan_neighborhood(schedule, moves, original_fitness, reservoir, batch_size, ctx):
+    """
+    Score the moves of a neighborhood in order. Returns (schedule, fitness) of the first move dominating
+    original_fitness, or None; trade-off moves are offered to the reservoir on the way.
+    `schedule` is left unchanged.
+    """
+    if batch_size <= 1:
+        build_schedule = lambda: materialize(schedule)
+        candidates = journal_candidates(schedule, moves, original_fitness, ctx)
+        for new_fitness in candidates:
+            status = classify_move(new_fitness, original_fitness, ctx.time_horizon)
+            if status == "dominating":
+                dominating_solution = (materialize(schedule), new_fitness)
+                candidates.close()
+                return dominating_solution
+            if status == "trade_off":
+                reservoir.offer(build_schedule, new_fitness)
+        return None
+
+    pt = ctx.pt
+    base_order, base_starts = schedule_to_arrays(schedule)
+    moves = iter(moves)
+    while True:
+        batch = list(islice(moves, batch_size))
+        if not batch:
+            return None
+        orders = np.repeat(base_order[None], len(batch), axis=0)
+        starts = np.repeat(base_starts[None], len(batch), axis=0)
+        for k, move in enumerate(batch):
+            apply_move_arrays(orders[k], starts[k], move)
+        batch_update_start_times(orders, starts, pt)
+        cmax, tec = batch_objectives(orders, starts, pt, ctx.rates, ctx.tariff_tables)
+        evaluation_counter.add(len(batch))
+        for k, (new_cmax, new_tec) in enumerate(zip(cmax.tolist(), tec.tolist())):
+            new_fitness = (new_cmax, round(new_tec, 2))
+            status = classify_move(new_fitness, original_fitness, ctx.time_horizon)
+            if status == "dominating":
+                return arrays_to_schedule(orders[k], starts[k]), new_fitness
+            if status == "trade_off":
+                reservoir.offer(lambda k=k: arrays_to_schedule(orders[k], starts[k]), new_fitness)
+
+
+def insert_jobs_within_machine2(schedule, ctx):
+    """Move a random block of jobs to a random position, on every machine (maxessay rounds)."""
+    jobs = ctx.jobs
     essay = 0
     maxessay = round(2 + (jobs - 10) * (10 - 2) / (800 - 10))
 
@@ -1603,71 +3068,19 @@ def insert_jobs_within_machine2(schedule, processing_times,machines,jobs, energy
 
         for machine_index, machine in enumerate(schedule):
 
-            new_schedule = [list(machine) for machine in schedule]
-
-            # Step 2: Select a subsequence of jobs to move
+            # Select a subsequence of jobs to move
             if len(machine) < num_jobs_to_insert:
                 continue  # Skip this machine if there are not enough jobs to move
 
-            t = 0
-            valid_subsequence_found = False
-            while not valid_subsequence_found and t < 10:
-                start_index = random.randint(0, len(machine) - num_jobs_to_insert)
-            
-                if start_index + num_jobs_to_insert <= len(machine):
-                    subsequence = machine[start_index:start_index + num_jobs_to_insert]
-                    valid_subsequence_found = True  # Exit while loop once a valid subsequence is found
-                else:
-                    # If not valid, keep trying by looping again
-                    continue
-                t += 1
-
-            if not valid_subsequence_found:
-                continue
-            # Step 3: Remove the selected subsequence from its original position
-            new_schedule[machine_index] = machine[:start_index] + machine[start_index + num_jobs_to_insert:]
-
-            # Step 4: Insert the subsequence at a random position within the machine's schedule
-            insert_position = random.randint(0, len(new_schedule[machine_index]))
-            new_schedule[machine_index] = new_schedule[machine_index][:insert_position] + subsequence + new_schedule[machine_index][insert_position:]
-
-            # Step 5: Set the start times of the inserted jobs to 0
-            for i in range(num_jobs_to_insert):
-                job_number, _ = new_schedule[machine_index][insert_position + i]
-                new_schedule[machine_index][insert_position + i] = (job_number, 0)  # Set start time to 0 for the inserted jobs
-
-            # Step 6: Recalculate the start times after the insertion (assuming update_start_times adjusts start times accordingly)
-            update_start_times(new_schedule, processing_times)
-
-            # Calculate the new fitness
-            new_fitness = evaluate(new_schedule, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-            new_tec, new_cmax = new_fitness[1], new_fitness[0]
-            delta_tec = new_tec - original_tec
-            delta_cmax = new_cmax - original_cmax
-            
-            if delta_tec == 0 and delta_cmax == 0:
-                continue
-
-            # Check if the new solution dominates the original one
-            if new_cmax <= time_horizon:
-                if dominates(new_fitness, original_fitness):
-                    dominating_solution = (new_schedule, new_fitness)
-                    return solutions, dominating_solution
-                else:
-                    # Store non-dominating solutions with improvement in one objective
-                    if (delta_tec < 0 and delta_cmax > 0) or (delta_cmax < 0 and delta_tec > 0):
-                        solutions.append((new_schedule, new_fitness))
-        
-    return solutions, dominating_solution
-
-def job_swap_on_one_machine(individual, processing_times,machines,jobs, energy_prices, energy_consumption_rates, time_periods_end, time_periods_start,time_horizon): 
-    solutions = []
-    dominating_solution = None
+            start_index = random.randint(0, len(machine) - num_jobs_to_insert)
 
-    original_fitness = evaluate(individual, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-    original_tec, original_cmax = original_fitness[1], original_fitness[0]
+            # Move the subsequence to a random position within the machine's schedule
+            insert_position = random.randint(0, len(machine) - num_jobs_to_insert)
+            yield Move("insert", machine_index, (start_index, num_jobs_to_insert, insert_position))
 
-    # Create a copy of the original schedule to modify
+def job_swap_on_one_machine(individual, ctx):
+    """Swap two random non-overlapping blocks of jobs, on every machine (maxessay rounds)."""
+    jobs = ctx.jobs
     essay = 0
      
     maxessay = round(2 + (jobs - 10) * (10 - 2) / (800 - 10))
@@ -1681,174 +3094,76 @@ def job_swap_on_one_machine(individual, processing_times,machines,jobs, energy_p
         # Loop over each machine in the schedule
         for machine_index, machine in enumerate(individual):
 
-            # new_schedule = [list(machine) for machine in individual]
-            new_schedule = [list(machine) for machine in individual]
-            
             valid_subsequences_found = False
             attempts = 0
 
             while not valid_subsequences_found and attempts < 10:
-                # Randomly select the first subsequence starting point
+                # Randomly select the first and second subsequence starting points
                 start_index1 = random.randint(0, len(machine) - num_jobs_in_subsequence)
-
-                # Validate subsequence1
-                if start_index1 + num_jobs_in_subsequence <= len(machine):
-                    subsequence1 = machine[start_index1:start_index1 + num_jobs_in_subsequence]
-                else:
-                    attempts += 1
-                    continue  # Skip if subsequence1 is invalid
-
-                # Randomly select the second subsequence starting point
                 start_index2 = random.randint(0, len(machine) - num_jobs_in_subsequence)
 
                 # Ensure subsequences do not overlap
                 if abs(start_index1 - start_index2) < num_jobs_in_subsequence:
                     attempts += 1
                     continue  # Skip if subsequences overlap
-
-                # Validate subsequence2
-                if start_index2 + num_jobs_in_subsequence <= len(machine):
-                    subsequence2 = machine[start_index2:start_index2 + num_jobs_in_subsequence]
-                    valid_subsequences_found = True 
-                else:
-                    attempts += 1
-                    continue  # Skip if subsequence2 is invalid
+                valid_subsequences_found = True 
 
             if not valid_subsequences_found:
                 continue
-
-            # Ensure that we don't select the same subsequence (this check is optional)
-            if start_index1 == start_index2:
-                continue
     
-            # Swap the subsequences within the machine
-            machine[start_index1:start_index1 + num_jobs_in_subsequence] = subsequence2
-            machine[start_index2:start_index2 + num_jobs_in_subsequence] = subsequence1
-
-            # Set the start times of the jobs in both subsequences to 0
-            for i in range(num_jobs_in_subsequence):
-                # Set start time of jobs in subsequence 1 to 0
-                job_number, _ = machine[start_index1 + i]
-                machine[start_index1 + i] = (job_number, 0)
-
-                # Set start time of jobs in subsequence 2 to 0
-                job_number, _ = machine[start_index2 + i]
-                machine[start_index2 + i] = (job_number, 0)
-
-            # update_start_times_local(new_schedule, processing_times, machine_index)
-            update_start_times(new_schedule, processing_times)
-
-            # Calculate the new fitness
-            new_fitness = evaluate(new_schedule, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-
-            new_tec, new_cmax = new_fitness[1], new_fitness[0]
-            delta_tec = new_tec - original_tec
-            delta_cmax = new_cmax - original_cmax
-            
-            if delta_tec == 0 and delta_cmax == 0:
-                continue
-
-            # Check if the new solution dominates the original one
-            if new_cmax <= time_horizon:
-                if dominates(new_fitness, original_fitness):
-                    dominating_solution = (new_schedule, new_fitness)
-                    return solutions, dominating_solution
-                else:
-                    # Store non-dominating solutions with improvement in one objective
-                    if (delta_tec < 0 and delta_cmax > 0) or (delta_cmax < 0 and delta_tec > 0):
-                        solutions.append((new_schedule, new_fitness))
-            
-    return solutions, dominating_solution
-
-def job_swap_on_one_machine_logic(individual, processing_times,machines,jobs, energy_prices, energy_consumption_rates, time_periods_end, time_periods_start,time_horizon):
-
-    solutions = []
-    dominating_solution = None
-
-    original_fitness = evaluate(individual, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-    original_tec, original_cmax = original_fitness[1], original_fitness[0]
+            yield Move("swap", machine_index, (start_index1, start_index2, num_jobs_in_subsequence))
 
+def job_swap_on_one_machine_logic(individual, ctx):
+    """
+    Swap the most expensive jobs of each machine pairwise. Swaps accumulate on a machine : every yielded
+    move holds all the swaps made so far on it.
+    """
+    jobs = ctx.jobs
     # num_jobs = max(1, jobs // 10)  # Maximum value for num_jobs
     num_jobs = round(2 + (jobs - 10) * (10 - 2) / (800 - 10))
     # num_jobs = 1
 
     for machine_index in range(len(individual)):
-        new_individual = [list(machine) for machine in individual]
-        machine = new_individual[machine_index]
+        machine = individual[machine_index]
 
         if len(machine) < 2:  # Skip if there are not enough jobs to swap
             continue
 
-        job_costs = [(job_index, total_energy_cost(new_individual, processing_times, time_periods_end, energy_prices, energy_consumption_rates, job_index, machine_index, start_time))
+        job_costs = [(job_index, total_energy_cost(individual, ctx, job_index, machine_index, start_time))
                         for job_index, (job_number, start_time) in enumerate(machine)]
 
         job_costs.sort(key=lambda x: x[1], reverse=True)  # Sort jobs by energy cost in descending order
 
+        job_order = [job for job, _ in machine]
+        swaps = []
         num_swaps = min(num_jobs, len(job_costs) - 1)  # Ensure we don't swap out of bounds
         for i in range(num_swaps):
             job1_index, _ = job_costs[i]
             job2_index, _ = job_costs[i + 1]
 
-            # Find the actual indices of these jobs in the machine schedule
-            idx1 = next(idx for idx, (job, _) in enumerate(machine) if job == job1_index)
-            idx2 = next(idx for idx, (job, _) in enumerate(machine) if job == job2_index)
-
-            # Swap the jobs using their actual indices
-            machine[idx1], machine[idx2] = machine[idx2], machine[idx1]
-
-            # Set start times of swapped jobs to 0
-            machine[idx1] = (machine[idx1][0], 0)  # Reset start time
-            machine[idx2] = (machine[idx2][0], 0)  # Reset start time
-
-            # Update the start times of jobs after the swap
-            update_start_times(new_individual, processing_times)
-
-            # Calculate the new fitness
-            new_fitness = evaluate(new_individual, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-            new_tec, new_cmax = new_fitness[1], new_fitness[0]
-            delta_tec, delta_cmax = new_tec - original_tec, new_cmax - original_cmax
+            # Find the actual indices of these jobs in the (already swapped) machine sequence
+            idx1 = job_order.index(job1_index)
+            idx2 = job_order.index(job2_index)
+            job_order[idx1], job_order[idx2] = job_order[idx2], job_order[idx1]
 
-            # If there's no improvement, revert the swap and stop further swaps
-            if delta_tec == 0 and delta_cmax == 0:
-                continue
-
-            # If the new solution dominates the original one, return immediately
-            if new_cmax <= time_horizon:
-                if dominates(new_fitness, original_fitness):
-                    dominating_solution = (new_individual, new_fitness)
-                    return solutions, dominating_solution
-                else:
-                    if (delta_tec < 0 and delta_cmax > 0) or (delta_cmax < 0 and delta_tec > 0):
-                        solutions.append((new_individual, new_fitness))
-
-    return solutions, dominating_solution
-
-def insert_jobs_within_machine_logic(schedule, processing_times,machines, jobs, energy_prices, energy_consumption_rates, time_periods_end, time_periods_start, time_horizon):
-
-    sorted_periods = sorted(range(len(time_periods_start)), key=lambda i: energy_prices[i])
-    
-    solutions = []
-    dominating_solution = None
-
-    original_fitness = evaluate(schedule, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-    original_tec, original_cmax = original_fitness[1], original_fitness[0]
+            swaps.append((idx1, idx2))
+            yield Move("swap_chain", machine_index, tuple(swaps))
 
+def insert_jobs_within_machine_logic(schedule, ctx):
+    """Move the most expensive jobs of each machine to the start of the cheapest period."""
+    jobs = ctx.jobs
+    sorted_periods = ctx.price_rank
 
     # num_jobs_to_insert = max(1, jobs // 10)  # Maximum value for num_jobs
     num_jobs_to_insert = num_jobs = round(2 + (jobs - 10) * (10 - 2) / (800 - 10))
     # num_jobs_to_insert = 1
 
     for machine_index in range(len(schedule)):
-        new_schedule = [list(machine) for machine in schedule]
         selected_machine_schedule = schedule[machine_index][:]
 
         # **Precompute Energy Costs Once per Job**
         sorted_jobs = [
-            (job[0], job[1], total_energy_cost(
-                schedule, processing_times, time_periods_end, 
-                energy_prices, energy_consumption_rates, 
-                job[0], machine_index, job[1]
-            ))  
+            (job[0], job[1], total_energy_cost(schedule, ctx, job[0], machine_index, job[1]))
             for job in selected_machine_schedule
         ]
 
@@ -1864,95 +3179,243 @@ def insert_jobs_within_machine_logic(schedule, processing_times,machines, jobs,
         for job_number, current_start_time in jobs_to_consider:
             
             # for period_index in sorted_periods:
-            new_schedule = [list(machine) for machine in schedule]
-
             period_index = sorted_periods[0]
 
-            min_energy_period_start = time_periods_start[period_index]
-            min_energy_period_end = time_periods_end[period_index]
-            new_start_time = min_energy_period_start
+            new_start_time = ctx.time_periods_start[period_index]
 
             # Skip if the new position is the same as the original start time
             if new_start_time == current_start_time:
                 continue
 
-            new_schedule[machine_index] = [job for job in selected_machine_schedule if job[0] != job_number]
-
+            # Move the job in front of the first job starting after the cheapest period start
+            old_position = next(i for i, (jn, _) in enumerate(selected_machine_schedule) if jn == job_number)
             insert_position = next(
-                (i for i, (jn, st) in enumerate(new_schedule[machine_index]) if st >= new_start_time),
-                len(new_schedule[machine_index])
-            )
-
-            jobs_to_move = [(job_number, new_start_time)]
-            new_schedule[machine_index] = (
-                new_schedule[machine_index][:insert_position] + jobs_to_move + new_schedule[machine_index][insert_position:]
+                (i for i, (jn, st) in enumerate(job for job in selected_machine_schedule if job[0] != job_number) if st >= new_start_time),
+                len(selected_machine_schedule) - 1
             )
-            
-            update_start_times(new_schedule, processing_times)
-
-            new_fitness = evaluate(new_schedule, processing_times, energy_consumption_rates, time_periods_end, time_periods_start, energy_prices)
-            new_tec, new_cmax = new_fitness[1], new_fitness[0]
-                
-            delta_tec = new_tec - original_tec
-            delta_cmax = new_cmax - original_cmax
-            
-            if delta_tec == 0 and delta_cmax == 0:
+            yield Move("relocate", machine_index, (old_position, insert_position, new_start_time))
+
+# ## Critical path
+# The critical path is walked back from the last operation of the last machine : an operation starting
+# exactly when its machine predecessor ends stays on the machine, otherwise one starting when its job ends
+# on the previous machine moves up to it, otherwise (idle before it, release date) the path stops.
+# A critical block is a run of consecutive path operations on one machine. As in permutation flow shops,
+# only moves at block boundaries can shorten the path : first / last job of a block moved across it, and
+# swaps of the first and last pairs.
+# Start times act as release dates in VND : a move on a machine before the last cannot lower Cmax, and on
+# the last machine the jobs behind the move would keep their start times. The neighborhoods below therefore
+# use the blocks of the last machine and left-shift the machine from the block on ("tail" moves).
+
+def critical_path(schedule, ctx):
+    """(machine, position) operations of a critical path, from the start of the path to the Cmax operation."""
+    pt_columns = ctx.pt_columns
+    machine = len(schedule) - 1
+    position = len(schedule[machine]) - 1
+    job_positions = {}
+    path = []
+    while True:
+        path.append((machine, position))
+        row = schedule[machine]
+        job, start = row[position]
+        if position > 0:
+            previous_job, previous_start = row[position - 1]
+            if previous_start + pt_columns[machine][previous_job] == start:
+                position -= 1
                 continue
+        if machine > 0:
+            if machine - 1 not in job_positions:
+                job_positions[machine - 1] = {j: i for i, (j, _) in enumerate(schedule[machine - 1])}
+            up_position = job_positions[machine - 1][job]
+            up_start = schedule[machine - 1][up_position][1]
+            if up_start + pt_columns[machine - 1][job] == start:
+                machine, position = machine - 1, up_position
+                continue
+        break
+    path.reverse()
+    return path
+
+
+def critical_blocks(schedule, ctx):
+    """(machine, first position, last position) of the critical blocks of two operations or more, along the path."""
+    blocks = []
+    for machine, operations in groupby(critical_path(schedule, ctx), key=lambda operation: operation[0]):
+        positions = [position for _, position in operations]
+        if len(positions) > 1:
+            blocks.append((machine, positions[0], positions[-1]))
+    return blocks
+
+
+def last_machine_blocks(schedule, ctx):
+    """Critical blocks of the last machine, latest first, with the job order of that machine."""
+    last_machine = len(schedule) - 1
+    blocks = [(first, last) for machine, first, last in critical_blocks(schedule, ctx) if machine == last_machine]
+    return last_machine, [job for job, _ in schedule[last_machine]], blocks[::-1]
+
+
+def critical_block_insert(schedule, ctx):
+    """Move the first job of each critical block of the last machine behind it, and the last one in front of it."""
+    machine, jobs, blocks = last_machine_blocks(schedule, ctx)
+    for first, last in blocks:
+        # A two jobs block is covered by critical_block_swap
+        if last - first > 1:
+            block = jobs[first:last + 1]
+            yield Move("tail", machine, (first, tuple(block[1:] + block[:1] + jobs[last + 1:])))
+            yield Move("tail", machine, (first, tuple(block[-1:] + block[:-1] + jobs[last + 1:])))
+
+
+def critical_block_swap(schedule, ctx):
+    """Swap the first two and the last two jobs of each critical block of the last machine."""
+    machine, jobs, blocks = last_machine_blocks(schedule, ctx)
+    for first, last in blocks:
+        for position in sorted({first, last - 1}):
+            tail = jobs[first:]
+            offset = position - first
+            tail[offset], tail[offset + 1] = tail[offset + 1], tail[offset]
+            yield Move("tail", machine, (first, tuple(tail)))
+
+
+VND_NEIGHBORHOODS = [
+    insert_jobs_within_machine2,
+    insert_jobs_within_machine_logic,
+    job_swap_on_one_machine,
+    job_swap_on_one_machine_logic,
+    machine_sequence_swap_logic,
+    critical_block_swap,
+    critical_block_insert
+]
+
+
+def VND(initial_schedule, ctx, batch_size=None, reservoir_size=1, bandit=None):
+    """
+    Explore the neighborhoods in order and return the first dominating neighbor, otherwise a random
+    trade-off neighbor (reservoir sample over all neighborhoods), otherwise the initial schedule.
+    batch_size=None picks batched NumPy scoring on large instances (see VND_BATCH_MIN_SIZE).
+    With a bandit over VND_NEIGHBORHOODS the order (and which neighborhoods are skipped) comes from
+    bandit.ranking(), each scanned neighborhood is credited 1 if it found a dominating neighbor.
+    """
+    local_neighborhoods = bandit.ranking() if bandit is not None else VND_NEIGHBORHOODS
 
+    if batch_size is None:
+        batch_size = VND_BATCH_SIZE if ctx.machines * ctx.jobs >= VND_BATCH_MIN_SIZE else 1
 
-            if new_cmax <= time_horizon:
-                if dominates(new_fitness, original_fitness):
-                    dominating_solution = (new_schedule, new_fitness)
-                    return solutions, dominating_solution
-                else:
-                    # Store non-dominating solutions with improvement in one objective
-                    if (delta_tec < 0 and delta_cmax > 0) or (delta_cmax < 0 and delta_tec > 0):
-                        solutions.append((new_schedule, new_fitness))
-        
-    return solutions, dominating_solution  
-
-def VND(initial_schedule,processing_times,machines, jobs,energy_consumption_rates, time_periods_end, energy_prices, time_periods_start,time_horizon):
-    local_neighborhoods = [
-        insert_jobs_within_machine2,
-        insert_jobs_within_machine_logic,
-        job_swap_on_one_machine,
-        job_swap_on_one_machine_logic,
-        machine_sequence_swap_logic
-    ]
-
-   
-        
-    best_schedule = copy.deepcopy(initial_schedule)
-    initial_fitness = evaluate(initial_schedule, processing_times, energy_consumption_rates, time_periods_end,time_periods_start, energy_prices)
+    # Working schedule : moves are scored against it, only kept candidates are built as new schedules
+    objectives = machine_objectives(initial_schedule, ctx)
+    best_schedule = WorkingSchedule(materialize(initial_schedule))
+    best_schedule.machine_objectives = objectives.copy()
+    initial_fitness = objectives.fitness()
     best_fitness = initial_fitness
-    all_solutions = []
+    reservoir = TradeOffReservoir(reservoir_size)
 
-    for neighborhood_index, neighborhood in enumerate(local_neighborhoods):
-        solutions, dominating_solution = neighborhood(
-            best_schedule,processing_times,machines,jobs, energy_prices, energy_consumption_rates, time_periods_end, time_periods_start, time_horizon
-        )
+    for neighborhood in local_neighborhoods:
+        scan_start = evaluation_counter.count
+        moves = neighborhood(best_schedule, ctx)
+        dominating_solution = scan_neighborhood(best_schedule, moves, initial_fitness, reservoir, batch_size, ctx)
+        if bandit is not None:
+            bandit.credit(neighborhood, 1.0 if dominating_solution else 0.0, evaluation_counter.count - scan_start)
 
         if dominating_solution:
-            if not is_schedule_feasible(dominating_solution[0], processing_times):
+            if CHECK_FEASIBILITY and not is_schedule_feasible(dominating_solution[0], ctx.processing_times):
                 print("dominating sol not feasible")
-            best_schedule = copy.deepcopy(dominating_solution[0])
-            best_fitness = dominating_solution[1]
-            return best_schedule, best_fitness,all_solutions
-        else:
-            if solutions:
-                all_solutions.extend(solutions)
-    
+            best_schedule, best_fitness = dominating_solution
+            return best_schedule, best_fitness, reservoir.sample
 
-    if len(all_solutions) == 0:
-        return initial_schedule, initial_fitness, all_solutions
+    if not reservoir.sample:
+        return initial_schedule, initial_fitness, reservoir.sample
 
-    selected_solution = random.choice(all_solutions)
+    selected_solution = random.choice(reservoir.sample)
     
     # Update best schedule
-    best_schedule = copy.deepcopy(selected_solution[0])
-    best_fitness = selected_solution[1]
+    best_schedule, best_fitness = selected_solution
+
+    return best_schedule, best_fitness, reservoir.sample
+
 
-    return best_schedule, best_fitness, all_solutions
+# ## Pareto local search
+# Intensification of the final front : every archive member has its VND neighborhoods scanned (journal
+# scoring with lower-bound screening, so a move costs the machines it touches), every neighbor no member
+# dominates joins the archive and is scanned in turn. A move the screening drops cannot lower Cmax nor
+# TEC below the member's, so no acceptable neighbor is lost.
+
+class ParetoArchive:
+    """
+    Non-dominated individuals with their (Cmax, TEC), by increasing Cmax (hence decreasing TEC) :
+    dominance checks and insertions are bisections.
+    """
+
+    def __init__(self):
+        self.cmax = []
+        self.tec = []
+        self.members = []
+
+    def accepts(self, fitness):
+        """True when no member weakly dominates fitness."""
+        cmax, tec = fitness
+        index = bisect_right(self.cmax, cmax)
+        return index == 0 or self.tec[index - 1] > tec
+
+    def add(self, individual, fitness):
+        """Insert an accepted individual, returns the members it dominates (removed)."""
+        cmax, tec = fitness
+        first = bisect_left(self.cmax, cmax)
+        last = first
+        while last < len(self.tec) and self.tec[last] >= tec:
+            last += 1
+        removed = self.members[first:last]
+        self.cmax[first:last], self.tec[first:last], self.members[first:last] = [cmax], [tec], [individual]
+        return removed
+
+
+def pareto_local_search(front, ctx, time_budget=None, evaluation_budget=None, neighborhoods=None):
+    """
+    Pareto local search from the individuals of `front` until every archive member is scanned, or
+    time_budget seconds (wall clock) / evaluation_budget move evaluations are spent.
+    Returns the archive individuals by increasing Cmax and the (Cmax, TEC) of the members pushed out.
+    """
+    neighborhoods = VND_NEIGHBORHOODS if neighborhoods is None else neighborhoods
+    deadline = None if time_budget is None else time.time() + time_budget
+    evaluations = 0
+
+    archive = ParetoArchive()
+    for ind in front:
+        if archive.accepts(ind.fitness.values):
+            archive.add(ind, ind.fitness.values)
+    alive = {id(ind) for ind in archive.members}
+    pending = deque(archive.members)
+    pushed_out = []
+
+    def exhausted():
+        return ((evaluation_budget is not None and evaluations >= evaluation_budget)
+                or (deadline is not None and time.time() >= deadline))
+
+    while pending and not exhausted():
+        individual = pending.popleft()
+        if id(individual) not in alive:
+            continue
+        schedule = WorkingSchedule(materialize(individual))
+        schedule.machine_objectives = machine_objectives(individual, ctx).copy()
+        original_fitness = schedule.machine_objectives.fitness()
+
+        for neighborhood in neighborhoods:
+            candidates = journal_candidates(schedule, neighborhood(schedule, ctx), original_fitness, ctx)
+            for fitness in candidates:
+                evaluations += 1
+                if fitness[0] <= ctx.time_horizon and archive.accepts(fitness):
+                    neighbor = creator.Individual(materialize(schedule))
+                    neighbor.fitness.values = fitness
+                    mark_feasible(neighbor, ctx, by_construction=True)
+                    for removed in archive.add(neighbor, fitness):
+                        alive.discard(id(removed))
+                        pushed_out.append(removed.fitness.values)
+                    alive.add(id(neighbor))
+                    pending.append(neighbor)
+                if exhausted():
+                    candidates.close()
+                    break
+            if exhausted():
+                break
+
+    print(f"Pareto local search : {evaluations} evaluations, {len(archive.members)} schedules on the front")
+    return archive.members, pushed_out
 
 
 
@@ -1961,6 +3424,219 @@ def VND(initial_schedule,processing_times,machines, jobs,energy_consumption_rate
 ######################## NSGA-II ########################################
 ##################################################################################
 
+# ## Convergence detection
+
+def hypervolume_2d(points, reference):
+    """
+    Hypervolume of a set of (Cmax, TEC) points w.r.t. a reference point (both objectives minimised).
+    Points that do not strictly dominate the reference point are ignored.
+    """
+    ref_cmax, ref_tec = reference
+    hv = 0.0
+    best_tec = ref_tec
+    # Sweep by increasing Cmax, every point that lowers the best TEC adds a rectangle
+    for cmax, tec in sorted(set(points)):
+        if cmax >= ref_cmax or tec >= best_tec:
+            continue
+        hv += (ref_cmax - cmax) * (best_tec - tec)
+        best_tec = tec
+    return hv
+
+
+def additive_epsilon(front_a, front_b):
+    """
+    Additive epsilon indicator I(A, B): smallest shift of A so that it weakly dominates every point of B.
+    """
+    return max(
+        min(max(a_cmax - b_cmax, a_tec - b_tec) for a_cmax, a_tec in front_a)
+        for b_cmax, b_tec in front_b
+    )
+
+
+class ConvergenceDetector:
+    """
+    Stopping rule based on the change of a front indicator over a sliding window of generations.
+
+    indicator = "hv"  : relative hypervolume gain over the window must stay below `tolerance`
+    indicator = "eps" : additive epsilon between the current front and the front `window` generations
+                        ago (objectives normalised by the reference point) must stay below `tolerance`
+
+    The detector only sees the non-dominated front of the current population, so its cost is bounded
+    by the population size and does not grow with the archive.
+    """
+
+    def __init__(self, reference, indicator="hv", window=10, tolerance=1e-3):
+        if indicator not in ("hv", "eps"):
+            raise ValueError(f"Unknown convergence indicator: {indicator}")
+        self.reference = reference
+        self.indicator = indicator
+        self.window = window
+        self.tolerance = tolerance
+        self.history = deque(maxlen=window + 1)
+
+    def update(self, front_points):
+        """
+        Record the (Cmax, TEC) points of the current front and return True once the run has converged.
+        """
+        if self.indicator == "hv":
+            self.history.append(hypervolume_2d(front_points, self.reference))
+        else:
+            ref_cmax, ref_tec = self.reference
+            self.history.append([(cmax / ref_cmax, tec / ref_tec) for cmax, tec in front_points])
+
+        if len(self.history) <= self.window:
+            return False
+
+        if self.indicator == "hv":
+            current_hv, old_hv = self.history[-1], self.history[0]
+            if current_hv <= 0:
+                return False
+            return (current_hv - old_hv) / current_hv <= self.tolerance
+
+        # How far the old front has to move to cover the new one (0 when nothing new was found)
+        return additive_epsilon(self.history[0], self.history[-1]) <= self.tolerance
+
+
+# ## Explored solutions
+# Only the (Cmax, TEC) of the explored solutions are kept, not the schedules : a fixed-size reservoir sample
+# in memory, or every point streamed to a CSV file. Memory then stays flat over the generations.
+
+class ExploredRecord:
+    """
+    (Cmax, TEC) points of the explored solutions. Without `path` a uniform sample of at most `capacity`
+    points is kept (reservoir sampling on its own random stream, the search draws are not affected),
+    with a CSV `path` every point is written to the file.
+    """
+
+    def __init__(self, capacity=10000, path=None, seed=0):
+        self.capacity = capacity
+        self.path = path
+        self.sample = []
+        self.seen = 0
+        self.rng = random.Random(seed)
+        self.file = None
+        if path is not None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.file = open(path, "w", newline="")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(["Makespan", "TEC"])
+
+    def add(self, points):
+        if self.file is not None:
+            self.writer.writerows(points)
+            return
+        for point in points:
+            self.seen += 1
+            if len(self.sample) < self.capacity:
+                self.sample.append(point)
+            else:
+                slot = self.rng.randrange(self.seen)
+                if slot < self.capacity:
+                    self.sample[slot] = point
+
+    def points(self, exclude=()):
+        """
+        Sorted sampled points that are not in `exclude` (the front points). With a CSV the file is rewritten
+        without them, streaming through it (the points stay on disk), and [] is returned.
+        """
+        exclude = set(exclude)
+        if self.path is None:
+            return sorted(set(self.sample) - exclude)
+        self.close()
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(self.path, newline="") as source, open(temporary, "w", newline="") as target:
+            rows = csv.reader(source)
+            writer = csv.writer(target)
+            writer.writerow(next(rows))
+            for row in rows:
+                if (float(row[0]), float(row[1])) not in exclude:
+                    writer.writerow(row)
+        os.replace(temporary, self.path)
+        return []
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+# ## Adaptive operator selection
+
+class OperatorBandit:
+    """
+    Adaptive operator selection. Each arm (toolbox operator or VND neighborhood) is credited with the
+    archive improvements it produced per evaluation it spent (evaluation_counter : candidates it scored,
+    plus the evaluation of the offspring it built), arms are picked with a UCB1 index on that rate.
+    Evaluations rather than CPU time, so a seeded run makes the same choices every time.
+    Statistics are discounted every generation so the choice follows the phase of the run.
+    """
+
+    def __init__(self, arms, exploration=0.3, discount=0.9, skip_ratio=0.1):
+        self.arms = list(arms)
+        self.exploration = exploration
+        self.discount = discount
+        self.skip_ratio = skip_ratio
+        self.pulls = dict.fromkeys(self.arms, 0.0)
+        self.rewards = dict.fromkeys(self.arms, 0.0)
+        self.cost = dict.fromkeys(self.arms, 0.0)
+
+    def rate(self, arm):
+        return self.rewards[arm] / max(self.cost[arm], 1e-6)
+
+    def scores(self):
+        """
+        UCB1 index per arm. The rate is normalised by the best rate so the exploration bonus keeps the
+        same scale whatever the instance size, arms never tried get an infinite index.
+        """
+        total = sum(self.pulls.values())
+        best_rate = max(self.rate(arm) for arm in self.arms) or 1.0
+        scores = {}
+        for arm in self.arms:
+            if self.pulls[arm] == 0:
+                scores[arm] = math.inf
+            else:
+                bonus = self.exploration * math.sqrt(math.log(1.0 + total) / self.pulls[arm])
+                scores[arm] = self.rate(arm) / best_rate + bonus
+        return scores
+
+    def select(self):
+        scores = self.scores()
+        return max(self.arms, key=lambda arm: (scores[arm], random.random()))
+
+    def ranking(self):
+        """
+        Arms by decreasing index, without the ones whose index fell below skip_ratio * best index.
+        A skipped arm is not pulled, so its discounted pull count shrinks and the bonus brings it back.
+        """
+        scores = self.scores()
+        finite = [score for score in scores.values() if score != math.inf]
+        threshold = self.skip_ratio * max(finite) if finite else 0.0
+        ranked = sorted(self.arms, key=lambda arm: (scores[arm], random.random()), reverse=True)
+        return [arm for arm in ranked if scores[arm] >= threshold]
+
+    def credit(self, arm, reward, evaluations):
+        self.pulls[arm] += 1
+        self.rewards[arm] += reward
+        self.cost[arm] += evaluations
+
+    def decay(self):
+        for stats in (self.pulls, self.rewards, self.cost):
+            for arm in stats:
+                stats[arm] *= self.discount
+
+
+def improves_front(individual, front_points, ctx):
+    """
+    1.0 when the evaluated individual is feasible and no point of the front weakly dominates it, else 0.0.
+    """
+    cmax, tec = individual.fitness.values
+    if cmax > ctx.time_horizon:
+        return 0.0
+    if any(f_cmax <= cmax and f_tec <= tec for f_cmax, f_tec in front_points):
+        return 0.0
+    return 1.0 if is_feasible(individual, ctx) else 0.0
+
+
 def filter_duplicates(pareto_front):
     """
     Remove individuals with duplicate (Cmax, TEC) fitness values.
@@ -1977,73 +3653,87 @@ def filter_duplicates(pareto_front):
     return filtered_front
 
 
-seen_schedules = []
-seen_fitness = []
-
-def is_duplicate(individual, fitness):
-    """
-    Check if the individual (schedule) is a duplicate in terms of schedule or fitness values.
-    """
-    cmax, tec = fitness  # Get the fitness values (Cmax and TEC)
-
-    # Convert the individual (list of machines, each with a list of jobs/tuples) to a tuple
-    individual_tuple = tuple(tuple(machine) for machine in individual)  # Nested tuple conversion
-
-    # Check if the schedule already exists in the population
-    if individual_tuple in seen_schedules:
-        return True  # Duplicate schedule
-
-    # Check if the fitness values already exist in the fitness values list
-    if (cmax, tec) in seen_fitness:
-        return True  # Duplicate fitness values
-
-    return False  # No duplicates
-
-def process_instance(instance, energy_config, consumption_config):
-
-    machines = instance["machines"]
-    jobs = instance["jobs"]
-    processing_times = instance["processing_times"]
-    energy_prices_data = instance["energy_prices"][energy_config]  # "6CW" or "CM"
-    time_periods = energy_prices_data["end"]
-    time_periods_start = energy_prices_data["start"]
-    time_periods_end = energy_prices_data["end"]
-    energy_prices = energy_prices_data["prices"]
-    energy_consumption_rates = instance["energy_consumption_rates"][consumption_config]  # "PS" or "PB"
+def process_instance(instance, energy_config, consumption_config, convergence_indicator="hv", convergence_window=10, convergence_tolerance=1e-3, adaptive_operators=True, size_pop=100, migration=None, scenarios=None, robust=False, nfs_cache=None, nfs_seed=0, warm_start=None, archive_path=None, archive_explored=20,
+                     explored_capacity=10000, explored_path=None, array_crossovers=True,
+                     pls_time=None, pls_evaluations=None, memory_profile=None):
+    # With a ScenarioSet (build_scenarios) the final front and population are also evaluated under every
+    # tariff x rate scenario and {scenario name: front points} is returned as a 7th value. With robust=True the TEC
+    # objective of the search is the worst-case TEC over the scenarios (VND still scores its moves under
+    # energy_config / consumption_config, every individual is re-evaluated robustly before selection).
+    # nfs_cache (NFSCache) : the NFS schedules of the initial population are reused across runs (see init_population)
+    # archive_path : the final front and archive_explored other schedules of the last population are saved
+    # there (save_schedule_archive), warm_start : archive whose schedules seed the initial population
+    # Explored solutions are recorded as points (ExploredRecord) : a sample of explored_capacity points,
+    # or all of them streamed to the explored_path CSV (the explored values returned are then empty)
+    # array_crossovers : crossovers run with the array kernels (PMX, two-point, TEC uniform and OX), False
+    # keeps the list operators (pmx_crossover, cxTwoPoint, uniform_crossover)
+    # pls_time (seconds) / pls_evaluations : budget of a Pareto local search on the final front (off when both are None)
+    # memory_profile (MemoryProfile) : memory recorded at the end of every stage of the run
+    if robust and scenarios is None:
+        raise ValueError("robust=True needs a ScenarioSet")
+    pareto_search = pls_time is not None or pls_evaluations is not None
+    if robust and pareto_search:
+        raise ValueError("The Pareto local search scores moves under energy_config / consumption_config, not with robust=True")
+
+    create_types()
+    # Everything derived from the instance, the tariff ("6CW" or "CM") and the rates ("PS" or "PB")
+    ctx = build_context(instance, energy_config, consumption_config)
+    machines = ctx.machines
+    jobs = ctx.jobs
+    processing_times = ctx.processing_times
+    time_periods_end = ctx.time_periods_end
 
     print(f"len processing times : {len(processing_times[0]), len(processing_times)}")
     # Initialize genetic algorithm components
     toolbox = base.Toolbox()
     toolbox.register("individual", tools.initIterate, creator.Individual, lambda: create_individual(machines, jobs, processing_times))
-    toolbox.register("population", init_population,
-                 processing_times=processing_times,
-                 energy_prices=energy_prices,
-                 energy_consumption_rates=energy_consumption_rates,
-                 size_pop= 100,
-                 time_periods=time_periods,
-                 time_periods_start = time_periods_start,
-                 time_periods_end=time_periods_end,
-                 jobs= jobs,
-                 machines= machines)
-
-
-    toolbox.register("mate", lambda ind1, ind2: pmx_crossover(ind1, ind2, processing_times))
-    toolbox.register("mate2", lambda ind1, ind2: cxTwoPoint(ind1, ind2, machines, jobs, processing_times))
-    toolbox.register("mate3", lambda ind1, ind2: uniform_crossover(ind1, ind2,machines, jobs, processing_times, energy_prices_data))
+    toolbox.register("population", init_population, ctx, size_pop=size_pop, nfs_cache=nfs_cache, nfs_seed=nfs_seed,
+                     warm_start=warm_start)
+
+
+    if array_crossovers:
+        toolbox.register("mate", lambda ind1, ind2: array_crossover(ind1, ind2, ctx, "pmx"))
+        toolbox.register("mate2", lambda ind1, ind2: array_crossover(ind1, ind2, ctx, "two_point"))
+        toolbox.register("mate3", lambda ind1, ind2: array_crossover(ind1, ind2, ctx, "uniform_tec"))
+        toolbox.register("mate4", lambda ind1, ind2: array_crossover(ind1, ind2, ctx, "ox"))
+    else:
+        toolbox.register("mate", lambda ind1, ind2: pmx_crossover(ind1, ind2, ctx))
+        toolbox.register("mate2", lambda ind1, ind2: cxTwoPoint(ind1, ind2, ctx))
+        toolbox.register("mate3", lambda ind1, ind2: uniform_crossover(ind1, ind2, ctx))
     
-    toolbox.register("mutate", lambda ind: mutSwap(ind, processing_times))
-    toolbox.register("mutate2", lambda ind: inversion_mutation(ind, machines, processing_times))
-    toolbox.register("mutate3", lambda ind: insert_jobs_within_machine(ind,processing_times, energy_prices,energy_consumption_rates,time_periods,time_periods_start, num_jobs_to_insert=1))
-    toolbox.register("mutate5", lambda ind: tec_reducer(ind, processing_times, time_periods_start, time_periods_end, energy_prices))
-    toolbox.register("evaluate", lambda ind: evaluate(ind,processing_times,energy_consumption_rates,time_periods_end, time_periods_start, energy_prices))
+    toolbox.register("mutate", lambda ind: mutSwap(ind, ctx))
+    toolbox.register("mutate2", lambda ind: inversion_mutation(ind, ctx))
+    toolbox.register("mutate3", lambda ind: insert_jobs_within_machine(ind, ctx, num_jobs_to_insert=1))
+    toolbox.register("mutate5", lambda ind: tec_reducer(ind, ctx))
+    # How the operators build feasible schedules (validity flags, see mark_feasible) : "rebuild" keeps the
+    # machines permutations and recomputes every start time, "preserve" recomputes them from the changed
+    # machine on (feasible when the parent is). tec_reducer (its backward placement can overlap operations)
+    # and the list uniform crossover (can duplicate jobs) are scanned.
+    construction = {"mate": "rebuild", "mate2": "rebuild", "mate4": "rebuild",
+                    "mutate": "rebuild", "mutate2": "preserve", "mutate3": "rebuild"}
+    if array_crossovers:
+        construction["mate3"] = "rebuild"
+
+    if robust:
+        toolbox.register("evaluate", lambda ind: evaluate_population([ind], ctx, scenarios=scenarios)[0])
+        toolbox.register("evaluate_population", lambda pop: evaluate_population(pop, ctx, scenarios=scenarios))
+    else:
+        toolbox.register("evaluate", lambda ind: evaluate(ind, ctx))
+        toolbox.register("evaluate_population", lambda pop: evaluate_population(pop, ctx))
 
     # 1. Initialize the population
     population = toolbox.population()
-    for ind in population:
-        if not ind.fitness.valid :
-            ind.fitness.values = toolbox.evaluate(ind)
-
-    explored_sol_unfiltered = population[:]  # Slice notation for lists
+    toolbox.evaluate_population([ind for ind in population if not ind.fitness.valid])
+    # Random individuals are not always feasible : the initial flags come from one batch check
+    for ind, feasible in zip(population, batch_feasible(population, ctx)):
+        ind.feasible = bool(feasible)
+    if memory_profile is not None:
+        memory_profile.stage("init_population", population)
+
+    # Points of the individuals entering the population, the schedules themselves are not kept
+    explored = ExploredRecord(explored_capacity, explored_path)
+    explored.add(ind.fitness.values for ind in population)
+    previous_population = population[:]
     # Parameters
     generations = 100
     Pc = 0.8
@@ -2053,9 +3743,25 @@ def process_instance(instance, energy_config, consumption_config):
     cmax_values_init = [ind.fitness.values[0] for ind in global_pareto_front]
     tec_values_init = [ind.fitness.values[1] for ind in global_pareto_front]
     random_ind = population[0]
-    # No improvement count
-    no_improvement_count = 0
-    max_no_improvement = 20  # Threshold for stopping
+    # Stopping rule : indicator change over a sliding window of generations
+    reference_point = (
+        1.1 * max(ind.fitness.values[0] for ind in population),
+        1.1 * max(ind.fitness.values[1] for ind in population),
+    )
+    convergence = ConvergenceDetector(reference_point, indicator=convergence_indicator,
+                                      window=convergence_window, tolerance=convergence_tolerance)
+    # Operator selection : with adaptive_operators the bandits learn which crossover, mutation and
+    # VND neighborhoods pay off per CPU-second, otherwise the fixed mate2 / mutate2 / VND order is used
+    if adaptive_operators:
+        crossover_bandit = OperatorBandit(["mate", "mate2", "mate3"] + (["mate4"] if array_crossovers else []))
+        mutation_bandit = OperatorBandit(["mutate", "mutate2", "mutate3", "mutate5"])
+        neighborhood_bandit = OperatorBandit(VND_NEIGHBORHOODS)
+    else:
+        crossover_bandit = OperatorBandit(["mate2"])
+        mutation_bandit = OperatorBandit(["mutate2"])
+        neighborhood_bandit = None
+    front_points = [ind.fitness.values for ind in global_pareto_front]
+
     gen = 0
     unchanged = True
     while (gen < generations) :
@@ -2079,83 +3785,113 @@ def process_instance(instance, energy_config, consumption_config):
         # Step 3: Clone the first half to create offspring
         offspring = list(map(toolbox.clone, half_selected))
 
+        # Operators that produced each offspring slot : (bandit, arm, evaluations), credited after evaluation
+        credits = [[] for _ in offspring]
+
         # Step 4: Perform Crossover & Generate New Individuals
         for i in range(0, len(offspring) - 1, 2):
             parent1 = offspring[i]
             parent2 = offspring[i + 1]
             if random.random() < Pc:  # Crossover probability
-                if random.random() < 1.0:
-                    child1_raw, child2_raw = toolbox.mate2(parent1, parent2)
-                else : 
-                    child1_raw, child2_raw = toolbox.mate4(parent1, parent2)
+                operator = crossover_bandit.select()
+                operator_start = evaluation_counter.count
+                child1_raw, child2_raw = getattr(toolbox, operator)(parent1, parent2)
+                # Each child costs its share of the operator's evaluations and its own evaluation
+                operator_cost = (evaluation_counter.count - operator_start) / 2 + 1
                 # Convert raw offspring to DEAP Individuals
                 child1 = creator.Individual([list(machine) for machine in child1_raw])
                 child2 = creator.Individual([list(machine) for machine in child2_raw])
                 
-                #print(f"are the children feasible? {(is_schedule_feasible(child1,processing_times) and is_schedule_feasible(child2,processing_times))}")
-                
                 # Remove old fitness values (they need to be recalculated)
                 del child1.fitness.values
                 del child2.fitness.values
 
-                offspring[i] = child1
-                offspring[i + 1 ] = child2
+                # Some crossovers (uniform) can duplicate jobs : an infeasible child gives its slot back to
+                # the parent (operators work in place, so it is cloned again from the selection)
+                for slot, child in ((i, child1), (i + 1, child2)):
+                    if mark_feasible(child, ctx, by_construction=construction.get(operator) == "rebuild"):
+                        offspring[slot] = child
+                        credits[slot].append((crossover_bandit, operator, operator_cost))
+                    else:
+                        offspring[slot] = toolbox.clone(half_selected[slot])
+                        crossover_bandit.credit(operator, 0.0, operator_cost)
                 
 
         # 4. Mutation
         for i, mutant in enumerate(offspring):
             if random.random() < Pm :
-                if random.random() <= 1.0 :
-                    mutant_raw =toolbox.mutate2(mutant)
-                else :
-                    mutant_raw = toolbox.mutate5(mutant)
+                operator = mutation_bandit.select()
+                by_construction = (construction.get(operator) == "rebuild"
+                                   or construction.get(operator) == "preserve" and is_feasible(mutant, ctx))
+                operator_start = evaluation_counter.count
+                mutant_raw = getattr(toolbox, operator)(mutant)
+                operator_cost = evaluation_counter.count - operator_start + 1
+                if mutant_raw is offspring[i]:
+                    # Operators working in place (mutSwap, insert) changed the offspring too : it is evaluated
+                    # again even when the mutant is rejected
+                    offspring[i].feasible = by_construction or None
+                    del offspring[i].fitness.values
 
                 mutant = creator.Individual([list(machine) for machine in mutant_raw])
                 cmax = calculate_cmax(mutant, processing_times)
-                if is_schedule_feasible(mutant,processing_times) and cmax <= time_periods_end[-1] :
+                if cmax <= time_periods_end[-1] and mark_feasible(mutant, ctx, by_construction) :
                     offspring[i] = mutant
+                    credits[i].append((mutation_bandit, operator, operator_cost))
+                else:
+                    mutation_bandit.credit(operator, 0.0, operator_cost)
                 
                 del mutant.fitness.values
 
 
-        for ind in offspring:
-            if not ind.fitness.valid:
-                ind.fitness.values = toolbox.evaluate(ind)
+        toolbox.evaluate_population([ind for ind in offspring if not ind.fitness.valid])
+
+        # Credit the operators with the offspring that made it past the current front
+        for ind, slot_credits in zip(offspring, credits):
+            if slot_credits:
+                reward = improves_front(ind, front_points, ctx)
+                for bandit, operator, operator_cost in slot_credits:
+                    bandit.credit(operator, reward, operator_cost)
         
         
-        sorted_by_tec = sorted(offspring, key=lambda ind: ind.fitness.values[1], reverse=True)[:10]  # Worst 10 in TEC
+        sorted_by_tec = sorted(offspring, key=lambda ind: ind.fitness.values[1], reverse=True)[:len(offspring) // 5]  # Worst 10 in TEC (for 100 individuals)
+
+        if memory_profile is not None:
+            memory_profile.stage("variation", offspring)
 
         #selected_individuals = sorted_by_tec
         # Apply VND to selected individuals
         selected_individuals = sorted_by_tec #tools.sortNondominated(offspring, len(offspring), first_front_only=False)[0]
         
         for mutant in selected_individuals:
+            # VND moves keep a feasible schedule feasible
+            vnd_feasible = is_feasible(mutant, ctx)
+            best_schedule, _, _ = VND(mutant, ctx, bandit=neighborhood_bandit)
             
-            best_schedule, _, _ = VND(mutant,processing_times,machines, jobs,energy_consumption_rates, 
-                                   time_periods_end, energy_prices, time_periods_start, time_periods_end[-1])
-            
-            if random.random() > 0.5 : 
+            if random.random() > 0.5 :
                 mutated_schedule = toolbox.mutate5(best_schedule)
-            else : 
+            else :
                 mutated_schedule = best_schedule 
                 
-            
+            mutated_feasible = mark_feasible(mutated_schedule, ctx, by_construction=vnd_feasible and mutated_schedule is best_schedule)
             cmax = calculate_cmax(mutated_schedule,processing_times)
-            if is_schedule_feasible(mutated_schedule, processing_times) and cmax <= time_periods_end[-1]:
-                mutant[:] = mutated_schedule[:]  # Assign only if feasible
-            elif not is_schedule_feasible(mutated_schedule, processing_times):
-                if is_schedule_feasible(best_schedule, processing_times) :
-                    mutant[:] = best_schedule[:] 
+            if cmax <= time_periods_end[-1] and mutated_feasible:
+                assign_schedule(mutant, mutated_schedule)  # Assign only if feasible
+                mutant.feasible = True
+            elif not mutated_feasible:
+                if mark_feasible(best_schedule, ctx, by_construction=vnd_feasible) :
+                    assign_schedule(mutant, best_schedule)
+                    mutant.feasible = True
+        if memory_profile is not None:
+            memory_profile.stage("vnd", offspring)
 
         # 5. Combine the populations ensuring no infeasible solutions
+        # (VND results only walk the machines assign_schedule marked as changed)
         combined_population = population[:]
         for ind in offspring:
-            ind.fitness.values = toolbox.evaluate(ind)
-            fitness = ind.fitness.values
-            if is_schedule_feasible(ind, processing_times) and fitness[0] <= time_periods_end[-1] :
-                combined_population.append(ind)
-                seen_schedules.append(tuple(tuple(machine) for machine in ind))
-                seen_fitness.append(fitness)
+            if not ind.fitness.valid:
+                ind.fitness.values = toolbox.evaluate(ind)
+        combined_population += feasible_individuals(
+            [ind for ind in offspring if ind.fitness.values[0] <= time_periods_end[-1]], ctx)
             
 
         # # Evaluate fitness of the new population
@@ -2174,41 +3910,42 @@ def process_instance(instance, energy_config, consumption_config):
 
         # Merge both parts to create the new population
         population[:cutoff] = selected_top_90
-        explored_sol_unfiltered.extend(population)
+        previous_ids = {id(ind) for ind in previous_population}
+        explored.add(ind.fitness.values for ind in population if id(ind) not in previous_ids)
 
         current_non_dominated = tools.sortNondominated(population, len(population), first_front_only=False)[0]
        
         # Extract all Cmax and TEC values from current non-dominated solutions
         cmax_values = [ind.fitness.values[0] for ind in current_non_dominated]
         tec_values = [ind.fitness.values[1] for ind in current_non_dominated]
+        front_points = list(zip(cmax_values, tec_values))
+        for bandit in (crossover_bandit, mutation_bandit, neighborhood_bandit):
+            if bandit is not None:
+                bandit.decay()
 
         # Find the best (minimum) values
         #best_cmax = min(cmax_values)
         #best_tec = min(tec_values)
-        global_pareto_front += current_non_dominated
+        # The archive front only keeps non-dominated individuals (survivors are not added twice)
+        on_front = {id(ind) for ind in global_pareto_front}
+        global_pareto_front += [ind for ind in current_non_dominated if id(ind) not in on_front]
+        global_pareto_front = tools.sortNondominated(global_pareto_front, len(global_pareto_front), first_front_only=True)[0]
         # Print the results
         #print(f"Best Cmax: {best_cmax}, Best TEC: {best_tec}")
 
-        # Remove individuals from current_non_dominated from explored_sol_unfiltered
-        explored_sol_unfiltered = [ind for ind in explored_sol_unfiltered if ind not in current_non_dominated]
-
-        # Check for improvement
-        improvement_found = False
-        for new_sol in current_non_dominated:
-            for existing_sol in global_pareto_front:
-                if dominates(new_sol.fitness.values, existing_sol.fitness.values):
-                    improvement_found = True
-                    break
-            if improvement_found:
-                break
-
-        if improvement_found:
-            no_improvement_count = 0
-        else:
-            no_improvement_count += 1
-
-        if no_improvement_count >= max_no_improvement:
-            print(f"Stopping early at generation {gen} due to no improvement in the last {max_no_improvement} generations.")
+        # Island model : send part of the front to the other islands, immigrants replace the kept 10%
+        if migration is not None:
+            immigrants = migration.exchange(gen, current_non_dominated)[:len(population) - cutoff]
+            population[cutoff:cutoff + len(immigrants)] = immigrants
+        previous_population = population[:]
+        if CHECK_FEASIBILITY:
+            check_feasibility_flags(population + offspring, ctx)
+        if memory_profile is not None:
+            memory_profile.stage("generation", population)
+
+        # Check for convergence
+        if convergence.update([ind.fitness.values for ind in current_non_dominated]):
+            print(f"Stopping early at generation {gen}: {convergence_indicator} changed less than {convergence_tolerance} over the last {convergence_window} generations.")
             break
 
         # Update global pareto front
@@ -2227,26 +3964,22 @@ def process_instance(instance, energy_config, consumption_config):
     global_pareto_front = tools.sortNondominated(global_pareto_front, len(global_pareto_front), first_front_only=False)[0]
     #print(f"shape of global pareto front after NS: {len(global_pareto_front), len(global_pareto_front[0]), len(global_pareto_front[0][0])}")
     
-    explored_sol_unfiltered = [ind for ind in explored_sol_unfiltered if ind not in global_pareto_front]
-
     # Fitler out non-feasible solutions
-    filtered_front = []
-    for ind in global_pareto_front:
-        if is_schedule_feasible(ind, processing_times) and ind.fitness.values[0] <= time_periods_end[-1] :
-            filtered_front.append(ind)
+    filtered_front = feasible_individuals(
+        [ind for ind in global_pareto_front if ind.fitness.values[0] <= time_periods_end[-1]], ctx)
     
     
 
-    explored_sol =[]
-    for sol in explored_sol_unfiltered :
-        ind.fitness.values = toolbox.evaluate(sol)
-        if is_schedule_feasible(sol, processing_times) :
-            explored_sol.append(sol)
-
     # Filter duplicates
-    explored_sol = filter_duplicates(explored_sol)
     filtered_front = filter_duplicates(filtered_front)
 
+    if pareto_search:
+        filtered_front, pushed_out = pareto_local_search(filtered_front, ctx, time_budget=pls_time,
+                                                         evaluation_budget=pls_evaluations)
+        explored.add(pushed_out)
+    if memory_profile is not None:
+        memory_profile.stage("front", filtered_front)
+
 
     # Print the schedules and their fitness values
     print("\nSchedules and Fitness Values of the First Front:")
@@ -2260,11 +3993,10 @@ def process_instance(instance, energy_config, consumption_config):
     tec_values = [ind.fitness.values[1] for ind in filtered_front]
     print("Minimum TEC value:", min(tec_values))
 
-    # Add all explored solutions
-    cmax_values_explored = [sol.fitness.values[0] for sol in explored_sol]
-    tec_values_explored = [sol.fitness.values[1] for sol in explored_sol]
-    sorted_explored = sorted(zip(cmax_values_explored, tec_values_explored), key=lambda x: x[0])
-    sorted_cmax_explored, sorted_tec_explored = zip(*sorted_explored)
+    # Add all explored solutions (recorded points that are not on the front)
+    sorted_explored = explored.points(exclude=zip(cmax_values, tec_values))
+    explored.close()
+    sorted_cmax_explored, sorted_tec_explored = tuple(zip(*sorted_explored)) or ((), ())
 
     # Sort the values of Cmax and TEC to ensure proper line connection
     sorted_front = sorted(zip(cmax_values, tec_values), key=lambda x: x[0])  # Sorting by Cmax
@@ -2273,20 +4005,980 @@ def process_instance(instance, energy_config, consumption_config):
     sorted_front_init = sorted(zip(cmax_values_init, tec_values_init), key=lambda x: x[0])  # Sorting by Cmax
     sorted_cmax_init, sorted_tec_init = zip(*sorted_front_init)  # Unzipping the sorted values
 
+    if archive_path is not None:
+        on_front = {id(ind) for ind in filtered_front}
+        others = feasible_individuals([ind for ind in population if id(ind) not in on_front], ctx)
+        save_schedule_archive(archive_path, filtered_front, filter_duplicates(others)[:archive_explored])
+        if memory_profile is not None:
+            memory_profile.stage("archive")
+
+    if scenarios is not None:
+        fronts = scenario_fronts(filtered_front + population, ctx, scenarios)
+        return sorted_cmax, sorted_tec, sorted_cmax_init, sorted_tec_init, sorted_cmax_explored, sorted_tec_explored, fronts
     return sorted_cmax, sorted_tec, sorted_cmax_init, sorted_tec_init, sorted_cmax_explored, sorted_tec_explored
 
 
 
 
+# ## Worker processes
+# Islands, queue workers, dashboard parsers and the per-instance processes of main start through
+# worker_context(), under START_METHOD : "fork" (Linux default, the child shares the parent's memory),
+# "forkserver" (a server process imports this script once and every worker forks from it) or "spawn"
+# (every worker imports the script again; Windows and macOS default). A worker gets the evaluation backend
+# and the start method of its own workers from run_worker instead of inheriting them, so the three behave
+# the same. The forkserver imports the script once and becomes its __main__, so the workers it forks start
+# without running the script again. It can also load instances once for all of them (preload_instances),
+# workers then read them from INSTANCE_CACHE (instance_data) instead of parsing the instance files.
+
+START_METHOD = None  # None : the platform default
+
+FORKSERVER_VARIABLE = "NFS_VND_FORKSERVER"  # set while the forkserver starts : JSON of the instances to load
+FORKSERVER_INSTANCES = []  # [(base_dir, jobs, machines, index), ...], see preload_instances
+INSTANCE_CACHE = {}  # (base_dir, jobs, machines, index) -> instance of load_instances
+
+
+def worker_context(method=None):
+    """
+    multiprocessing context of `method` (START_METHOD when None). Under forkserver the server preloads
+    this script : numpy and deap are imported once for all the workers.
+    """
+    context = multiprocessing.get_context(method or START_METHOD)
+    if context.get_start_method() != "fork":
+        name = __name__
+        if name == "__main__":
+            # Workers rebuild __main__ from the cached bytecode of the module, as under `python -m`, instead
+            # of compiling the file again (and the forkserver cannot preload "__main__" on Python < 3.12)
+            name = os.path.splitext(os.path.basename(__file__))[0]
+            main = sys.modules["__main__"]
+            if main.__spec__ is None:
+                main.__spec__ = importlib.util.find_spec(name)
+        if context.get_start_method() == "forkserver":
+            context.set_forkserver_preload([name])
+            start_forkserver()
+    return context
+
+
+def start_forkserver():
+    """Start the forkserver if it is not running, FORKSERVER_INSTANCES being passed to forkserver_setup."""
+    from multiprocessing import forkserver
+    os.environ[FORKSERVER_VARIABLE] = json.dumps(FORKSERVER_INSTANCES)
+    try:
+        forkserver.ensure_running()
+    finally:
+        del os.environ[FORKSERVER_VARIABLE]
+
+
+def forkserver_setup():
+    """
+    Import of this script by the forkserver : the module becomes the server's __main__ (the workers' __main__
+    is then already the script, multiprocessing doesn't run it again in each of them) and loads the instances.
+    """
+    instances = os.environ.get(FORKSERVER_VARIABLE)
+    if instances is None or __name__ in ("__main__", "__mp_main__"):
+        return
+    sys.modules["__main__"] = sys.modules["__mp_main__"] = sys.modules[__name__]
+    for base_dir, num_jobs, num_machines, index in json.loads(instances):
+        instance_data(base_dir, num_jobs, num_machines, index)
+
+
+def preload_instances(instances):
+    """
+    Instances [(base_dir, jobs, machines, index), ...] the forkserver loads once for all its workers.
+    To call before the first forkserver worker starts (they are loaded when the server starts).
+    """
+    FORKSERVER_INSTANCES[:] = [list(instance) for instance in instances]
+
+
+def instance_data(base_dir, num_jobs, num_machines, index):
+    """Instance `index` of load_instances from INSTANCE_CACHE, loaded alone (and kept) when missing. None if it has no files."""
+    key = (os.path.abspath(base_dir), num_jobs, num_machines, index)
+    if key not in INSTANCE_CACHE:
+        instances = load_instances(base_dir, num_jobs, [num_machines], index, first_instance=index)
+        if not instances:
+            return None
+        INSTANCE_CACHE[key] = instances[0]
+    return INSTANCE_CACHE[key]
+
+
+def run_worker(backend, start_method, target, args=(), kwargs=None):
+    """
+    Body of every worker process : per-process setup (backend, start method of its own workers, DEAP types),
+    then target(*args, **kwargs).
+    """
+    global START_METHOD
+    START_METHOD = start_method
+    set_backend(backend)
+    create_types()
+    return target(*args, **(kwargs or {}))
+
+
+def start_worker(target, args=(), kwargs=None, context=None):
+    """Start a worker process running target(*args, **kwargs) with the backend and start method of this process."""
+    context = context or worker_context()
+    process = context.Process(target=run_worker, args=(_BACKEND, context.get_start_method(), target, args, kwargs))
+    process.start()
+    return process
+
+
+forkserver_setup()
+
+
+# ## Island model
+# One instance on several cores : every island is a process running process_instance on its own
+# subpopulation (with its own VND and operator bandits). Every `interval` generations an island sends a
+# sample of its current front to the next island of the ring (or a random one) through a Queue, immigrants
+# are picked up without waiting and replace the part of the population NSGA selection does not refresh.
+# The archives (front, initial front, explored points) are merged by the parent process.
+
+class IslandMigration:
+    """
+    Migration endpoint of island `index`, inboxes[i] being the Queue island i reads its immigrants from.
+    """
+
+    def __init__(self, index, inboxes, interval=5, size=5, topology="ring"):
+        if topology not in ("ring", "random"):
+            raise ValueError(f"Unknown migration topology: {topology}")
+        self.index = index
+        self.inboxes = inboxes
+        self.interval = interval
+        self.size = size
+        self.topology = topology
+
+    def target(self):
+        if self.topology == "ring":
+            return (self.index + 1) % len(self.inboxes)
+        return random.choice([i for i in range(len(self.inboxes)) if i != self.index])
+
+    def exchange(self, gen, front):
+        """
+        Send emigrants from `front` when the generation is due, return the immigrants received so far
+        as evaluated individuals.
+        """
+        if len(self.inboxes) > 1 and (gen + 1) % self.interval == 0:
+            emigrants = random.sample(front, min(self.size, len(front)))
+            self.inboxes[self.target()].put([(materialize(ind), ind.fitness.values) for ind in emigrants])
+
+        immigrants = []
+        while True:
+            try:
+                message = self.inboxes[self.index].get_nowait()
+            except queue.Empty:
+                break
+            for schedule, fitness in message:
+                ind = creator.Individual(schedule)
+                ind.fitness.values = fitness
+                immigrants.append(ind)
+        return immigrants
+
+
+def island_worker(index, instance, energy_config, consumption_config, inboxes, results, seed, migration_options, options):
+    """Body of an island process : one process_instance run, its result is put on `results`."""
+    random.seed(None if seed is None else seed + index)
+    # Unread migrants must not keep the process alive at exit
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    migration = IslandMigration(index, inboxes, **migration_options)
+    # Every island keeps its own NFS schedules, schedule archive and explored points file
+    if options.get("nfs_cache") is not None:
+        options["nfs_seed"] = f"{options.get('nfs_seed', 0)}_island{index}"
+    for name in ("archive_path", "warm_start", "explored_path"):
+        if options.get(name) is not None:
+            root, extension = os.path.splitext(options[name])
+            options[name] = f"{root}_island{index}{extension}"
+    # Forked islands inherit the parent's count : only the island's own evaluations are sent back
+    evaluations_before = evaluation_counter.count
+    result = process_instance(instance, energy_config, consumption_config, migration=migration, **options)
+    results.put((index, result, evaluation_counter.count - evaluations_before))
+
+
+def nondominated_points(points):
+    """(Cmax, TEC) points not dominated by another one, duplicates removed, by increasing Cmax."""
+    front = []
+    for cmax, tec in sorted(set(points)):
+        if not front or tec < front[-1][1]:
+            front.append((cmax, tec))
+    return front
+
+
+def merge_island_results(results):
+    """Merge process_instance results of several islands into a single result of the same shape."""
+    front_points = [point for result in results for point in zip(result[0], result[1])]
+    init_points = [point for result in results for point in zip(result[2], result[3])]
+    explored_points = [point for result in results for point in zip(result[4], result[5])]
+
+    front = nondominated_points(front_points)
+    init_front = nondominated_points(init_points)
+    kept = set(front)
+    explored = sorted(set(explored_points + front_points) - kept)
+
+    merged = (*zip(*front), *zip(*init_front), *(tuple(zip(*explored)) or ((), ())))
+    if len(results[0]) > 6:
+        # Per-scenario fronts of a run with a ScenarioSet
+        names = results[0][6]
+        merged += ({name: nondominated_points([point for result in results for point in result[6][name]])
+                    for name in names},)
+    return merged
+
+
+def process_instance_islands(instance, energy_config, consumption_config, islands=4, topology="ring",
+                             migration_interval=5, migration_size=5, seed=None, size_pop=100, **options):
+    """
+    Island-model process_instance : `islands` processes each evolve size_pop // islands individuals
+    (10 at least) and exchange front individuals every `migration_interval` generations.
+    Returns the same tuple as process_instance, merged over the islands.
+    Island i is seeded with seed + i. Migrants are read as they arrive, so a seeded island run only
+    repeats exactly when the islands exchange at the same points.
+    """
+    context = worker_context()
+    inboxes = [context.Queue() for _ in range(islands)]
+    results = context.Queue()
+    migration_options = {"interval": migration_interval, "size": migration_size, "topology": topology}
+    options["size_pop"] = max(10, size_pop // islands)
+
+    processes = [start_worker(island_worker, (index, instance, energy_config, consumption_config, inboxes, results,
+                                              seed, migration_options, options), context=context)
+                 for index in range(islands)]
+
+    # Results are read before joining (a process does not exit before its queued data is consumed)
+    island_results = {}
+    while len(island_results) < islands:
+        try:
+            index, result, evaluations = results.get(timeout=1)
+            island_results[index] = result
+            evaluation_counter.add(evaluations)
+        except queue.Empty:
+            failed = [p.exitcode for p in processes if p.exitcode not in (None, 0)]
+            if failed:
+                for p in processes:
+                    p.terminate()
+                raise RuntimeError(f"Island process failed with exit code {failed[0]}")
+    for p in processes:
+        p.join()
+
+    return merge_island_results([island_results[index] for index in range(islands)])
+
+
 ##################################################################################
-######################## TESTS ###################################################
+######################## RUN CATALOG #############################################
 ##################################################################################
 
+# Every process_instance_parallel run is registered in a SQLite catalog : parameters, seed, wall time,
+# evaluation count, front size, hypervolume and the CSV holding the front, plus the host and a hash of this
+# script. Summary queries (median time of the 400x40 PB runs, ...) then read one table instead of the CSVs.
+# The hypervolume is normalised by a reference point fixed per instance (instance_reference_point), so it
+# compares across runs, seeds and code versions.
+
+RUN_CATALOG = "run_catalog.db"
+
+# Columns the summary helpers accept
+RUN_COLUMNS = ("jobs", "machines", "instance", "energy_config", "consumption_config", "seed", "wall_time",
+               "evaluations", "front_size", "hypervolume", "min_cmax", "min_tec", "code_version", "host")
+
+
+def instance_reference_point(ctx):
+    """(Cmax, TEC) reference : the time horizon, and every machine's workload at the highest price."""
+    workload_cost = sum(rate * sum(column) for rate, column in zip(ctx.energy_rates, ctx.pt_columns))
+    return ctx.time_horizon, workload_cost * max(ctx.energy_prices)
+
+
+def worst_case_reference_point(instance, ctx, scenarios):
+    """instance_reference_point of a robust run : the highest workload cost over the ScenarioSet's rates and tariffs."""
+    workloads = np.array([sum(column) for column in ctx.pt_columns], dtype=np.float64)
+    highest_price = max(max(instance["energy_prices"][tariff]["prices"]) for tariff in scenarios.tariffs)
+    return ctx.time_horizon, float((workloads @ scenarios.rates).max()) * highest_price
+
+
+def code_version():
+    """Short hash of this script, identifies the code that produced a run."""
+    with open(os.path.abspath(__file__), "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()[:12]
+
+
+class RunCatalog:
+    """
+    SQLite run catalog, safe to share between processes and hosts (short write transactions).
+    """
+
+    def __init__(self, path=RUN_CATALOG, timeout=60):
+        self.connection = sqlite3.connect(path, timeout=timeout)
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY,
+                    created REAL NOT NULL,
+                    jobs INTEGER NOT NULL,
+                    machines INTEGER NOT NULL,
+                    instance INTEGER NOT NULL,
+                    energy_config TEXT NOT NULL,
+                    consumption_config TEXT NOT NULL,
+                    seed INTEGER,
+                    parameters TEXT,
+                    wall_time REAL,
+                    evaluations INTEGER,
+                    front_size INTEGER,
+                    hypervolume REAL,
+                    min_cmax REAL,
+                    min_tec REAL,
+                    front_path TEXT,
+                    code_version TEXT,
+                    host TEXT
+                )""")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS runs_size ON runs (jobs, machines, consumption_config, energy_config)")
+
+    def register(self, instance, instance_idx, energy_config, consumption_config, seed, parameters,
+                 wall_time, evaluations, front, front_path, scenarios=None):
+        """
+        Record a run, `front` being its (Cmax, TEC) points. Returns the run id.
+        With the ScenarioSet of a robust run (worst-case TEC front) the run is recorded under the
+        "{consumption_config}_robust" configuration, its hypervolume against worst_case_reference_point.
+        """
+        ctx = build_context(instance, energy_config, consumption_config)
+        if scenarios is None:
+            ref_cmax, ref_tec = instance_reference_point(ctx)
+        else:
+            ref_cmax, ref_tec = worst_case_reference_point(instance, ctx, scenarios)
+            consumption_config = f"{consumption_config}_robust"
+        hypervolume = hypervolume_2d(front, (ref_cmax, ref_tec)) / (ref_cmax * ref_tec)
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (created, jobs, machines, instance, energy_config, consumption_config, seed, "
+                "parameters, wall_time, evaluations, front_size, hypervolume, min_cmax, min_tec, front_path, "
+                "code_version, host) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), ctx.jobs, ctx.machines, instance_idx, energy_config, consumption_config, seed,
+                 json.dumps(parameters), wall_time, evaluations, len(front), hypervolume,
+                 min((cmax for cmax, _ in front), default=None), min((tec for _, tec in front), default=None),
+                 os.path.abspath(front_path) if front_path else None, code_version(), socket.gethostname()))
+        return cursor.lastrowid
+
+    def where(self, filters):
+        """WHERE clause and parameters for column=value filters."""
+        for column in filters:
+            if column not in RUN_COLUMNS:
+                raise ValueError(f"Unknown run column: {column}")
+        if not filters:
+            return "", ()
+        return " WHERE " + " AND ".join(f"{column} = ?" for column in filters), tuple(filters.values())
+
+    def values(self, column, **filters):
+        """Sorted values of a column over the runs matching the filters (jobs=400, machines=40, ...)."""
+        if column not in RUN_COLUMNS:
+            raise ValueError(f"Unknown run column: {column}")
+        clause, parameters = self.where(filters)
+        sql = f"SELECT {column} FROM runs{clause}" + (" AND " if clause else " WHERE ") + f"{column} IS NOT NULL ORDER BY {column}"
+        return [row[0] for row in self.connection.execute(sql, parameters)]
+
+    def median(self, column, **filters):
+        """Median of a column over the matching runs, None without runs. e.g. median("wall_time", jobs=400, machines=40, consumption_config="PB")"""
+        values = self.values(column, **filters)
+        if not values:
+            return None
+        middle = len(values) // 2
+        return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+    def summary(self, column, group_by=("jobs", "machines", "consumption_config"), **filters):
+        """(group values..., runs, mean, min, max) of a column per group of runs."""
+        for name in (column, *group_by):
+            if name not in RUN_COLUMNS:
+                raise ValueError(f"Unknown run column: {name}")
+        clause, parameters = self.where(filters)
+        groups = ", ".join(group_by)
+        sql = (f"SELECT {groups}, COUNT(*), AVG({column}), MIN({column}), MAX({column}) FROM runs{clause} "
+               f"GROUP BY {groups} ORDER BY {groups}")
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def runs(self, **filters):
+        """Full rows of the matching runs."""
+        clause, parameters = self.where(filters)
+        return self.connection.execute(f"SELECT * FROM runs{clause} ORDER BY id", parameters).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+
+##################################################################################
+######################## TASK QUEUE ##############################################
+##################################################################################
+
+# Campaign tasks (instance x rate configuration x seed) in a single SQLite file on the shared filesystem :
+# workers on any host claim a task atomically, hold it with a lease renewed by a heartbeat thread and
+# mark it done or failed. A task whose lease expired (worker killed, host down) is claimed again.
+# The rollback journal is kept (WAL needs shared memory, which network filesystems don't provide) and
+# leases are compared with time.time(), so the hosts' clocks must roughly agree.
+
+TASK_STATUSES = ("pending", "running", "done", "failed")
+
+Task = namedtuple("Task", ["id", "key", "payload", "attempts"])
+
+
+class TaskQueue:
+    """
+    SQLite task queue. One TaskQueue (connection) per thread, any number of processes and hosts per file.
+    """
+
+    def __init__(self, path, lease_seconds=900, max_attempts=3, timeout=60):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Autocommit, writes go through explicit BEGIN IMMEDIATE transactions
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_until REAL,
+                heartbeat REAL,
+                created REAL,
+                started REAL,
+                finished REAL,
+                error TEXT
+            )""")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_until)")
+
+    def transaction(self, statements):
+        """Run (sql, parameters) pairs in one write transaction, returns the row count of the last one."""
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, parameters in statements:
+                rowcount = cursor.execute(sql, parameters).rowcount
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return rowcount
+
+    def add(self, key, payload):
+        """Enqueue a task, a key already in the queue is left as it is. Returns True if it was added."""
+        rowcount = self.transaction([(
+            "INSERT OR IGNORE INTO tasks (key, payload, created) VALUES (?, ?, ?)",
+            (key, json.dumps(payload), time.time()),
+        )])
+        return rowcount == 1
+
+    def claim(self, worker):
+        """
+        Take the oldest pending task, or a running one whose lease expired, for `worker`.
+        Returns a Task or None when there is nothing to claim.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = cursor.execute(
+                "SELECT id, key, payload, attempts FROM tasks "
+                "WHERE (status = 'pending' OR (status = 'running' AND lease_until < ?)) AND attempts < ? "
+                "ORDER BY id LIMIT 1", (now, self.max_attempts)).fetchone()
+            if row is not None:
+                cursor.execute(
+                    "UPDATE tasks SET status = 'running', worker = ?, attempts = attempts + 1, "
+                    "lease_until = ?, heartbeat = ?, started = ?, error = NULL WHERE id = ?",
+                    (worker, now + self.lease_seconds, now, now, row[0]))
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        task_id, key, payload, attempts = row
+        return Task(task_id, key, json.loads(payload), attempts + 1)
+
+    def heartbeat(self, task_id, worker):
+        """Renew the lease. False when the task is no longer held by `worker` (lease expired and reclaimed)."""
+        now = time.time()
+        rowcount = self.transaction([(
+            "UPDATE tasks SET lease_until = ?, heartbeat = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (now + self.lease_seconds, now, task_id, worker),
+        )])
+        return rowcount == 1
+
+    def complete(self, task_id, worker):
+        rowcount = self.transaction([(
+            "UPDATE tasks SET status = 'done', finished = ?, lease_until = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time(), task_id, worker),
+        )])
+        return rowcount == 1
+
+    def fail(self, task_id, worker, error):
+        """Give the task back (pending) or mark it failed once max_attempts is reached."""
+        rowcount = self.transaction([(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, finished = ?, lease_until = NULL WHERE id = ? AND worker = ? AND status = 'running'",
+            (self.max_attempts, error, time.time(), task_id, worker),
+        )])
+        return rowcount == 1
+
+    def reclaim_expired(self):
+        """Put running tasks with an expired lease back to pending (failed past max_attempts). Returns their count."""
+        rowcount = self.transaction([(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = 'lease expired', lease_until = NULL WHERE status = 'running' AND lease_until < ?",
+            (self.max_attempts, time.time()),
+        )])
+        return rowcount
+
+    def counts(self):
+        """{status: number of tasks} for every status."""
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        for status, count in self.connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def payloads(self, status):
+        """Payloads of the tasks of a status."""
+        return [json.loads(payload) for payload, in
+                self.connection.execute("SELECT payload FROM tasks WHERE status = ?", (status,))]
+
+    def tasks(self, status=None):
+        """Rows (id, key, status, attempts, worker, heartbeat, error) of the tasks, of one status if given."""
+        sql = "SELECT id, key, status, attempts, worker, heartbeat, error FROM tasks"
+        if status is None:
+            return self.connection.execute(sql + " ORDER BY id").fetchall()
+        return self.connection.execute(sql + " WHERE status = ? ORDER BY id", (status,)).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+
+def enqueue_campaign(task_queue, base_dir, jobs_list, machines_list, num_instances, consumption_configs,
+                     seeds=(None,), batch_dir="pareto_outputs_parallel", batch_dir2="pareto_outputs_parallel_alone",
+                     islands=1, catalog=RUN_CATALOG):
+    """One process_instance_parallel task per (jobs, machines, instance, rate configuration, seed). Returns the number added."""
+    added = 0
+    for num_jobs in jobs_list:
+        for num_machines in machines_list:
+            for instance_idx in range(1, num_instances + 1):
+                for config_type in consumption_configs:
+                    for seed in seeds:
+                        key = f"J{num_jobs}_M{num_machines}_{instance_idx}_{config_type}_seed{seed}"
+                        payload = {
+                            "base_dir": base_dir, "jobs": num_jobs, "machines": num_machines,
+                            "instance": instance_idx, "config_type": config_type, "seed": seed,
+                            "batch_dir": batch_dir, "batch_dir2": batch_dir2, "islands": islands,
+                            "catalog": catalog,
+                        }
+                        added += task_queue.add(key, payload)
+    return added
+
+
+def run_queued_task(payload):
+    """Load the task's instance and run process_instance_parallel on it."""
+    instance = instance_data(payload["base_dir"], payload["jobs"], payload["machines"], payload["instance"])
+    if instance is None:
+        raise FileNotFoundError(f"Instance {payload['jobs']}x{payload['machines']} #{payload['instance']} not found in {payload['base_dir']}")
+    process_instance_parallel(instance, payload["instance"], payload["config_type"], payload["batch_dir"],
+                              payload["batch_dir2"], payload["islands"], payload["seed"],
+                              payload.get("catalog", RUN_CATALOG))
+
+
+def task_heartbeat(path, task_id, worker, interval, stop):
+    """Heartbeat thread body (own connection) : renews the lease every `interval` seconds until `stop` is set."""
+    task_queue = TaskQueue(path)
+    try:
+        while not stop.wait(interval):
+            if not task_queue.heartbeat(task_id, worker):
+                print(f"{worker} lost the lease of task {task_id}")
+                break
+    finally:
+        task_queue.close()
+
+
+def run_task_worker(path, worker=None, poll_interval=30):
+    """
+    Claim and run tasks until the queue has nothing pending and nothing running (a running task may still
+    come back if its lease expires, so the worker waits for those).
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    task_queue = TaskQueue(path)
+    while True:
+        task = task_queue.claim(worker)
+        if task is None:
+            # Expired tasks out of attempts are not claimable, they are marked failed here
+            task_queue.reclaim_expired()
+            if task_queue.counts()["running"] == 0:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        print(f"{worker} runs task {task.key} (attempt {task.attempts})")
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=task_heartbeat,
+                                     args=(path, task.id, worker, task_queue.lease_seconds / 3, stop), daemon=True)
+        heartbeat.start()
+        try:
+            run_queued_task(task.payload)
+        except Exception:
+            task_queue.fail(task.id, worker, traceback.format_exc())
+        else:
+            task_queue.complete(task.id, worker)
+        finally:
+            stop.set()
+            heartbeat.join()
+    task_queue.close()
+
+
+def run_task_workers(path, num_workers):
+    """`num_workers` worker processes on this host (under forkserver the server loads the pending tasks' instances)."""
+    task_queue = TaskQueue(path)
+    preload_instances({(payload["base_dir"], payload["jobs"], payload["machines"], payload["instance"])
+                       for payload in task_queue.payloads("pending")})
+    task_queue.close()
+    processes = [start_worker(run_task_worker, (path,)) for _ in range(num_workers)]
+    for p in processes:
+        p.join()
+
+
+##################################################################################
+######################## DASHBOARD EXPORT ########################################
+##################################################################################
+
+# Precomputes front metrics for the dashboard from folders of result CSVs
+# (M{m}_J{j}_config_{cfg}_{idx}.csv, columns Makespan, TEC, Pareto, Execution Time) :
+#   MH_comparison/front_metrics.json           one record per instance and algorithm
+#   MH_comparison/front_metrics_by_class.json  means per (jobs, machines, config, algorithm)
+# These are not the definitions behind the shipped MH_comparison/metrics_results.json (loadMetricsData),
+# which has other gd and sns values : that file is left alone.
+# Metrics of an instance are computed against the reference front (non-dominated union of all the
+# algorithms' fronts), objectives normalised by its ideal and nadir points :
+#   hv  : hypervolume w.r.t. (1.1, 1.1)          igd : mean distance from the reference points to the front
+#   gd  : mean distance from the front to the reference points
+#   sns : spread, std of the distances of the front points to the ideal point
+#   nps : front size                             exec_time : from the CSV
+# CSVs are parsed in parallel; a cache (EXPORT_CACHE, outside the published folder : it holds the host
+# paths of the CSVs) keeps every parsed file (by mtime and size) and every instance's metrics (by the
+# signature of its input files), so a re-run only redoes what changed.
+
+# (algorithm, folder, instance number of a file index), as the dashboard pairs them
+DASHBOARD_ALGORITHMS = (
+    ("HNSGA-II", "NSGA_Pareto_rate1", lambda idx: idx),
+    ("HMOVNS", "VNS_Pareto_rate1", lambda idx: idx + 1),
+    ("HMOSA", "SA_Pareto_rate1", lambda idx: idx if idx else 10),
+)
+
+EXPORT_CACHE = "export_cache.json"
+
+# Only the tariff configs : variant files (M60_J400_config_6CW_PB_0.csv, ..._6CW__1.csv) are skipped
+RESULT_FILE_PATTERN = re.compile(r"M(\d+)_J(\d+)_config_(%s)_(\d+)\.csv$" % "|".join(map(re.escape, TARIFFS)))
+
+
+def read_front_csv(path):
+    """(non-dominated Pareto points, execution time) of a result CSV."""
+    points = []
+    exec_time = None
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 3 or row[2].strip().lower() != "true":
+                continue
+            points.append((float(row[0]), float(row[1])))
+            if exec_time is None and len(row) > 3:
+                exec_time = float(row[3])
+    return [list(point) for point in nondominated_points(points)], exec_time
+
+
+def front_metrics(front, reference_front):
+    """hv, igd, gd, sns and nps of a front against the reference front (see above)."""
+    reference = np.asarray(reference_front, dtype=float)
+    ideal = reference.min(axis=0)
+    scale = reference.max(axis=0) - ideal
+    scale[scale == 0] = 1.0
+    if not front:
+        return {"hv": 0.0, "igd": None, "gd": None, "sns": None, "nps": 0}
+    points = (np.asarray(front, dtype=float) - ideal) / scale
+    reference = (reference - ideal) / scale
+
+    distances = np.sqrt(((points[:, None, :] - reference[None, :, :]) ** 2).sum(axis=2))
+    to_ideal = np.sqrt((points ** 2).sum(axis=1))
+    return {
+        "hv": hypervolume_2d([tuple(point) for point in points.tolist()], (1.1, 1.1)),
+        "igd": float(distances.min(axis=0).mean()),
+        "gd": float(distances.min(axis=1).mean()),
+        "sns": float(to_ideal.std(ddof=1)) if len(points) > 1 else 0.0,
+        "nps": len(points),
+    }
+
+
+def write_json_if_changed(path, data):
+    """Write compact JSON, leaving the file (and its mtime) alone when the content is the same."""
+    text = json.dumps(data, separators=(",", ":"))
+    if os.path.exists(path):
+        with open(path) as file:
+            if file.read() == text:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+    return True
+
+
+def export_dashboard(results_dir, output_dir, algorithms=DASHBOARD_ALGORITHMS, processes=None, cache_path=EXPORT_CACHE):
+    """
+    Build the front metrics files of output_dir (public/DATA) from the algorithm folders of results_dir.
+    Returns (files parsed, instances recomputed, files written).
+    """
+    cache = {"files": {}, "instances": {}}
+    if os.path.exists(cache_path):
+        with open(cache_path) as file:
+            cache = json.load(file)
+
+    # Result files per (jobs, machines, config, instance) and algorithm
+    inputs = {}
+    for algorithm, folder, instance_of in algorithms:
+        directory = os.path.join(results_dir, folder)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            match = RESULT_FILE_PATTERN.match(name)
+            if match is None:
+                continue
+            machines, jobs, config, idx = match.groups()
+            key = (int(jobs), int(machines), config, instance_of(int(idx)))
+            inputs.setdefault(key, {})[algorithm] = os.path.join(directory, name)
+
+    # Parse the new or modified files in parallel
+    stamps = {}
+    for files in inputs.values():
+        for path in files.values():
+            stat = os.stat(path)
+            stamps[path] = [stat.st_mtime_ns, stat.st_size]
+    stale = [path for path, stamp in stamps.items() if cache["files"].get(path, [None])[:2] != stamp]
+    if stale:
+        with worker_context().Pool(processes) as pool:
+            parsed = pool.map(read_front_csv, stale, chunksize=16)
+        for path, (front, exec_time) in zip(stale, parsed):
+            cache["files"][path] = stamps[path] + [front, exec_time]
+    cache["files"] = {path: entry for path, entry in cache["files"].items() if path in stamps}
+
+    # Metrics of the instances whose inputs changed
+    records, recomputed = [], 0
+    instances_cache = {}
+    for (jobs, machines, config, instance), files in sorted(inputs.items()):
+        instance_key = f"{jobs}_{machines}_{config}_{instance}"
+        signature = sorted((algorithm, path, *stamps[path]) for algorithm, path in files.items())
+        signature = json.loads(json.dumps(signature))
+        entry = cache["instances"].get(instance_key)
+        if entry is None or entry[0] != signature:
+            algorithm_fronts = {algorithm: cache["files"][path][2] for algorithm, path in files.items()}
+            reference_front = nondominated_points(
+                [tuple(point) for front in algorithm_fronts.values() for point in front])
+            metrics = {}
+            for algorithm, path in files.items():
+                metrics[algorithm] = front_metrics(algorithm_fronts[algorithm], reference_front or [(0.0, 0.0)])
+                metrics[algorithm]["exec_time"] = cache["files"][path][3]
+            entry = [signature, metrics]
+            recomputed += 1
+        instances_cache[instance_key] = entry
+
+        for algorithm, metrics in sorted(entry[1].items()):
+            records.append({"instance": instance, "machines": machines, "jobs": jobs, "config": config,
+                            "algorithm": algorithm, **metrics})
+    cache["instances"] = instances_cache
+
+    # Means per class and algorithm
+    classes = {}
+    for record in records:
+        classes.setdefault((record["jobs"], record["machines"], record["config"], record["algorithm"]), []).append(record)
+    by_class = []
+    for (jobs, machines, config, algorithm), group in sorted(classes.items()):
+        summary = {"jobs": jobs, "machines": machines, "config": config, "algorithm": algorithm, "instances": len(group)}
+        for metric in ("hv", "igd", "gd", "sns", "nps", "exec_time"):
+            values = [record[metric] for record in group if record[metric] is not None]
+            summary[metric] = sum(values) / len(values) if values else None
+        by_class.append(summary)
+
+    comparison_dir = os.path.join(output_dir, "MH_comparison")
+    written = write_json_if_changed(os.path.join(comparison_dir, "front_metrics.json"), records)
+    written += write_json_if_changed(os.path.join(comparison_dir, "front_metrics_by_class.json"), by_class)
+
+    with open(cache_path, "w") as file:
+        json.dump(cache, file, separators=(",", ":"))
+    return len(stale), recomputed, written
+
+
+##################################################################################
+######################## MEMORY PROFILE ##########################################
+##################################################################################
+
+# Where the memory of a run goes. process_instance(memory_profile=MemoryProfile()) records at every stage
+# (instance load, init_population, then per generation the variation (crossover, mutation), VND and
+# selection, the final front, the schedule archive and the result files) :
+#   traced    memory allocated by Python code at the end of the stage (tracemalloc)
+#   peak      highest traced memory during the stage
+#   rss       peak resident set size of the process so far (numpy buffers and the interpreter included)
+#   bytes/ind memory held by one individual of the population (schedule, fitness, per-machine objectives)
+# Stages of the same name (one per generation) are summarised together. The top allocation sites are
+# taken at the highest traced memory. memory_benchmark compares the measures with a JSON baseline per
+# instance size and flags the ones more than `tolerance` above it. tracemalloc makes the run about ten times
+# slower, the wall time of a profiled run means nothing.
+#   python NFS_VND_.py memory 800 60 [memory_baseline.json]
+
+MEMORY_BASELINE = "memory_baseline.json"
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (None where the resource module is missing)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KB on Linux
+
+
+def individual_bytes(obj, seen=None):
+    """sys.getsizeof of obj and of every list, tuple, number and attribute it holds (shared objects once)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        size += sum(individual_bytes(item, seen) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(individual_bytes(key, seen) + individual_bytes(value, seen) for key, value in obj.items())
+    if hasattr(obj, "__dict__"):
+        size += individual_bytes(vars(obj), seen)
+    for name in getattr(type(obj), "__slots__", ()):
+        size += individual_bytes(getattr(obj, name, None), seen)
+    return size
+
+
+class MemoryProfile:
+    """
+    Memory of a run stage by stage (see the section comment). Starts tracemalloc when it is not running,
+    `frames` being the traceback depth of the allocation sites.
+    """
+
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        self.stages = []  # (name, traced, peak, rss, bytes per individual)
+        self.top_sites = []
+        self.top_stage = None
+        self.top_traced = 0
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start(frames)
+        tracemalloc.reset_peak()
+
+    def stage(self, name, population=None):
+        """End of stage `name`, bytes per individual are measured on the first individuals of `population`."""
+        traced, peak = tracemalloc.get_traced_memory()
+        sample = population[:5] if population else []
+        per_individual = sum(individual_bytes(ind) for ind in sample) / len(sample) if sample else None
+        self.stages.append((name, traced, peak, peak_rss(), per_individual))
+
+        # Snapshots are costly at 800x60 (one trace per tuple) : a new one only when the traced memory
+        # grew by 10 %, reduced to its top sites right away
+        if traced > 1.1 * self.top_traced:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            ))
+            self.top_sites = snapshot.statistics("lineno")[:self.top]
+            self.top_stage, self.top_traced = name, traced
+            del snapshot
+        tracemalloc.reset_peak()
+
+    def summary(self):
+        """{name: (stages, max traced, max peak, rss at the last one, bytes per individual)} in stage order."""
+        summary = {}
+        for name, traced, peak, rss, per_individual in self.stages:
+            count, max_traced, max_peak, _, last_bytes = summary.get(name, (0, 0, 0, None, None))
+            summary[name] = (count + 1, max(max_traced, traced), max(max_peak, peak), rss,
+                             last_bytes if per_individual is None else per_individual)
+        return summary
+
+    def measures(self):
+        """{measure: bytes} checked against the baseline : peak of every stage, peak RSS, bytes per individual."""
+        measures = {f"{name} peak": peak for name, (_, _, peak, _, _) in self.summary().items()}
+        rss = [stage[3] for stage in self.stages if stage[3] is not None]
+        if rss:
+            measures["peak rss"] = max(rss)
+        per_individual = [stage[4] for stage in self.stages if stage[4] is not None]
+        if per_individual:
+            measures["bytes per individual"] = max(per_individual)
+        return measures
+
+    def compare(self, baseline, tolerance=0.1):
+        """[(measure, baseline bytes, bytes)] of the measures more than `tolerance` above `baseline`."""
+        return [(name, baseline[name], value) for name, value in self.measures().items()
+                if name in baseline and value > (1 + tolerance) * baseline[name]]
+
+    def report(self):
+        mb = 1024 * 1024
+        print(f"{'stage':<18}{'count':>6}{'traced MB':>11}{'peak MB':>10}{'RSS MB':>10}{'bytes/ind':>11}")
+        for name, (count, traced, peak, rss, per_individual) in self.summary().items():
+            rss_text = "-" if rss is None else f"{rss / mb:.1f}"
+            bytes_text = "-" if per_individual is None else f"{per_individual:.0f}"
+            print(f"{name:<18}{count:>6}{traced / mb:>11.1f}{peak / mb:>10.1f}{rss_text:>10}{bytes_text:>11}")
+        print(f"Top allocation sites ({self.top_stage}) :")
+        for statistic in self.top_sites:
+            print(f"  {statistic}")
+
+    def close(self):
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+
+
+def memory_benchmark(base_dir, num_jobs, num_machines, instance=1, config_type="PS", baseline=MEMORY_BASELINE,
+                     tolerance=0.1, update_baseline=False, **options):
+    """
+    One process_instance run of instance `instance` under a MemoryProfile, results and schedule archive
+    written to a temporary directory. The measures are compared with the baseline of the instance size in
+    the `baseline` JSON file (written when it has none, or with update_baseline).
+    Returns the profile and the regressions [(measure, baseline bytes, bytes)].
+    """
+    profile = MemoryProfile()
+    try:
+        instances = load_instances(base_dir, num_jobs, [num_machines], instance, first_instance=instance)
+        data = next((inst for inst in instances if inst["jobs"] is not None), None)
+        if data is None:
+            raise FileNotFoundError(f"Instance {num_jobs}x{num_machines} #{instance} not found in {base_dir}")
+        del instances
+        profile.stage("instance load")
+
+        with tempfile.TemporaryDirectory() as save_dir:
+            start_time = time.time()
+            run = process_instance(data, "6CW", config_type, memory_profile=profile,
+                                   archive_path=os.path.join(save_dir, "archive.npz"), **options)
+            cmax_values, tec_values, cmax_init_values, cmax_tec_values, cmax_explored, tec_explored = run[:6]
+            exec_time = time.time() - start_time
+            save_pareto_front(cmax_values, tec_values, cmax_explored, tec_explored, num_machines, num_jobs,
+                              config_type, instance, exec_time, save_dir=save_dir)
+            save_pareto_front2(cmax_init_values, cmax_tec_values, num_machines, num_jobs, config_type, instance,
+                               exec_time, save_dir=os.path.join(save_dir, "init"))
+            del run
+            profile.stage("results")
+    finally:
+        profile.close()
+    profile.report()
+
+    baselines = {}
+    if os.path.exists(baseline):
+        with open(baseline) as file:
+            baselines = json.load(file)
+    key = f"{num_jobs}x{num_machines}"
+    regressions = profile.compare(baselines[key], tolerance) if key in baselines else []
+    for name, reference, value in regressions:
+        print(f"Memory regression : {name} {value / 1024 / 1024:.1f} MB, baseline {reference / 1024 / 1024:.1f} MB")
+    if key not in baselines or update_baseline:
+        baselines[key] = profile.measures()
+        with open(baseline, "w") as file:
+            json.dump(baselines, file, indent=1)
+    return profile, regressions
+
+
+##################################################################################
+######################## TESTS ###################################################
+##################################################################################
 
-import time
-import csv 
-from multiprocessing import Process
-from multiprocessing import set_start_method
 
 def save_pareto_front2(cmax_values, tec_values, num_machines, num_jobs, config_type,instance_idx, exec_time, save_dir):
     # Create the output directory if it doesn't exist
@@ -2309,6 +5001,7 @@ def save_pareto_front2(cmax_values, tec_values, num_machines, num_jobs, config_t
             writer.writerow([float(cmax), float(tec)])  # Convert to native float type
 
     print(f"Pareto front for Instance {num_machines}, {num_jobs} with configuration {config_type} saved to {filename}.")
+    return filename
 
 # Save global pareto front and explored solutions in a seperate file
 def save_pareto_front(cmax_values, tec_values, cmax_explored, tec_explored, num_machines, num_jobs, config_type, instance_idx, exec_time, save_dir):
@@ -2342,31 +5035,74 @@ def save_pareto_front(cmax_values, tec_values, cmax_explored, tec_explored, num_
             # All explored solutions will be marked as 'false'
             writer.writerow([float(cmax), float(tec), "false", float(exec_time)])
 
+    return filename
+
 
 
 
-def process_instance_parallel(instance, instance_idx, config_type, batch_dir, batch_dir2):
+def process_instance_parallel(instance, instance_idx, config_type, batch_dir, batch_dir2, islands=1, seed=None, catalog=RUN_CATALOG, scenario_mode=None, nfs_cache=NFS_CACHE,
+                              archive_dir="schedule_archive", warm_start=False, pls_time=None):
     """
         Function to wrap the processing and saving of an instance 
+        islands > 1 runs the instance with the island model (one process per island)
+        The run is registered in the `catalog` SQLite file (None to skip it)
+        scenario_mode "report" also saves the front under every tariff x rate scenario (in batch_dir + "_scenarios"),
+        "robust" does the same with the worst-case TEC over the scenarios as objective, its results go to the
+        "{config_type}_robust" files, archive and catalog configuration
+        The NFS schedules of the initial population of a seeded run are cached in the `nfs_cache` directory
+        (None to skip it) under the run seed, unseeded runs don't use the cache
+        The final schedules are saved in archive_dir (None to skip it), warm_start=True seeds the run with the
+        archive of the previous run of the same instance, configuration and seed
+        pls_time : seconds of Pareto local search on the final front (None to skip it)
+        A given seed seeds the run (the islands derive their own seeds from it)
     """
     print(f"Processing Instance {instance_idx} with {instance['machines']} machines and {instance['jobs']} jobs (Config: {config_type}).")
     start_time = time.time()  # Start timer
-    cmax_values, tec_values, cmax_init_values, cmax_tec_values, cmax_explored, tec_explored = process_instance(
-        instance, "6CW", config_type
-    )
+    evaluations_before = evaluation_counter.count
+    options = {}
+    if seed is not None:
+        random.seed(seed)
+    # A robust run optimises another objective (worst-case TEC) : its results are kept apart from the nominal ones
+    run_config = f"{config_type}_robust" if scenario_mode == "robust" else config_type
+    # Unseeded runs are independent repetitions : they draw their own NFS schedules
+    if nfs_cache is not None and seed is not None:
+        options.update(nfs_cache=NFSCache(nfs_cache), nfs_seed=seed)
+    if archive_dir is not None:
+        # Seeded runs of an instance (concurrent queue tasks) keep one archive per seed
+        seed_suffix = "" if seed is None else f"_seed{seed}"
+        archive_path = os.path.join(archive_dir, f"M{instance['machines']}_J{instance['jobs']}_config_{run_config}_{instance_idx}{seed_suffix}.npz")
+        options.update(archive_path=archive_path, warm_start=archive_path if warm_start else None)
+    scenarios = None
+    if scenario_mode is not None:
+        scenarios = build_scenarios(instance)
+        options.update(scenarios=scenarios, robust=scenario_mode == "robust")
+    if pls_time is not None:
+        options.update(pls_time=pls_time)
+    if islands > 1:
+        run = process_instance_islands(instance, "6CW", config_type, islands=islands, seed=seed, **options)
+    else:
+        run = process_instance(instance, "6CW", config_type, **options)
+    cmax_values, tec_values, cmax_init_values, cmax_tec_values, cmax_explored, tec_explored = run[:6]
     exec_time = time.time() - start_time  # Calculate execution time
 
     # Save results
-    save_pareto_front(cmax_values, tec_values, cmax_explored, tec_explored, instance['machines'], instance['jobs'], config_type, instance_idx, exec_time, save_dir=batch_dir)
-    save_pareto_front2(cmax_init_values, cmax_tec_values, instance['machines'], instance['jobs'], config_type, instance_idx, exec_time, save_dir=batch_dir2)
+    front_path = save_pareto_front(cmax_values, tec_values, cmax_explored, tec_explored, instance['machines'], instance['jobs'], run_config, instance_idx, exec_time, save_dir=batch_dir)
+    save_pareto_front2(cmax_init_values, cmax_tec_values, instance['machines'], instance['jobs'], run_config, instance_idx, exec_time, save_dir=batch_dir2)
+    if scenario_mode is not None:
+        for name, points in run[6].items():
+            save_pareto_front2(*zip(*points), instance['machines'], instance['jobs'], f"{config_type}_{scenario_mode}_{name}",
+                               instance_idx, exec_time, save_dir=f"{batch_dir}_scenarios")
+
+    if catalog is not None:
+        run_catalog = RunCatalog(catalog)
+        run_catalog.register(instance, instance_idx, "6CW", config_type, seed, {"islands": islands, "scenario_mode": scenario_mode},
+                             exec_time, evaluation_counter.count - evaluations_before,
+                             list(zip(cmax_values, tec_values)), front_path,
+                             scenarios=scenarios if scenario_mode == "robust" else None)
+        run_catalog.close()
 
 
 
-import cProfile
-import pstats
-import io
-import os
-from multiprocessing import Process
 def profile_process_instance_parallel(*args, **kwargs):
     """Wrapper function to profile `process_instance_parallel`."""
     profiler = cProfile.Profile()
@@ -2381,6 +5117,31 @@ def profile_process_instance_parallel(*args, **kwargs):
     # print(f"Profiling results for process {os.getpid()}:")
     # print(output.getvalue())
 
+
+def report_ready(ready):
+    ready.put(os.getpid())
+
+
+def worker_startup_time(num_workers=64, method=None):
+    """
+    Seconds until num_workers workers started under `method` have all run (the forkserver and a first
+    worker are started before, not counted), and the seconds those two took.
+    """
+    start_time = time.time()
+    context = worker_context(method)
+    ready = context.Queue()
+    start_worker(report_ready, (ready,), context=context).join()
+    first_time = time.time() - start_time
+
+    start_time = time.time()
+    processes = [start_worker(report_ready, (ready,), context=context) for _ in range(num_workers)]
+    for _ in range(num_workers + 1):
+        ready.get()
+    elapsed = time.time() - start_time
+    for p in processes:
+        p.join()
+    return elapsed, first_time
+
 if __name__ == "__main__":
     # Initialize the profiler for the main process
     profiler = cProfile.Profile()
@@ -2391,6 +5152,55 @@ if __name__ == "__main__":
     num_jobs = 800  # Replace with actual number of jobs
     machines_list = [5, 10, 15, 20, 40, 60]  # Replace with actual machine list
     num_instances = 10  # Replace with actual number of instances
+    islands = 1  # > 1 : island model, each instance uses `islands` cores
+    scenario_mode = None  # "report" : fronts under every tariff x rate scenario, "robust" : worst-case TEC objective
+    warm_start = False  # True : start from the schedule archive of the previous run (schedule_archive/)
+    pls_time = None  # seconds of Pareto local search on the final front of each run
+    START_METHOD = None  # worker processes : "fork", "forkserver" or "spawn" (None : platform default)
+    set_backend("python")  # "numba" to run the compiled evaluation kernels
+
+    # Task queue mode, for campaigns over several hosts sharing the filesystem :
+    #   python NFS_VND_.py enqueue tasks.db          add the tasks of the settings above
+    #   python NFS_VND_.py worker tasks.db [n]       run n workers on this host
+    #   python NFS_VND_.py status tasks.db
+    #   python NFS_VND_.py catalog run_catalog.db    wall time and hypervolume per instance size
+    #   python NFS_VND_.py export ../ ../../public/DATA  front metrics JSON files from the result folders
+    #   python NFS_VND_.py startup forkserver [64]   time to start workers under a start method
+    #   python NFS_VND_.py memory 800 60 [baseline]  memory per stage of a run, checked against the baseline
+    if len(sys.argv) > 3 and sys.argv[1] == "memory":
+        _, regressions = memory_benchmark(base_dir, int(sys.argv[2]), int(sys.argv[3]),
+                                          baseline=sys.argv[4] if len(sys.argv) > 4 else MEMORY_BASELINE)
+        sys.exit(1 if regressions else 0)
+    if len(sys.argv) > 2 and sys.argv[1] == "startup":
+        num_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+        elapsed, first_time = worker_startup_time(num_workers, sys.argv[2])
+        print(f"{num_workers} workers ({sys.argv[2]}) : {elapsed:.3f} s, first worker {first_time:.3f} s")
+        sys.exit(0)
+    if len(sys.argv) > 3 and sys.argv[1] == "export":
+        parsed, recomputed, written = export_dashboard(sys.argv[2], sys.argv[3])
+        print(f"{parsed} result files parsed, {recomputed} instances recomputed, {written} files written")
+        sys.exit(0)
+    if len(sys.argv) > 2 and sys.argv[1] == "catalog":
+        run_catalog = RunCatalog(sys.argv[2])
+        for column in ("wall_time", "hypervolume"):
+            print(f"{column} : jobs, machines, config, runs, mean, min, max")
+            for row in run_catalog.summary(column):
+                print(row)
+        sys.exit(0)
+    if len(sys.argv) > 2 and sys.argv[1] in ("enqueue", "worker", "status"):
+        mode, queue_path = sys.argv[1], sys.argv[2]
+        if mode == "enqueue":
+            added = enqueue_campaign(TaskQueue(queue_path), base_dir, [num_jobs], machines_list, num_instances,
+                                     ["PS"], islands=islands)
+            print(f"{added} tasks added to {queue_path}")
+        elif mode == "worker":
+            run_task_workers(queue_path, int(sys.argv[3]) if len(sys.argv) > 3 else 1)
+        else:
+            task_queue = TaskQueue(queue_path)
+            print(task_queue.counts())
+            for row in task_queue.tasks("failed"):
+                print(row)
+        sys.exit(0)
 
     instances_data = load_instances(base_dir, num_jobs, machines_list, num_instances)
     
@@ -2416,12 +5226,12 @@ if __name__ == "__main__":
         for instance_idx, instance in enumerate(instances_of_type):
             for config_type in ["PS"]:  # Test with both configurations
                 # Use the profiled wrapper function
-                p = Process(target=profile_process_instance_parallel, args=(instance, instance_idx, config_type, batch_dir, batch_dir2))
-                p.start()
+                p = start_worker(profile_process_instance_parallel, (instance, instance_idx, config_type, batch_dir, batch_dir2, islands),
+                                 {"scenario_mode": scenario_mode, "warm_start": warm_start, "pls_time": pls_time})
                 processes.append(p)
 
             # Limit the number of concurrent processes 
-            if len(processes) >= os.cpu_count():
+            if len(processes) * islands >= os.cpu_count():
                 for p in processes:
                     p.join()  # Wait for current batch to finish
                 processes = []
@@ -0,0 +1,267 @@
+"""
+Checks of the fast paths of NFS_VND_.py against the plain computations, on the shipped 10x5 and 20x5 instances.
+    python -m pytest -q test_NFS_VND_.py
+"""
+import os
+import random
+import threading
+from itertools import islice
+
+import numpy as np
+import pytest
+
+import NFS_VND_ as nfs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope="module", params=[(10, 5), (20, 5)], ids=lambda size: f"{size[0]}x{size[1]}")
+def instance(request):
+    nfs.create_types()
+    jobs, machines = request.param
+    return nfs.load_instances(BASE_DIR, jobs, [machines], 1)[0]
+
+
+@pytest.fixture(scope="module")
+def ctx(instance):
+    return nfs.build_context(instance, "6CW", "PS")
+
+
+def random_schedules(ctx, count, seed=0):
+    """Random schedules, every other one through tec_reducer (start times moved to cheap periods) when it stays feasible."""
+    random.seed(seed)
+    schedules = []
+    for k in range(count):
+        schedule = nfs.create_individual(ctx.machines, ctx.jobs, ctx.processing_times)
+        if k % 2:
+            reduced = nfs.tec_reducer(schedule, ctx)
+            if nfs.is_schedule_feasible(reduced, ctx.processing_times):
+                schedule = reduced
+        schedules.append(nfs.materialize(schedule))
+    return schedules
+
+
+def plain_fitness(schedule, ctx):
+    return nfs.calculate_cmax(schedule, ctx.processing_times), nfs.calculate_tec(schedule, ctx)
+
+
+def working_schedule(schedule, ctx):
+    """Schedule as VND hands it to the neighborhoods."""
+    working = nfs.WorkingSchedule(nfs.materialize(schedule))
+    working.machine_objectives = nfs.machine_objectives(working, ctx)
+    return working
+
+
+def test_evaluate_population_matches_calculate_tec(ctx):
+    schedules = random_schedules(ctx, 30)
+    # Start times far from settled, kept as they are (recompute_starts=False)
+    schedules += [[[(job, start * 3) for job, start in row] for row in schedule] for schedule in schedules[:5]]
+    population = [nfs.creator.Individual(nfs.materialize(schedule)) for schedule in schedules]
+
+    fitnesses = nfs.evaluate_population(population, ctx)
+
+    for schedule, ind, fitness in zip(schedules, population, fitnesses):
+        assert tuple(fitness) == plain_fitness(schedule, ctx)
+        assert tuple(ind.fitness.values) == plain_fitness(schedule, ctx)
+        # Per-machine objectives left on the individual give the same fitness
+        assert nfs.evaluate(ind, ctx) == plain_fitness(schedule, ctx)
+
+
+def test_evaluate_population_recomputes_start_times(ctx):
+    schedules = [[[(job, start // 2) for job, start in row] for row in schedule] for schedule in random_schedules(ctx, 10)]
+    population = [nfs.creator.Individual(nfs.materialize(schedule)) for schedule in schedules]
+
+    nfs.evaluate_population(population, ctx, recompute_starts=True)
+
+    for schedule, ind in zip(schedules, population):
+        nfs.update_start_times(schedule, ctx.processing_times)
+        assert nfs.materialize(ind) == schedule
+        assert tuple(ind.fitness.values) == plain_fitness(schedule, ctx)
+
+
+@pytest.mark.parametrize("neighborhood", nfs.VND_NEIGHBORHOODS, ids=lambda neighborhood: neighborhood.__name__)
+def test_journal_undo_restores_schedule(ctx, neighborhood):
+    for k, schedule in enumerate(random_schedules(ctx, 4)):
+        random.seed(k)
+        working = working_schedule(schedule, ctx)
+        journal = nfs.MoveJournal(working)
+        for move in islice(neighborhood(working, ctx), 200):
+            nfs.apply_move(journal, move)
+            nfs.update_start_times_journaled(working, ctx.processing_times, journal)
+            candidate = nfs.materialize(working)
+            assert nfs.is_schedule_feasible(candidate, ctx.processing_times)
+            journal.undo()
+            assert working == schedule
+
+
+@pytest.mark.parametrize("neighborhood", nfs.VND_NEIGHBORHOODS, ids=lambda neighborhood: neighborhood.__name__)
+def test_journal_candidates_fitness(ctx, neighborhood):
+    for k, schedule in enumerate(random_schedules(ctx, 4)):
+        random.seed(k)
+        working = working_schedule(schedule, ctx)
+        moves = list(islice(neighborhood(working, ctx), 200))
+        original_fitness = plain_fitness(schedule, ctx)
+        for fitness in nfs.journal_candidates(working, moves, original_fitness, ctx):
+            assert fitness == plain_fitness(nfs.materialize(working), ctx)
+        assert working == schedule
+
+
+def test_screening_keeps_every_improving_move(ctx):
+    """A move the lower bounds drop can neither dominate nor trade off against the base schedule."""
+    rejected = 0
+    for k, schedule in enumerate(random_schedules(ctx, 6)):
+        original_fitness = plain_fitness(schedule, ctx)
+        for neighborhood in nfs.VND_NEIGHBORHOODS:
+            random.seed(k)
+            working = working_schedule(schedule, ctx)
+            for move in islice(neighborhood(working, ctx), 100):
+                journal = nfs.MoveJournal(working)
+                nfs.apply_move(journal, move)
+                nfs.update_start_times_journaled(working, ctx.processing_times, journal)
+                status = nfs.classify_move(plain_fitness(working, ctx), original_fitness, ctx.time_horizon)
+                journal.undo()
+
+                kept = list(nfs.journal_candidates(working, [move], original_fitness, ctx))
+                if not kept:
+                    rejected += 1
+                    assert status is None, (neighborhood.__name__, move)
+    assert rejected > 0
+
+
+def test_task_queue_concurrent_claims(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    queue = nfs.TaskQueue(path)
+    for k in range(40):
+        assert queue.add(f"task{k}", {"k": k})
+    assert not queue.add("task0", {"k": 0})
+
+    claimed = []
+    errors = []
+
+    def worker(name):
+        try:
+            # One connection per thread
+            own_queue = nfs.TaskQueue(path)
+            while True:
+                task = own_queue.claim(name)
+                if task is None:
+                    break
+                claimed.append(task.payload["k"])
+                assert own_queue.heartbeat(task.id, name)
+                assert own_queue.complete(task.id, name)
+            own_queue.connection.close()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(f"worker{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert sorted(claimed) == list(range(40))
+    assert queue.counts() == {"pending": 0, "running": 0, "done": 40, "failed": 0}
+
+
+def test_task_queue_expired_lease_is_reclaimed(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    # Leases are over as soon as they are taken
+    queue = nfs.TaskQueue(path, lease_seconds=-1, max_attempts=2)
+    queue.add("task", {})
+
+    first = queue.claim("a")
+    second = queue.claim("b")
+    assert first.id == second.id and second.attempts == 2
+    # The first owner lost the task : it can't renew or finish it any more
+    assert not queue.heartbeat(first.id, "a")
+    assert not queue.complete(first.id, "a")
+    # Past max_attempts an expired task is failed, not claimed again
+    assert queue.claim("c") is None
+    assert queue.reclaim_expired() == 1
+    assert queue.counts()["failed"] == 1
+
+    queue.add("other", {})
+    task = queue.claim("a")
+    assert queue.reclaim_expired() == 1
+    assert queue.counts()["pending"] == 1
+    assert queue.claim("b").id == task.id
+
+
+def is_permutation(row):
+    return sorted(row.tolist()) == list(range(len(row)))
+
+
+def test_crossover_kernels_give_permutations(ctx):
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        order1 = np.array([rng.permutation(ctx.jobs) for _ in range(ctx.machines)])
+        order2 = np.array([rng.permutation(ctx.jobs) for _ in range(ctx.machines)])
+        first, last = sorted(rng.choice(ctx.jobs + 1, 2, replace=False))
+        keep = rng.random(order1.shape) < 0.5
+
+        two_point, repaired = nfs.two_point_orders(order1, order2, first, last)
+        pmx = nfs.pmx_orders(order1, order2, first, last)
+        ox = nfs.ox_orders(order1, order2, first, last)
+        uniform = nfs.uniform_orders(order1, order2, keep)
+        for child in (two_point, pmx, ox, uniform):
+            assert all(is_permutation(row) for row in child)
+        assert (two_point[:, first:last] == order2[:, first:last]).all()
+        # Outside the segment, only the repaired positions differ from order1
+        untouched = ~repaired
+        untouched[:, first:last] = False
+        assert (two_point[untouched] == order1[untouched]).all()
+        assert (pmx[:, first:last] == order2[:, first:last]).all()
+        assert (ox[:, first:last] == order1[:, first:last]).all()
+        assert (uniform[keep] == order1[keep]).all()
+
+
+@pytest.mark.parametrize("kind", ["two_point", "pmx", "ox", "uniform_tec"])
+def test_array_crossover_children_are_feasible(ctx, kind):
+    schedules = random_schedules(ctx, 10)
+    random.seed(1)
+    for parent1, parent2 in zip(schedules[::2], schedules[1::2]):
+        children = nfs.array_crossover(nfs.creator.Individual(parent1), nfs.creator.Individual(parent2), ctx, kind)
+        for child in children:
+            assert nfs.is_schedule_feasible(child, ctx.processing_times)
+        assert nfs.materialize(parent1) == parent1
+
+
+def test_schedule_archive_round_trip(ctx, tmp_path):
+    population = [nfs.creator.Individual(schedule) for schedule in random_schedules(ctx, 12)]
+    nfs.evaluate_population(population, ctx)
+    path = nfs.save_schedule_archive(str(tmp_path / "archive.npz"), population[:4], population[4:])
+
+    entries = nfs.load_schedule_archive(path)
+    assert [schedule for schedule, _, _ in entries] == [nfs.materialize(ind) for ind in population]
+    assert [on_front for _, _, on_front in entries] == [True] * 4 + [False] * 8
+    for schedule, fitness, _ in entries:
+        assert fitness == plain_fitness(schedule, ctx)
+
+
+def test_run_archive_fitness_matches_recomputation(instance, ctx, tmp_path):
+    path = str(tmp_path / "run.npz")
+    random.seed(3)
+    nfs.process_instance(instance, "6CW", "PS", size_pop=20, archive_path=path)
+
+    entries = nfs.load_schedule_archive(path)
+    assert any(on_front for _, _, on_front in entries)
+    for schedule, fitness, _ in entries:
+        assert nfs.is_schedule_feasible(schedule, ctx.processing_times)
+        assert fitness == plain_fitness(schedule, ctx)
+
+
+def test_tec_reducer_leaves_its_input_and_caches_the_right_fitness(ctx):
+    random.seed(2)
+    for _ in range(20):
+        ind = nfs.creator.Individual(nfs.create_individual(ctx.machines, ctx.jobs, ctx.processing_times))
+        nfs.evaluate_population([ind], ctx)
+        before = nfs.materialize(ind)
+
+        reduced = nfs.tec_reducer(ind, ctx)
+
+        assert nfs.materialize(ind) == before
+        assert nfs.evaluate(ind, ctx) == plain_fitness(before, ctx)
+        # Its backward placement can overlap operations (the GA checks it), the job orders stay permutations
+        assert all(sorted(job for job, _ in row) == list(range(ctx.jobs)) for row in reduced)
+        assert nfs.evaluate(nfs.creator.Individual(reduced), ctx) == plain_fitness(nfs.materialize(reduced), ctx)